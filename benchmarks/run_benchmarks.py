@@ -0,0 +1,338 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import runpy
+import shutil
+import statistics
+import sys
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+import pandas as pd
+from bokeh.document import Document
+from bokeh.io.doc import set_curdoc
+from bokeh.models import Select
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+DASHBOARD_DIR = os.path.join(ROOT_DIR, "dashboard")
+sys.path.insert(0, DASHBOARD_DIR)
+
+import accel
+from data_loader import DataLoader
+from interaction_trace import TraceReplay
+from item_stats import ItemStats, build as build_item_stats
+from synthetic_data import write_csv
+from panels.ally_synergies import AllySynergiesPanel
+from panels.enemy_matchups import EnemyMatchupsPanel
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BENCHMARK_DIR, ".data")
+# Committed; compare() scales it by the calibration workload to the machine running the benchmarks
+BASELINE_PATH = os.path.join(BENCHMARK_DIR, "baseline.json")
+# Recorded sessions (python dashboard/serve.py --record-traces <dir>) replayed as regression tests
+TRACES_DIR = os.path.join(BENCHMARK_DIR, "traces")
+
+# Rows per tier: roughly our current export, 10x and 100x
+TIERS = {
+    "small": 25_000,
+    "medium": 250_000,
+    "large": 2_500_000,
+}
+
+ROLE = "TOP"
+# Fixed workload timed with every tier; baseline timings are scaled by how much slower or faster it ran
+CALIBRATION = "calibration"
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the print() debugging and pandas warnings of the apps while they load and run."""
+    with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        yield
+
+
+def build_item_stats_file(tier_dir):
+    """final_item_champion_stats.csv from the real builder (dashboard/item_stats.py)."""
+    with quiet():
+        build_item_stats(*(os.path.join(tier_dir, name) for name in ["cleaned_data.csv", "items.csv", "final_item_champion_stats.csv"]))
+
+
+def calibration_workload():
+    """The same mix of pandas, numpy and plain Python work on every run, independent of the data tiers."""
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({"key": rng.integers(0, 200, 50_000).astype(str), "value": rng.random(50_000)})
+
+    def run():
+        frame.groupby("key")["value"].agg(["size", "sum"]).sort_values("sum")
+        np.sort(frame["value"].to_numpy())
+        sum(i * i for i in range(50_000))
+    return run
+
+
+def prepare_tier(tier, seed):
+    """Generate (once) the data files every benchmarked app expects in its working directory."""
+    tier_dir = os.path.join(DATA_DIR, f"{tier}-{seed}")
+    done_marker = os.path.join(tier_dir, ".complete")
+    if os.path.exists(done_marker):
+        # Brings tiers generated before the builder existed up to date; otherwise there is nothing new to count
+        build_item_stats_file(tier_dir)
+        return tier_dir
+
+    os.makedirs(tier_dir, exist_ok=True)
+    print(f"[Benchmarks] Generating {TIERS[tier]:,} matches for tier '{tier}'...")
+    with quiet():
+        write_csv(os.path.join(tier_dir, "cleaned_data.csv"), TIERS[tier], seed=seed)
+    shutil.copy(os.path.join(DASHBOARD_DIR, "data", "items.csv"), os.path.join(tier_dir, "items.csv"))
+
+    build_item_stats_file(tier_dir)
+
+    # The heatmap input is produced by the real preprocessing script
+    with working_directory(tier_dir), quiet():
+        runpy.run_path(os.path.join(ROOT_DIR, "good_stuff", "heatmap_preprocessing.py"))
+
+    open(done_marker, "w").close()
+    return tier_dir
+
+
+@contextlib.contextmanager
+def working_directory(path):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def run_script(path):
+    """Execute a Bokeh app script headless in a fresh document and return its globals."""
+    set_curdoc(Document())
+    with quiet():
+        return runpy.run_path(path, run_name="__bokeh_benchmark__")
+
+
+def busiest_champion(matches):
+    """The champion with the most games in ROLE, i.e. the slowest selection."""
+    return matches[matches["team_position"] == ROLE]["champion"].value_counts().index[0]
+
+
+def build_cases(tier_dir):
+    """Return {name: zero-argument callable} for every benchmarked function."""
+    matches = pd.read_csv(os.path.join(tier_dir, "cleaned_data.csv"))
+    champion = busiest_champion(matches)
+    cases = {CALIBRATION: calibration_workload()}
+
+    # dashboard/ panels
+    global_settings = {
+        "champion": Select(options=sorted(matches["champion"].unique()), value=champion),
+        "role": Select(options=["ANY", "TOP", "JUNGLE", "MID", "ADC", "SUP"], value=ROLE),
+    }
+    with quiet():
+        data_loader = DataLoader(data_dir=tier_dir)
+        ally_panel = AllySynergiesPanel(global_settings, data_loader)
+        enemy_panel = EnemyMatchupsPanel(global_settings, data_loader)
+    ally_panel.local_settings["min_games"].value = 10
+    cases["AllySynergiesPanel.update"] = ally_panel.update
+    cases["EnemyMatchupsPanel.update"] = enemy_panel.update
+
+    # good_stuff/3plottorulethemall.py
+    app = run_script(os.path.join(ROOT_DIR, "good_stuff", "3plottorulethemall.py"))
+    with quiet():
+        app["champion_select"].value = champion
+        app["role_select"].value = ROLE
+        app["enemy_role_select"].value = "ANY"
+    # Cold: a new selection, nothing cached yet
+    cases["update_winrate_plot_with_filters"] = lambda: (app["matchup_rankings"].clear(), app["update_winrate_plot_with_filters"](None, None, None))
+    # Warm: one tick of a top/bottom slider drag
+    cases["update_winrate_top_bottom"] = lambda: app["update_winrate_top_bottom"](None, None, None)
+    cases["update_heatmap"] = lambda: app["update_heatmap"](None, None, None)
+    cases["calculate_ally_synergies"] = lambda: app["calculate_ally_synergies"](champion, ROLE, "JUNGLE")
+    cases["create_population_pyramid"] = app["create_population_pyramid"]
+
+    # mess/ build scripts
+    # dashboard/item_stats.py, counting the whole tier from scratch
+    cases["ItemStats.add"] = lambda: ItemStats().add(matches)
+
+    build_items = run_script(os.path.join(ROOT_DIR, "mess", "build_items.py"))
+    cases["get_top_items"] = lambda: build_items["get_top_items"](champion)
+
+    build_runes = run_script(os.path.join(ROOT_DIR, "mess", "build_runes.py"))
+    cases["get_top_runes"] = lambda: build_runes["get_top_runes"](champion, "perk_keystone")
+
+    build_beeswarm = run_script(os.path.join(ROOT_DIR, "mess", "build_beeswarm.py"))
+    # Same preparation as update_plot(), but over every role: the worst case for the layout
+    all_roles = build_beeswarm["cleaned_data"][build_beeswarm["cleaned_data"]["champion"] == champion]
+    melted = all_roles.melt(id_vars=["win"], value_vars=build_beeswarm["item_columns"], value_name="item")
+    swarm_items = melted.groupby("item").agg(count=("win", "size"), win_rate=("win", "mean")).reset_index()
+    swarm_items["frequency"] = swarm_items["count"] / len(melted) * 100
+    swarm_items["size"] = (swarm_items["win_rate"] - 0.5).abs() * 100
+    cases["calculate_swarm_layout"] = lambda: build_beeswarm["calculate_swarm_layout"](swarm_items, "frequency", "size")
+
+    return cases
+
+
+def measure(function, repeats, warmup=1):
+    """Time repeated calls (wall clock and CPU time of this process) and measure the peak traced memory of one call."""
+    with quiet():
+        for _ in range(warmup):
+            function()
+
+        timings, cpu_timings = [], []
+        for _ in range(repeats):
+            start, cpu_start = time.perf_counter(), time.process_time()
+            function()
+            timings.append((time.perf_counter() - start) * 1000)
+            cpu_timings.append((time.process_time() - cpu_start) * 1000)
+
+        tracemalloc.start()
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    timings.sort()
+    return {
+        "cpu_ms": round(min(cpu_timings), 3),
+        "p50_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(timings[min(len(timings) - 1, int(round(0.95 * (len(timings) - 1))))], 3),
+        "peak_mb": round(peak / 1024 ** 2, 3),
+    }
+
+
+def measure_trace(trace_path, tier_dir, repeats):
+    """Replay a recorded session on a freshly loaded app; times the whole replay, not the app start-up."""
+    totals, cpu_totals = [], []
+    for _ in range(repeats + 1):
+        replayer = TraceReplay(trace_path, tier_dir)
+        with quiet():
+            replayer.load()
+            tracing = len(totals) == repeats
+            if tracing:
+                tracemalloc.start()
+            cpu_start = time.process_time()
+            steps = replayer.run()
+            cpu_ms = (time.process_time() - cpu_start) * 1000
+            if tracing:
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+        failed = [step for step in steps if step["error"]]
+        if failed:
+            raise RuntimeError(f"{trace_path} step {failed[0]['step']} ({failed[0]['name']}): {failed[0]['error']}")
+        if not tracing:
+            totals.append(sum(step["ms"] for step in steps))
+            cpu_totals.append(cpu_ms)
+
+    totals.sort()
+    return {
+        "cpu_ms": round(min(cpu_totals), 3),
+        "p50_ms": round(statistics.median(totals), 3),
+        "p95_ms": round(totals[min(len(totals) - 1, int(round(0.95 * (len(totals) - 1))))], 3),
+        "peak_mb": round(peak / 1024 ** 2, 3),
+    }
+
+
+def compare(results, baseline, tolerance, slack_ms=2.0):
+    """Return the list of regressions against the committed baseline.
+
+    Runs are compared by the CPU time of their fastest repeat: unlike wall-clock time it does
+    not grow when other processes share the CPU. Baseline times are first scaled by the
+    calibration workload (this run's time over the baseline's), so a slower machine than the
+    one that recorded the baseline does not show up as a regression either. A tier or function
+    missing from the baseline fails too, so a new benchmark can not go unchecked.
+    """
+    regressions = []
+    for tier, cases in results.items():
+        base_cases = baseline.get(tier, {})
+        if not base_cases:
+            regressions.append(f"{tier}: no baseline, record it with --update-baseline")
+            continue
+        speed = 1.0
+        if CALIBRATION in cases and CALIBRATION in base_cases:
+            # Only ever loosens the limits: a calibration that happened to run fast must not tighten them
+            speed = max(1.0, cases[CALIBRATION]["cpu_ms"] / base_cases[CALIBRATION]["cpu_ms"])
+        for name, result in cases.items():
+            if name == CALIBRATION:
+                continue
+            base = base_cases.get(name)
+            if base is None:
+                regressions.append(f"{tier}/{name}: no baseline, record it with --update-baseline")
+                continue
+            expected = base["cpu_ms"] * speed
+            # Absolute slack: a function of a few milliseconds varies by about that much from one process to the next
+            if result["cpu_ms"] > expected * (1 + tolerance) and result["cpu_ms"] - expected > slack_ms:
+                regressions.append(f"{tier}/{name}: CPU {base['cpu_ms']:.1f} ms (x{speed:.2f} machine speed = {expected:.1f} ms) -> {result['cpu_ms']:.1f} ms")
+            if result["peak_mb"] > base["peak_mb"] * (1 + tolerance) and result["peak_mb"] - base["peak_mb"] > 1:
+                regressions.append(f"{tier}/{name}: peak {base['peak_mb']:.1f} MB -> {result['peak_mb']:.1f} MB")
+    return regressions
+
+
+def print_result(tier, name, result):
+    print(f"{tier:>7} {name:<36} p50 {result['p50_ms']:>10.2f} ms   p95 {result['p95_ms']:>10.2f} ms   CPU {result['cpu_ms']:>10.2f} ms   peak {result['peak_mb']:>8.2f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard callbacks across dataset sizes.")
+    parser.add_argument("--tiers", nargs="+", default=["small", "medium"], choices=list(TIERS))
+    parser.add_argument("--only", nargs="+", help="Only run benchmarks whose name contains one of these strings")
+    parser.add_argument("--repeats", type=int, default=15)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed slowdown/memory growth before failing (0.5 = +50%%)")
+    parser.add_argument("--slack-ms", type=float, default=2.0, help="Slowdowns smaller than this never fail the run")
+    parser.add_argument("--trace-repeats", type=int, default=3, help="Replays of every trace in benchmarks/traces (each reloads the app)")
+    parser.add_argument("--update-baseline", "--save-baseline", action="store_true", help="Store these results in the committed baseline instead of comparing against it")
+    parser.add_argument("--json", help="Also write the results to this file")
+    parser.add_argument("--check-backends", action="store_true", help="First check that the numpy and Numba kernels agree (fails on any mismatch)")
+    args = parser.parse_args()
+
+    print(f"[Benchmarks] Kernel backend: {accel.BACKEND}")
+    if args.check_backends and accel.check_backends():
+        return 1
+
+    results = {}
+    for tier in args.tiers:
+        tier_dir = prepare_tier(tier, args.seed)
+        with working_directory(tier_dir):
+            cases = build_cases(tier_dir)
+            results[tier] = {}
+            for name, function in cases.items():
+                if args.only and name != CALIBRATION and not any(pattern in name for pattern in args.only):
+                    continue
+                results[tier][name] = measure(function, args.repeats)
+                print_result(tier, name, results[tier][name])
+
+        for trace_file in sorted(os.listdir(TRACES_DIR)) if os.path.isdir(TRACES_DIR) else []:
+            name = f"trace:{os.path.splitext(trace_file)[0]}"
+            if args.only and not any(pattern in name for pattern in args.only):
+                continue
+            results[tier][name] = measure_trace(os.path.join(TRACES_DIR, trace_file), tier_dir, args.trace_repeats)
+            print_result(tier, name, results[tier][name])
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)
+
+    if args.update_baseline:
+        for tier, cases in results.items():
+            baseline.setdefault(tier, {}).update(cases)
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"[Benchmarks] Baseline saved to {BASELINE_PATH}")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance, args.slack_ms)
+    for regression in regressions:
+        print(f"[Benchmarks] REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+import argparse
+import bisect
+import os
+import sys
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+print("[Accel] Acceleration Backend Loaded.")
+
+# Numba is optional ('pip install numba'); DASHBOARD_ACCEL=numpy keeps the numpy kernels even when it is installed
+BACKEND = "numba" if numba is not None and os.environ.get("DASHBOARD_ACCEL", "numba") != "numpy" else "numpy"
+
+
+def count_codes_numpy(codes, win, n_values):
+    """Games and wins per code; code n_values marks a missing value and is not counted."""
+    games = np.bincount(codes, minlength=n_values + 1)[:n_values]
+    wins = np.bincount(codes[win], minlength=n_values + 1)[:n_values]
+    return games.astype(np.int64), wins.astype(np.int64)
+
+
+def count_codes_loop(codes, win, n_values):
+    """count_codes_numpy as one pass over the rows, without the intp copy and the masked copy."""
+    games = np.zeros(n_values + 1, dtype=np.int64)
+    wins = np.zeros(n_values + 1, dtype=np.int64)
+    for i in range(len(codes)):
+        games[codes[i]] += 1
+        if win[i]:
+            wins[codes[i]] += 1
+    return games[:n_values], wins[:n_values]
+
+
+def swarm_x_numpy(ys, sizes, step):
+    """x of every swarm point: it moves right in `step` increments until no earlier point lies within its size on both axes.
+
+    Earlier points are kept sorted by y, so only the ones in the point's y-window are tested,
+    and all candidate x positions are tested at once.
+    """
+    xs = np.zeros(len(ys))
+
+    # x positions reachable by repeatedly adding the step (same rounding as x += step)
+    grid = np.cumsum(np.concatenate([[0.0], np.full(63, step)]))
+
+    placed_y, placed_x = [], []
+    for i, (y, size) in enumerate(zip(ys, sizes)):
+        if placed_y and size > 0 and not np.isnan(y):
+            # Neighbours in the y-window (a little wider, then the exact test)
+            lo = bisect.bisect_left(placed_y, y - size * 1.000001)
+            hi = bisect.bisect_right(placed_y, y + size * 1.000001)
+            near_y = np.asarray(placed_y[lo:hi])
+            near_x = np.asarray(placed_x[lo:hi])[np.abs(near_y - y) < size]
+            if len(near_x):
+                while grid[-1] < near_x.max() + size:
+                    grid = np.concatenate([grid, np.cumsum(np.concatenate([[grid[-1]], np.full(len(grid), step)]))[1:]])
+                # The first free position is 0 or the first step past some blocking point
+                candidates = np.unique(np.concatenate([[0], np.searchsorted(grid, near_x + size)]))
+                blocked = (np.abs(near_x[None, :] - grid[candidates][:, None]) < size).any(axis=1)
+                xs[i] = grid[candidates[np.argmax(~blocked)]]
+        if not np.isnan(y):
+            position = bisect.bisect_right(placed_y, y)
+            placed_y.insert(position, y)
+            placed_x.insert(position, xs[i])
+    return xs
+
+
+def swarm_x_loop(ys, sizes, step):
+    """swarm_x_numpy written as the plain collision loop, which Numba compiles."""
+    xs = np.zeros(len(ys))
+    for i in range(len(ys)):
+        y = ys[i]
+        size = sizes[i]
+        if np.isnan(y) or not size > 0:
+            continue
+        x = 0.0
+        blocked = True
+        while blocked:
+            blocked = False
+            for j in range(i):
+                if abs(ys[j] - y) < size and abs(xs[j] - x) < size:
+                    blocked = True
+                    break
+            if blocked:
+                x += step
+        xs[i] = x
+    return xs
+
+
+KERNELS = {
+    "numpy": {"count_codes": count_codes_numpy, "swarm_x": swarm_x_numpy},
+    # Without Numba these are the plain Python loops: far too slow to use, but check_backends can still run them
+    "loop": {"count_codes": count_codes_loop, "swarm_x": swarm_x_loop},
+}
+if numba is not None:
+    # Compiled on first call (cached in __pycache__ for the next run)
+    KERNELS["numba"] = {name: numba.njit(cache=True)(kernel) for name, kernel in KERNELS["loop"].items()}
+
+count_codes = KERNELS[BACKEND]["count_codes"]
+swarm_x = KERNELS[BACKEND]["swarm_x"]
+
+
+def random_cases(kernel, cases=200, seed=0):
+    """Random arguments for count_codes or swarm_x, covering the awkward inputs of the dashboard."""
+    rng = np.random.default_rng(seed)
+    for case in range(cases):
+        if kernel == "count_codes":
+            n_values = int(rng.integers(1, 300))
+            n_rows = int(rng.integers(0, 2000))
+            # Code n_values (missing) included; int16 is what kernels.encode gives for small tables
+            codes = rng.integers(0, n_values + 1, n_rows).astype(np.int16 if case % 2 else np.int32)
+            yield codes, rng.random(n_rows) < 0.5, n_values
+        else:
+            n_points = int(rng.integers(0, 120))
+            # Rounded frequencies give ties, sizes include 0 and the y values a few NaNs
+            ys = np.round(rng.random(n_points) * 30, 1)
+            ys[rng.random(n_points) < 0.05] = np.nan
+            sizes = np.abs(np.round(rng.normal(0, 0.15, n_points), 3))
+            yield ys, sizes, 0.2
+
+
+def same_result(expected, actual):
+    """True when two kernel results (an array or a tuple of arrays) are identical."""
+    if isinstance(expected, tuple):
+        return len(expected) == len(actual) and all(np.array_equal(a, b) for a, b in zip(expected, actual))
+    return np.array_equal(expected, actual)
+
+
+def check_backends(cases=200, seed=0):
+    """Run the numpy kernels and the Numba ones (the plain loops if Numba is missing) on the same random inputs.
+
+    Returns the list of mismatches; empty when both backends give identical results.
+    """
+    other = "numba" if "numba" in KERNELS else "loop"
+    mismatches = []
+    for kernel in ("count_codes", "swarm_x"):
+        for case, arguments in enumerate(random_cases(kernel, cases, seed)):
+            if not same_result(KERNELS["numpy"][kernel](*arguments), KERNELS[other][kernel](*arguments)):
+                mismatches.append(f"{kernel} case {case}")
+
+    print(f"[Accel] numpy vs {other}: {cases} cases per kernel, {len(mismatches)} mismatches")
+    return mismatches
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check that the numpy and Numba kernels give identical results.")
+    parser.add_argument("--cases", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"[Accel] Backend in use: {BACKEND}")
+    mismatches = check_backends(args.cases, args.seed)
+    for mismatch in mismatches:
+        print(f"[Accel] MISMATCH {mismatch}")
+    sys.exit(1 if mismatches else 0)
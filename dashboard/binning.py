@@ -0,0 +1,106 @@
+import numpy as np
+from bokeh.models import ColumnDataSource, HoverTool, LinearColorMapper, Range1d
+from bokeh.palettes import RdYlBu11
+
+print("[Binning] Binned Scatter Loaded.")
+
+
+class BinnedScatter:
+    """Scatter plot that sends win-rate coloured grid cells instead of raw points while many points are visible.
+
+    The script owns the raw point renderer (glyph, colours, tooltips); this class fills its source
+    only when at most raw_threshold points are in view, and re-bins the visible window when the
+    plot is zoomed or panned.
+    """
+
+    def __init__(self, fig, raw_renderer, x, y, win, bins=60, raw_threshold=2000, throttle_ms=200):
+        self.fig = fig
+        self.raw_renderer = raw_renderer
+        self.x = x
+        self.y = y
+        self.win = win
+        self.bins = bins
+        self.raw_threshold = raw_threshold
+        self.throttle_ms = throttle_ms
+        self.frame = None
+        self.pending = None
+        self.setting_ranges = False
+
+        # Explicit ranges, so the view is the user's zoom and not whatever was sent last
+        fig.x_range = Range1d(0, 1)
+        fig.y_range = Range1d(0, 1)
+
+        self.bin_source = ColumnDataSource(data=dict(x=[], y=[], width=[], height=[], count=[], win_rate=[], alpha=[]))
+        color_mapper = LinearColorMapper(palette=list(reversed(RdYlBu11)), low=0, high=1)
+        self.bin_renderer = fig.rect(
+            x="x", y="y", width="width", height="height", source=self.bin_source,
+            fill_color={"field": "win_rate", "transform": color_mapper}, fill_alpha="alpha", line_color=None,
+        )
+        fig.add_tools(HoverTool(renderers=[self.bin_renderer], tooltips=[("Matches", "@count"), ("Win Rate", "@win_rate{0.0%}")]))
+
+        for axis_range in (fig.x_range, fig.y_range):
+            axis_range.on_change("start", self.on_range_change)
+            axis_range.on_change("end", self.on_range_change)
+
+    def set_data(self, frame):
+        """Show a new selection (a DataFrame with the x, y, win and raw renderer columns), zoomed out."""
+        self.frame = frame.dropna(subset=[self.x, self.y])
+        x_values = self.frame[self.x].to_numpy(dtype=float)
+        y_values = self.frame[self.y].to_numpy(dtype=float)
+
+        self.setting_ranges = True
+        try:
+            for axis_range, values in ((self.fig.x_range, x_values), (self.fig.y_range, y_values)):
+                low, high = (values.min(), values.max()) if len(values) else (0.0, 1.0)
+                padding = (high - low) * 0.05 or 0.5
+                axis_range.update(start=low - padding, end=high + padding)
+        finally:
+            self.setting_ranges = False
+        self.refresh()
+
+    def on_range_change(self, attr, old, new):
+        if self.setting_ranges or self.frame is None:
+            return
+        doc = self.fig.document
+        if doc is None:
+            self.refresh()
+        elif self.pending is None:
+            # Collapse a burst of zoom/pan events into one re-bin
+            self.pending = doc.add_timeout_callback(self.flush, self.throttle_ms)
+
+    def flush(self):
+        self.pending = None
+        self.refresh()
+
+    def refresh(self):
+        """Re-aggregate the points inside the current view."""
+        x0, x1 = sorted((self.fig.x_range.start, self.fig.x_range.end))
+        y0, y1 = sorted((self.fig.y_range.start, self.fig.y_range.end))
+        x_values = self.frame[self.x].to_numpy(dtype=float)
+        y_values = self.frame[self.y].to_numpy(dtype=float)
+        visible = (x_values >= x0) & (x_values <= x1) & (y_values >= y0) & (y_values <= y1)
+
+        if visible.sum() <= self.raw_threshold:
+            self.raw_renderer.data_source.data = {column: self.frame[column].to_numpy()[visible] for column in self.frame.columns}
+            self.bin_source.data = {column: [] for column in self.bin_source.data}
+            return
+
+        wins = self.frame[self.win].to_numpy(dtype=float)[visible]
+        x_edges = np.linspace(x0, x1, self.bins + 1)
+        y_edges = np.linspace(y0, y1, self.bins + 1)
+        counts, _, _ = np.histogram2d(x_values[visible], y_values[visible], bins=[x_edges, y_edges])
+        win_counts, _, _ = np.histogram2d(x_values[visible], y_values[visible], bins=[x_edges, y_edges], weights=wins)
+
+        ix, iy = np.nonzero(counts)
+        cell_counts = counts[ix, iy]
+        self.bin_source.data = dict(
+            x=(x_edges[ix] + x_edges[ix + 1]) / 2,
+            y=(y_edges[iy] + y_edges[iy + 1]) / 2,
+            width=np.full(len(ix), x_edges[1] - x_edges[0]),
+            height=np.full(len(ix), y_edges[1] - y_edges[0]),
+            count=cell_counts.astype(int),
+            win_rate=win_counts[ix, iy] / cell_counts,
+            # Busy cells are more opaque
+            alpha=0.3 + 0.7 * np.log1p(cell_counts) / np.log1p(cell_counts.max()),
+        )
+        self.raw_renderer.data_source.data = {column: [] for column in self.frame.columns}
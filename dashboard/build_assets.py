@@ -0,0 +1,126 @@
+import argparse
+import hashlib
+import io
+import json
+import os
+import re
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+RESOURCES_DIR = os.path.join(ROOT_DIR, "..", "resources")
+OUTPUT_DIR = os.path.join(ROOT_DIR, "static", "icons")
+MANIFEST_FILE = "manifest.json"
+# Where serve.py serves OUTPUT_DIR
+URL_PREFIX = "/icons"
+
+# Source folder -> icon kind used in the manifest
+ASSET_FOLDERS = {
+    "Champions_assets": "champion",
+    "Items_assets": "item",
+    "Runes_Assets": "rune",
+    "Summoners_Spells_Assets": "summoner",
+}
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+
+
+def canonical_name(file_name):
+    """Turn an asset file name into the name used in the data (Dr_Mundo.png -> Dr Mundo)."""
+    stem = file_name
+    # Strip every image extension, so misnamed files like BonePlating.png.png still resolve
+    while stem.lower().endswith(IMAGE_EXTENSIONS):
+        stem = os.path.splitext(stem)[0]
+    return stem.replace("_", " ").strip()
+
+
+def lookup_key(name):
+    """Spelling-insensitive key, so Cho'Gath, Chogath and cho gath hit the same icon."""
+    return re.sub(r"[^a-z0-9]", "", str(name).lower())
+
+
+def make_thumbnail(path, size, quality):
+    """Return the WebP bytes of a size x size thumbnail; non-square icons are padded with transparency."""
+    # Only the build needs Pillow, the apps just read the manifest
+    from PIL import Image, ImageOps
+
+    with Image.open(path) as image:
+        image = ImageOps.pad(image.convert("RGBA"), (size, size), Image.LANCZOS, color=(0, 0, 0, 0))
+        buffer = io.BytesIO()
+        image.save(buffer, format="WEBP", quality=quality, method=6)
+        return buffer.getvalue()
+
+
+def build_assets(resources_dir=RESOURCES_DIR, output_dir=OUTPUT_DIR, size=64, quality=80):
+    """Build thumbnails for every icon folder, deduplicated by content hash, plus a manifest."""
+    manifest = {"size": size, "icons": {}}
+    written = {}
+    source_bytes = 0
+    output_bytes = 0
+
+    for folder, kind in ASSET_FOLDERS.items():
+        folder_path = os.path.join(resources_dir, folder)
+        if not os.path.isdir(folder_path):
+            print(f"[Assets] Skipping missing folder {folder_path}")
+            continue
+
+        icons = manifest["icons"].setdefault(kind, {})
+        os.makedirs(os.path.join(output_dir, kind), exist_ok=True)
+
+        # Only direct image files, the static/ copies of scripts and data are not icons
+        for file_name in sorted(os.listdir(folder_path)):
+            path = os.path.join(folder_path, file_name)
+            if not os.path.isfile(path) or not file_name.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+
+            thumbnail = make_thumbnail(path, size, quality)
+            digest = hashlib.sha1(thumbnail).hexdigest()[:16]
+            relative_path = f"{kind}/{digest}.webp"
+            if relative_path not in written:
+                with open(os.path.join(output_dir, relative_path), "wb") as f:
+                    f.write(thumbnail)
+                written[relative_path] = path
+                output_bytes += len(thumbnail)
+            source_bytes += os.path.getsize(path)
+
+            name = canonical_name(file_name)
+            if name in icons and icons[name] != relative_path:
+                print(f"[Assets] {kind} '{name}' has two different images, keeping {icons[name]}")
+                continue
+            icons[name] = relative_path
+
+    with open(os.path.join(output_dir, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+
+    n_icons = sum(len(icons) for icons in manifest["icons"].values())
+    print(f"[Assets] {n_icons} icons -> {len(written)} files, {source_bytes / 1024:.0f} KB -> {output_bytes / 1024:.0f} KB")
+    return manifest
+
+
+class IconManifest:
+    """Thumbnail URLs by icon kind and name; empty (every lookup gives the default) until build_assets has run."""
+
+    def __init__(self, output_dir=OUTPUT_DIR, url_prefix=URL_PREFIX):
+        self.url_prefix = url_prefix.rstrip("/")
+        self.icons = {}
+        path = os.path.join(output_dir, MANIFEST_FILE)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for kind, icons in json.load(f)["icons"].items():
+                    self.icons[kind] = {lookup_key(name): file for name, file in icons.items()}
+
+    def url(self, kind, name, default=None):
+        """Return the thumbnail URL for an icon, or default when it was not built."""
+        file = self.icons.get(kind, {}).get(lookup_key(name))
+        if file is None:
+            return default
+        return f"{self.url_prefix}/{file}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build icon thumbnails and their manifest.")
+    parser.add_argument("--resources", default=RESOURCES_DIR, help="Folder with the *_assets icon folders")
+    parser.add_argument("--output", default=OUTPUT_DIR, help="Where thumbnails and manifest.json are written")
+    parser.add_argument("--size", type=int, default=64, help="Thumbnail edge length in pixels")
+    parser.add_argument("--quality", type=int, default=80, help="WebP quality (0-100)")
+    args = parser.parse_args()
+
+    build_assets(args.resources, args.output, args.size, args.quality)
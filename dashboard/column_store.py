@@ -0,0 +1,388 @@
+import argparse
+import json
+import os
+import sys
+
+import numexpr as ne
+import numpy as np
+import pandas as pd
+
+print("[Column Store] Column Store Loaded.")
+
+ROLES = ["TOP", "JUNGLE", "MID", "ADC", "SUP"]
+ALLY_COLUMNS = [f"ally_{i}" for i in range(1, 6)]
+ENEMY_COLUMNS = [f"enemy_{i}" for i in range(1, 6)]
+ITEM_COLUMNS = [f"item{i}" for i in range(7)]
+
+# String columns that share one dictionary, so their codes can be compared and stacked
+SHARED_DICTIONARIES = {
+    "champion": ["champion", "lane_opponent"] + ALLY_COLUMNS + ENEMY_COLUMNS,
+    "item": ITEM_COLUMNS,
+}
+# Read as text even though they look numeric ("14.10" is not 14.1)
+TEXT_COLUMNS = ["game_version"]
+
+META_FILE = "meta.json"
+CHUNK_ROWS = 1_000_000
+
+
+def dictionary_name(column):
+    for name, columns in SHARED_DICTIONARIES.items():
+        if column in columns:
+            return name
+    return column
+
+
+# Column kinds found by infer_schema, how each is stored and the dtype it is decoded to
+STORAGE_DTYPES = {"bool": "uint8", "int": "float64", "float": "float64", "text": "int32"}
+PANDAS_DTYPES = {"bool": "bool", "int": "int64", "float": "float64", "text": "object"}
+
+
+def chunk_kind(values, column):
+    """Kind of one chunk of a column: bool, int, float or text; None when it is all missing."""
+    if column in TEXT_COLUMNS:
+        return "text"
+    present = values.dropna()
+    if len(present) == 0:
+        return None
+    if values.dtype == bool or (values.dtype == object and all(isinstance(value, (bool, np.bool_)) for value in present.unique())):
+        return "bool"
+    if pd.api.types.is_integer_dtype(values):
+        return "int"
+    if pd.api.types.is_float_dtype(values):
+        return "float"
+    return "text"
+
+
+def infer_schema(csv_path, chunk_rows=CHUNK_ROWS):
+    """{column: (kind, has missing values)} over the whole file, like one pd.read_csv of it would decide.
+
+    int and float chunks make a float column; any other mix makes a text column.
+    """
+    kinds, missing = {}, {}
+    for chunk in pd.read_csv(csv_path, chunksize=chunk_rows, dtype={column: str for column in TEXT_COLUMNS}):
+        for column in chunk.columns:
+            kind = chunk_kind(chunk[column], column)
+            kinds.setdefault(column, set())
+            missing[column] = missing.get(column, False) or bool(chunk[column].isna().any())
+            if kind is not None:
+                kinds[column].add(kind)
+
+    schema = {}
+    for column, found in kinds.items():
+        if not found:
+            kind = "float"  # Empty everywhere: a column of NaN
+        elif len(found) == 1:
+            kind = found.pop()
+        elif found == {"int", "float"}:
+            kind = "float"
+        else:
+            kind = "text"
+        schema[column] = (kind, missing[column])
+    return schema
+
+
+def row_order(csv_path, chunk_rows=CHUNK_ROWS):
+    """Position of every row once the rows are sorted by role, then champion, as DataLoader.partition_by_role orders them.
+
+    Returns (positions, role bounds, champion bounds): the rows of role block b (block 0 holds
+    unknown roles, then one per ROLES entry) are role_bounds[b]:role_bounds[b + 1], and
+    champion_bounds[b] maps each champion to its (start, stop) in that block. None when the
+    file has no team_position or champion column.
+    """
+    header = pd.read_csv(csv_path, nrows=0).columns
+    if "team_position" not in header or "champion" not in header:
+        return None
+    roles, champions, names = [], [], {}
+    for chunk in pd.read_csv(csv_path, chunksize=chunk_rows, usecols=["team_position", "champion"], dtype=str):
+        roles.append(pd.Categorical(chunk["team_position"], categories=ROLES).codes)
+        # Chunk codes -> codes over the whole file; missing champions stay -1
+        chunk_codes, values = pd.factorize(chunk["champion"])
+        lookup = np.array([names.setdefault(value, len(names)) for value in values] + [-1], dtype=np.int32)
+        champions.append(lookup[chunk_codes])
+    roles = np.concatenate(roles) if roles else np.zeros(0, dtype=np.int8)
+    champions = np.concatenate(champions) if champions else np.zeros(0, dtype=np.int32)
+
+    # Champions sort by name within a role; unknown roles and missing champions sort first (code -1)
+    sorted_names = sorted(names)
+    rank = np.empty(len(names) + 1, dtype=np.int64)
+    rank[[names[name] for name in sorted_names]] = np.arange(len(sorted_names))
+    rank[-1] = -1
+    key = (roles.astype(np.int64) + 1) * (len(names) + 1) + rank[champions] + 1
+    order = np.argsort(key, kind="stable")
+    positions = np.empty(len(order), dtype=np.int64)
+    positions[order] = np.arange(len(order))
+
+    sorted_key = key[order]
+    role_bounds = sorted_key.searchsorted(np.arange(len(ROLES) + 2) * (len(names) + 1)).tolist()
+    champion_bounds = []
+    for block in range(len(ROLES) + 1):
+        block_keys = block * (len(names) + 1) + np.arange(len(sorted_names)) + 1
+        starts, stops = sorted_key.searchsorted(block_keys, "left"), sorted_key.searchsorted(block_keys, "right")
+        champion_bounds.append({name: [int(starts[i]), int(stops[i])] for i, name in enumerate(sorted_names) if stops[i] > starts[i]})
+    return positions, role_bounds, champion_bounds
+
+
+def encode_chunk(values, kind, dtype, dictionaries, column):
+    """A chunk of a column as the array written to its file; None when it does not fit the column's kind."""
+    if kind == "text":
+        # New values get the next free code; missing values are -1
+        dictionary = dictionaries.setdefault(dictionary_name(column), {})
+        present = values.dropna().astype(str)
+        for value in present.unique():
+            dictionary.setdefault(value, len(dictionary))
+        encoded = np.full(len(values), -1, dtype=np.int32)
+        encoded[values.notna().to_numpy()] = present.map(dictionary).to_numpy(dtype=np.int32)
+        return encoded
+    if kind == "bool":
+        if values.dtype != bool and values.dtype != object and values.notna().any():
+            return None
+        encoded = values.map({True: 1.0, False: 0.0})
+        if encoded.isna().sum() != values.isna().sum():
+            return None
+        return encoded.to_numpy(dtype=dtype)
+    if values.dtype == object or values.dtype == bool:
+        return None
+    return values.to_numpy(dtype=dtype)
+
+
+class ColumnStore:
+    """Matches stored as one memory-mapped binary file per column; strings are dictionary encoded.
+
+    Nothing is read into memory up front: scans walk the files chunk by chunk, so the
+    store can be larger than RAM.
+    """
+
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+        with open(os.path.join(store_dir, META_FILE)) as f:
+            meta = json.load(f)
+        self.n_rows = meta["n_rows"]
+        self.dtypes = meta["dtypes"]
+        self.pandas_dtypes = meta.get("pandas_dtypes", {})
+        self.dictionaries = meta["dictionaries"]
+        self.codes = {name: {value: code for code, value in enumerate(values)} for name, values in self.dictionaries.items()}
+        self.columns = list(self.dtypes)
+        # Row ranges of the (role, champion) sort order; None for a store built before rows were sorted
+        self.role_bounds = meta.get("role_bounds")
+        self.champion_bounds = meta.get("champion_bounds")
+        self._arrays = {}
+        self._meta_nbytes = None
+
+    @classmethod
+    def build(cls, csv_path, store_dir, chunk_rows=CHUNK_ROWS):
+        """Convert a cleaned_data CSV into a column store, one chunk at a time.
+
+        A first pass over the chunks fixes every column's type (infer_schema), so a column that
+        looks different in a later chunk (a missing win, text after an all-empty chunk) is still
+        written with the file type chosen up front. A second one (row_order) sorts the rows by
+        role and champion: each chunk is written straight to its sorted positions, so a query
+        for one role and champion reads one contiguous range.
+        """
+        schema = infer_schema(csv_path, chunk_rows)
+        order = row_order(csv_path, chunk_rows)
+        total_rows = len(order[0]) if order is not None else sum(len(chunk) for chunk in pd.read_csv(csv_path, chunksize=chunk_rows, usecols=[0]))
+        dtypes = {column: STORAGE_DTYPES[kind] for column, (kind, _) in schema.items()}
+        pandas_dtypes = {column: PANDAS_DTYPES[kind] for column, (kind, _) in schema.items()}
+        for column, (kind, missing) in schema.items():
+            if kind == "bool" and missing:
+                # uint8 has no room for a missing value: 1.0/0.0/NaN, decoded to True/False/NaN objects as pd.read_csv reads them
+                dtypes[column], pandas_dtypes[column] = "float64", "object"
+            elif kind == "int" and missing:
+                pandas_dtypes[column] = "float64"
+
+        os.makedirs(store_dir, exist_ok=True)
+        dictionaries, files = {}, {}
+        n_rows = 0
+        try:
+            for column in schema:
+                path = os.path.join(store_dir, f"{column}.bin")
+                if total_rows == 0:
+                    # np.memmap can not map an empty file
+                    open(path, "wb").close()
+                    continue
+                files[column] = np.memmap(path, dtype=dtypes[column], mode="w+", shape=(total_rows,))
+            text_columns = [column for column, (kind, _) in schema.items() if kind == "text"]
+            for chunk in pd.read_csv(csv_path, chunksize=chunk_rows, dtype={column: str for column in text_columns}):
+                if len(chunk) == 0:
+                    continue
+                if list(chunk.columns) != list(schema):
+                    raise ValueError(f"{csv_path}: rows from {n_rows:,} have columns {list(chunk.columns)}, expected {list(schema)}")
+                if n_rows + len(chunk) > total_rows:
+                    raise ValueError(f"{csv_path} changed while the column store was built from it")
+                positions = order[0][n_rows:n_rows + len(chunk)] if order is not None else slice(n_rows, n_rows + len(chunk))
+                for column in chunk.columns:
+                    encoded = encode_chunk(chunk[column], schema[column][0], dtypes[column], dictionaries, column)
+                    if encoded is None:
+                        raise ValueError(f"{csv_path}: column '{column}' in rows {n_rows:,}-{n_rows + len(chunk) - 1:,} "
+                                         f"does not match its type '{schema[column][0]}' (dtype {chunk[column].dtype})")
+                    files[column][positions] = encoded
+                n_rows += len(chunk)
+        finally:
+            for array in files.values():
+                array.flush()
+            files.clear()
+        if n_rows != total_rows:
+            raise ValueError(f"{csv_path} changed while the column store was built from it")
+
+        meta = {
+            "n_rows": n_rows,
+            "dtypes": dtypes,
+            "pandas_dtypes": pandas_dtypes,
+            "dictionaries": {name: list(values) for name, values in dictionaries.items()},
+            "role_bounds": order[1] if order is not None else None,
+            "champion_bounds": order[2] if order is not None else None,
+        }
+        with open(os.path.join(store_dir, META_FILE), "w") as f:
+            json.dump(meta, f)
+        print(f"[Column Store] {n_rows:,} rows, {len(dtypes)} columns -> {store_dir}")
+        return cls(store_dir)
+
+    def resident_nbytes(self):
+        """Memory the store can hold: the dictionaries, their lookups and row ranges, plus every column file mapped so far.
+
+        Mapped files count in full: the pages a query read stay in the process's memory until
+        the OS needs them back, and a later query may read the rest.
+        """
+        if self._meta_nbytes is None:
+            nbytes = sys.getsizeof(self.role_bounds)
+            for block in self.champion_bounds or []:
+                nbytes += sys.getsizeof(block) + sum(sys.getsizeof(name) + sys.getsizeof(bounds) + 2 * sys.getsizeof(bounds[0]) for name, bounds in block.items())
+            for name, values in self.dictionaries.items():
+                nbytes += sys.getsizeof(values) + sys.getsizeof(self.codes[name]) + sum(sys.getsizeof(value) for value in values)
+            self._meta_nbytes = nbytes
+        return self._meta_nbytes + sum(array.nbytes for array in self._arrays.values())
+
+    def array(self, column):
+        if column not in self._arrays:
+            path = os.path.join(self.store_dir, f"{column}.bin")
+            self._arrays[column] = np.memmap(path, dtype=self.dtypes[column], mode="r", shape=(self.n_rows,))
+        return self._arrays[column]
+
+    def dictionary(self, column):
+        return self.dictionaries[dictionary_name(column)]
+
+    def code(self, column, value):
+        """Code of a string value in a column (-2 if it never occurs, which matches nothing)."""
+        return self.codes[dictionary_name(column)].get(str(value), -2)
+
+    def to_frame(self, columns=None):
+        """Decode columns (all by default) into a DataFrame with the dtypes the CSV was read with."""
+        frame = {}
+        for column in columns or self.columns:
+            values = np.asarray(self.array(column))
+            if dictionary_name(column) in self.dictionaries:
+                # Decoded values share one str object per distinct value; -1 (missing) becomes NaN
+                lookup = np.array(self.dictionary(column) + [np.nan], dtype=object)
+                frame[column] = lookup[values]
+            else:
+                dtype = np.dtype(self.pandas_dtypes.get(column, values.dtype))
+                if dtype == object:
+                    # A bool column with missing values
+                    frame[column] = pd.Series(values).map({1.0: True, 0.0: False}).to_numpy(dtype=object)
+                else:
+                    frame[column] = values.astype(dtype)
+        return pd.DataFrame(frame)
+
+    def row_ranges(self, champion=None, role=None):
+        """(start, stop) ranges holding the rows of a champion (any for None) in a role (every role for None).
+
+        None when the store was built before its rows were sorted; filter with predicate() then.
+        """
+        if self.role_bounds is None:
+            return None
+        if role is None:
+            blocks = range(len(ROLES) + 1)
+        else:
+            blocks = [ROLES.index(role) + 1] if role in ROLES else []
+        ranges = []
+        for block in blocks:
+            if champion is None:
+                ranges.append((self.role_bounds[block], self.role_bounds[block + 1]))
+            elif champion in self.champion_bounds[block]:
+                ranges.append(tuple(self.champion_bounds[block][champion]))
+        return ranges
+
+    def predicate(self, equals=None, expression=None):
+        """numexpr expression for column == value filters (strings become codes) and an optional raw expression."""
+        terms = []
+        for column, value in (equals or {}).items():
+            if value is None:
+                continue
+            if dictionary_name(column) in self.dictionaries:
+                value = self.code(column, value)
+            terms.append(f"({column} == {value})")
+        if expression:
+            terms.append(f"({expression})")
+        return " & ".join(terms) or None
+
+    def chunks(self, ranges=None, chunk_rows=CHUNK_ROWS):
+        """(start, stop) of every chunk of the row ranges (all rows by default)."""
+        for first, last in ranges if ranges is not None else [(0, self.n_rows)]:
+            for start in range(first, last, chunk_rows):
+                yield start, min(start + chunk_rows, last)
+
+    def scan(self, columns, where=None, chunk_rows=CHUNK_ROWS, ranges=None):
+        """Yield {column: array} for the rows matching the numexpr predicate, chunk by chunk, only within the row ranges if given."""
+        predicate_columns = [column for column in self.columns if where and column in where]
+        for start, stop in self.chunks(ranges, chunk_rows):
+            if where:
+                local = {column: np.asarray(self.array(column)[start:stop]) for column in predicate_columns}
+                mask = ne.evaluate(where, local_dict=local)
+                if not mask.any():
+                    continue
+                yield {column: np.asarray(self.array(column)[start:stop])[mask] for column in columns}
+            else:
+                yield {column: np.asarray(self.array(column)[start:stop]) for column in columns}
+
+    def count_rows(self, where=None, chunk_rows=CHUNK_ROWS, ranges=None):
+        """(games, wins) of the rows matching the predicate (within the row ranges if given)."""
+        games = wins = 0
+        for chunk in self.scan(["win"], where, chunk_rows, ranges):
+            games += len(chunk["win"])
+            wins += int(np.count_nonzero(chunk["win"] == 1))
+        return games, wins
+
+    def distinct(self, column, chunk_rows=CHUNK_ROWS):
+        """Values of a text column that occur in it (its dictionary is shared with other columns)."""
+        dictionary = self.dictionary(column)
+        seen = np.zeros(len(dictionary), dtype=bool)
+        for chunk in self.scan([column], chunk_rows=chunk_rows):
+            codes = chunk[column]
+            seen[codes[codes >= 0]] = True
+        return [dictionary[code] for code in np.flatnonzero(seen)]
+
+    def win_rates_by(self, group_columns, where=None, exclude=(), chunk_rows=CHUNK_ROWS, ranges=None):
+        """Games, wins and win rate per value of the stacked group columns, merged over all chunks (of the row ranges if given)."""
+        dictionary = self.dictionary(group_columns[0])
+        games = np.zeros(len(dictionary), dtype=np.int64)
+        wins = np.zeros(len(dictionary), dtype=np.int64)
+        for chunk in self.scan(list(group_columns) + ["win"], where, chunk_rows, ranges):
+            # 1 for a win; a missing win (NaN) counts as a game that was not won
+            win = (chunk["win"] == 1).astype(np.int64)
+            for column in group_columns:
+                codes = chunk[column]
+                present = codes >= 0
+                games += np.bincount(codes[present], minlength=len(dictionary))
+                wins += np.bincount(codes[present], weights=win[present], minlength=len(dictionary)).astype(np.int64)
+
+        excluded = [self.code(group_columns[0], value) for value in exclude]
+        played = np.flatnonzero(games > 0)
+        played = played[~np.isin(played, excluded)]
+        result = pd.DataFrame({
+            "value": [dictionary[code] for code in played],
+            "n_games": games[played],
+            "wins": wins[played],
+        })
+        result["win_rate"] = result["wins"] / result["n_games"]
+        return result.sort_values("value").reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert a cleaned_data CSV into a memory-mapped column store.")
+    parser.add_argument("csv", help="Matches in the cleaned_data.csv format")
+    parser.add_argument("store", help="Output folder")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args()
+
+    ColumnStore.build(args.csv, args.store, args.chunk_rows)
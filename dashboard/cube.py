@@ -0,0 +1,213 @@
+import numpy as np
+import pandas as pd
+from bokeh.models import ColumnDataSource, CustomJS
+
+print("[Cube] Matchup Cube Loaded.")
+
+ROLES = ["TOP", "JUNGLE", "MID", "ADC", "SUP"]
+# The match columns a cube is built from
+COLUMNS = ["champion", "team_position", "win"] + [f"ally_{i}" for i in range(1, 6)] + [f"enemy_{i}" for i in range(1, 6)]
+ABOVE_AVERAGE_COLOR = "#2b93b6"
+BELOW_AVERAGE_COLOR = "#e54635"
+
+# Same output as AllySynergiesPanel.update, computed from the ally cube; ANY sums the five roles
+ALLY_JS = """
+const c = names.indexOf(champion.value);
+const r = roles.indexOf(role.value);
+const s = roles.indexOf(ally_role.value);
+const min_games = min_games_widget.value;
+const out = {ally_champion: [], win_rate: [], n_games: [], win_rate_percent: [], color: []};
+// Rounds like pandas .round(2), ties to even
+const round_half_even = (x) => { const f = Math.floor(x); return x - f != 0.5 ? Math.round(x) : (f % 2 == 0 ? f : f + 1); };
+
+let total_games = 0, total_wins = 0;
+if (r >= 0) {
+    const t = totals.data;
+    for (let i = 0; i < t.champion.length; i++) {
+        if (t.champion[i] == c && t.role[i] == r) { total_games = t.games[i]; total_wins = t.wins[i]; }
+    }
+} else if (c >= 0) {
+    total_games = champion_games[c];
+    total_wins = champion_wins[c];
+}
+
+if (c >= 0 && s >= 0 && total_games > 0) {
+    const average = total_wins / total_games * 100;
+    const games = new Float64Array(names.length);
+    const wins = new Float64Array(names.length);
+    const d = cube.data;
+    for (let i = offsets[c]; i < offsets[c + 1]; i++) {
+        if ((r >= 0 && d.role[i] != r) || d.slot[i] != s) continue;
+        games[d.other[i]] += d.games[i];
+        wins[d.other[i]] += d.wins[i];
+    }
+    for (let o = 0; o < names.length; o++) {
+        if (games[o] == 0 || games[o] < min_games) continue;
+        const win_rate = wins[o] / games[o];
+        const percent = round_half_even(win_rate * 100 * 100) / 100;
+        out.ally_champion.push(names[o]);
+        out.win_rate.push(win_rate);
+        out.n_games.push(games[o]);
+        out.win_rate_percent.push(percent);
+        out.color.push(percent >= average ? above : below);
+    }
+}
+target.data = out;
+"""
+
+# Same output as EnemyMatchupsPanel.update; ANY sums the five enemy slots (and the five roles)
+ENEMY_JS = """
+const c = names.indexOf(champion.value);
+const r = roles.indexOf(role.value);
+const s = roles.indexOf(enemy_role.value);
+const out = {enemy_champion: [], win_rate: [], n_games: [], win_rate_percent: [], color: []};
+const round_half_even = (x) => { const f = Math.floor(x); return x - f != 0.5 ? Math.round(x) : (f % 2 == 0 ? f : f + 1); };
+
+let total_games = 0, total_wins = 0;
+if (r >= 0) {
+    const t = totals.data;
+    for (let i = 0; i < t.champion.length; i++) {
+        if (t.champion[i] == c && t.role[i] == r) { total_games = t.games[i]; total_wins = t.wins[i]; }
+    }
+} else if (c >= 0) {
+    total_games = champion_games[c];
+    total_wins = champion_wins[c];
+}
+
+if (c >= 0 && total_games > 0) {
+    const average = total_wins / total_games * 100;
+    const games = new Float64Array(names.length);
+    const wins = new Float64Array(names.length);
+    const d = cube.data;
+    for (let i = offsets[c]; i < offsets[c + 1]; i++) {
+        if ((r >= 0 && d.role[i] != r) || (s >= 0 && d.slot[i] != s)) continue;
+        games[d.other[i]] += d.games[i];
+        wins[d.other[i]] += d.wins[i];
+    }
+    for (let o = 0; o < names.length; o++) {
+        if (games[o] == 0) continue;
+        const win_rate = wins[o] / games[o];
+        const percent = round_half_even(win_rate * 100 * 100) / 100;
+        out.enemy_champion.push(names[o]);
+        out.win_rate.push(win_rate);
+        out.n_games.push(games[o]);
+        out.win_rate_percent.push(percent);
+        out.color.push(percent >= average ? above : below);
+    }
+}
+target.data = out;
+"""
+
+
+def smallest_int_dtype(max_value):
+    return np.int16 if max_value < 2 ** 15 else np.int32
+
+
+class MatchupCube:
+    """Ally and enemy win counts per champion, role and slot, small enough to send to the browser once."""
+
+    def __init__(self, cleaned_data):
+        data = cleaned_data[cleaned_data["champion"].notna()]
+        win = data["win"].astype(bool)
+
+        ally_columns = [f"ally_{i}" for i in range(1, 6)]
+        enemy_columns = [f"enemy_{i}" for i in range(1, 6)]
+        champion_names = pd.unique(pd.concat([data[column] for column in ["champion"] + ally_columns + enemy_columns]).dropna())
+        self.names = sorted(str(name) for name in champion_names)
+        codes = {name: code for code, name in enumerate(self.names)}
+
+        champion = data["champion"].map(codes).to_numpy()
+        role = pd.Categorical(data["team_position"], categories=ROLES).codes
+        wins = win.to_numpy().astype(np.int64)
+
+        self.ally = self._aggregate(champion, role, [data[column].map(codes) for column in ally_columns], wins)
+        self.enemy = self._aggregate(champion, role, [data[column].map(codes) for column in enemy_columns], wins)
+
+        # Games and wins per (champion, role) and per champion, for the average win rate lines
+        totals = pd.DataFrame({"champion": champion, "role": role, "wins": wins})
+        totals = totals[totals["role"] >= 0].groupby(["champion", "role"]).agg(games=("wins", "size"), wins=("wins", "sum")).reset_index()
+        self.totals = {column: totals[column].to_numpy(dtype=np.int32) for column in totals.columns}
+        self.champion_games = np.bincount(champion, minlength=len(self.names)).tolist()
+        self.champion_wins = np.bincount(champion, weights=wins, minlength=len(self.names)).astype(int).tolist()
+
+    def _aggregate(self, champion, role, slot_columns, wins):
+        """Stack the five slot columns and count games and wins per (champion, role, slot, other champion)."""
+        n_rows = len(champion)
+        other = np.concatenate([column.to_numpy(dtype=float) for column in slot_columns])
+        frame = pd.DataFrame({
+            "champion": np.tile(champion, 5),
+            "role": np.tile(role, 5),
+            "slot": np.repeat(np.arange(5), n_rows),
+            "other": other,
+            "wins": np.tile(wins, 5),
+        })
+        frame = frame[frame["other"].notna()]
+        frame["other"] = frame["other"].astype(np.int64)
+        cube = frame.groupby(["champion", "role", "slot", "other"]).agg(games=("wins", "size"), wins=("wins", "sum")).reset_index()
+
+        code_dtype = smallest_int_dtype(len(self.names))
+        count_dtype = smallest_int_dtype(cube["games"].max() if len(cube) else 0)
+        columns = {
+            "champion": cube["champion"].to_numpy(dtype=code_dtype),
+            "slot": cube["slot"].to_numpy(dtype=np.int8),
+            "other": cube["other"].to_numpy(dtype=code_dtype),
+            "games": cube["games"].to_numpy(dtype=count_dtype),
+            "wins": cube["wins"].to_numpy(dtype=count_dtype),
+            "role": cube["role"].to_numpy(dtype=np.int8),
+        }
+        # Rows are sorted by champion, so a champion's rows are cube[offsets[c]:offsets[c + 1]]
+        offsets = np.searchsorted(columns["champion"], np.arange(len(self.names) + 1)).tolist()
+        return {"columns": columns, "offsets": offsets}
+
+    def nbytes(self):
+        return sum(array.nbytes for cube in (self.ally, self.enemy) for array in cube["columns"].values())
+
+    def link(self, global_settings, ally_panel, enemy_panel):
+        """Drive both panels from the cube in the browser: widget changes never reach the server."""
+        ally_cube = ColumnDataSource(data=self.ally["columns"])
+        enemy_cube = ColumnDataSource(data=self.enemy["columns"])
+        totals = ColumnDataSource(data=self.totals)
+        colors = dict(above=ABOVE_AVERAGE_COLOR, below=BELOW_AVERAGE_COLOR)
+
+        ally_callback = CustomJS(
+            args=dict(
+                cube=ally_cube,
+                offsets=self.ally["offsets"],
+                totals=totals,
+                champion_games=self.champion_games,
+                champion_wins=self.champion_wins,
+                names=self.names,
+                roles=ROLES,
+                champion=global_settings["champion"],
+                role=global_settings["role"],
+                ally_role=ally_panel.local_settings["selected_ally_role"],
+                min_games_widget=ally_panel.local_settings["min_games"],
+                target=ally_panel.source,
+                **colors,
+            ),
+            code=ALLY_JS,
+        )
+        enemy_callback = CustomJS(
+            args=dict(
+                cube=enemy_cube,
+                offsets=self.enemy["offsets"],
+                totals=totals,
+                champion_games=self.champion_games,
+                champion_wins=self.champion_wins,
+                names=self.names,
+                roles=ROLES,
+                champion=global_settings["champion"],
+                role=global_settings["role"],
+                enemy_role=enemy_panel.local_settings["selected_enemy_role"],
+                target=enemy_panel.source,
+                **colors,
+            ),
+            code=ENEMY_JS,
+        )
+
+        for widget in (global_settings["champion"], global_settings["role"],
+                       ally_panel.local_settings["selected_ally_role"], ally_panel.local_settings["min_games"]):
+            widget.js_on_change("value", ally_callback)
+        for widget in (global_settings["champion"], global_settings["role"], enemy_panel.local_settings["selected_enemy_role"]):
+            widget.js_on_change("value", enemy_callback)
+        return [ally_callback, enemy_callback]
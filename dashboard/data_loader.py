@@ -1,34 +1,201 @@
+import os
+
+import numpy as np
 import pandas as pd
 
+from column_store import ALLY_COLUMNS, ENEMY_COLUMNS, ITEM_COLUMNS, ROLES, SHARED_DICTIONARIES, TEXT_COLUMNS, ColumnStore, dictionary_name
+from kernels import count_rows, count_wins, encode
+
+COLUMN_STORE_DIR = "column_store"
+ROLE_DATA_DIR = "roles"
+
 class DataLoader:
-    def __init__(self):
-        self.cleaned_data = self.load_cleaned_data()
+    def __init__(self, data_dir="data"):
+        self.data_dir = data_dir
+        self.column_store = self.load_column_store()
+        if self.column_store is not None:
+            # The match table stays on disk: win_rates_by and champion_totals scan the store's (role, champion) rows chunk by chunk
+            self.cleaned_data, self.role_partitions, self.encoded, self.win = None, {}, {}, None
+            self.columns = list(self.column_store.columns)
+        else:
+            self.cleaned_data = self.load_cleaned_data()
+            self.role_partitions = self.partition_by_role()
+            self.encoded = self.encode_columns()
+            self.win = self.cleaned_data["win"].to_numpy(dtype=bool)
+            self.columns = list(self.cleaned_data.columns)
+        self._champions = None
         self.items_data = self.load_items_data()
 
     def load_cleaned_data(self):
-        """Load cleaned_data.csv."""
+        """Load the role files written by data_filtering_script.py (data/roles/<ROLE>.csv), or cleaned_data.csv."""
+        dtype = {column: str for column in TEXT_COLUMNS}
+        role_files = [os.path.join(self.data_dir, ROLE_DATA_DIR, f"{role}.csv") for role in ROLES]
+        if all(os.path.exists(path) for path in role_files):
+            data = pd.concat([pd.read_csv(path, dtype=dtype) for path in role_files], ignore_index=True)
+            print(f"Cleaned Data Loaded from {ROLE_DATA_DIR}/: {data.head()}")
+            return data
         try:
-            data = pd.read_csv("data/cleaned_data.csv")  # Adjusted path
+            data = pd.read_csv(os.path.join(self.data_dir, "cleaned_data.csv"), dtype=dtype)  # Adjusted path
             print(f"Cleaned Data Loaded: {data.head()}")
             return data
         except FileNotFoundError:
-            raise Exception("cleaned_data.csv not found in the 'data/' folder!")
+            raise Exception(f"cleaned_data.csv not found in the '{self.data_dir}/' folder!")
+
+    def partition_by_role(self):
+        """Order the matches by role, then champion, so each role's matches are one contiguous slice, {role: slice}.
+
+        Within a role the matches of one champion are contiguous too (see champion_rows).
+        """
+        role_order = pd.Categorical(self.cleaned_data["team_position"], categories=ROLES).codes
+        champion_order = pd.Categorical(self.cleaned_data["champion"]).codes
+        order = np.lexsort((champion_order, role_order))
+        self.cleaned_data = self.cleaned_data.iloc[order].reset_index(drop=True)
+        # Rows with an unknown role sort first (code -1) and belong to no partition, only to 'ANY'
+        self.role_bounds = role_order[order].searchsorted(range(-1, len(ROLES) + 1))
+        bounds = self.role_bounds[1:]
+        return {role: self.cleaned_data.iloc[bounds[i]:bounds[i + 1]] for i, role in enumerate(ROLES)}
+
+    def encode_columns(self):
+        """Integer codes of the champion and item columns, {dictionary: (codes, dictionary, {column: row of codes})}."""
+        encoded = {}
+        for name, columns in SHARED_DICTIONARIES.items():
+            columns = [column for column in columns if column in self.cleaned_data.columns]
+            if columns:
+                codes, dictionary = encode(self.cleaned_data, columns)
+                encoded[name] = (codes, dictionary, {column: i for i, column in enumerate(columns)})
+        return encoded
+
+    def champion_rows(self, champion, role=None):
+        """Slices of the rows where `champion` was played in `role` (in every role for None/'ANY')."""
+        codes, dictionary, columns = self.encoded["champion"]
+        code = dictionary.searchsorted(champion) if len(dictionary) else 0
+        if code == len(dictionary) or dictionary[code] != champion:
+            return []
+        blocks = [ROLES.index(role) + 1] if role in ROLES else range(len(ROLES) + 1)
+        rows = []
+        for block in blocks:
+            start, stop = self.role_bounds[block], self.role_bounds[block + 1]
+            # Champion codes are sorted within a role block
+            champions = codes[columns["champion"], start:stop]
+            rows.append(slice(start + champions.searchsorted(code, "left"), start + champions.searchsorted(code, "right")))
+        return rows
+
+    def count_wins(self, columns, rows):
+        """(dictionary, games, wins) per value of the stacked encoded columns over the rows of champion_rows()."""
+        codes, dictionary, index = self.encoded[dictionary_name(columns[0])]
+        games, wins = count_wins([codes[index[column]] for column in columns], self.win, len(dictionary), rows)
+        return dictionary, games, wins
+
+    def count_rows(self, rows):
+        """(games, wins) of the rows of champion_rows()."""
+        return count_rows(self.win, rows)
+
+    def store_selection(self, champion, role=None):
+        """Arguments that make a column store scan read only a champion's rows in one role (role None for every role)."""
+        ranges = self.column_store.row_ranges(champion, role)
+        if ranges is None:
+            # A store built before its rows were sorted: filter every row
+            return {"where": self.column_store.predicate({"champion": champion, "team_position": role})}
+        return {"ranges": ranges}
+
+    def champion_totals(self, champion, role=None):
+        """(games, wins) of a champion in one role (in every role for None/'ANY')."""
+        role = None if role == "ANY" else role
+        if self.column_store is not None:
+            return self.column_store.count_rows(**self.store_selection(champion, role))
+        return self.count_rows(self.champion_rows(champion, role))
+
+    def frame(self, columns):
+        """Some columns of the match table as a DataFrame; only these are decoded from the column store."""
+        if self.column_store is not None:
+            return self.column_store.to_frame(columns)
+        return self.cleaned_data[columns]
+
+    def get_partition(self, role):
+        """Matches played in one role; every match for 'ANY'."""
+        if role in self.role_partitions:
+            return self.role_partitions[role]
+        return self.cleaned_data
 
 
     def load_items_data(self):
         """Load items.csv."""
         try:
-            return pd.read_csv("data/items.csv")  # Adjusted path
+            return pd.read_csv(os.path.join(self.data_dir, "items.csv"))  # Adjusted path
         except FileNotFoundError:
             return pd.DataFrame()  # Return empty if items.csv is missing
 
+    def load_column_store(self):
+        """Open data/column_store if it was built (python column_store.py data/cleaned_data.csv data/column_store)."""
+        store_dir = os.path.join(self.data_dir, COLUMN_STORE_DIR)
+        if os.path.exists(os.path.join(store_dir, "meta.json")):
+            store = ColumnStore(store_dir)
+            print(f"[Data Loader] Column store: {store.n_rows:,} rows")
+            return store
+        return None
+
     def get_unique_champions(self):
-        """Get unique champion names from cleaned_data."""
-        if self.cleaned_data is not None and "champion" in self.cleaned_data.columns:
-            return sorted(self.cleaned_data["champion"].unique().tolist())
-        return []
+        """Get unique champion names from cleaned_data (or the column store)."""
+        if self._champions is None:
+            if "champion" not in self.columns:
+                self._champions = []
+            elif self.column_store is not None:
+                self._champions = sorted(self.column_store.distinct("champion"))
+            else:
+                self._champions = sorted(self.cleaned_data["champion"].unique().tolist())
+        return list(self._champions)
     
     def get_roles(self):
         """Return available roles with 'ANY' included."""
         roles = ["ANY", "TOP", "JUNGLE", "MID", "ADC", "SUP"]
         return roles
+
+    def win_rates_by_enemy(self, champion, role=None, enemy_role="ANY"):
+        """Win rate of a champion against each enemy (in one role, or in any role)."""
+        columns = ENEMY_COLUMNS if enemy_role == "ANY" else [ENEMY_COLUMNS[ROLES.index(enemy_role)]]
+        return self.win_rates_by(columns, champion, role)
+
+    def win_rates_by_ally(self, champion, role, ally_role):
+        """Win rate of a champion with each ally in one role."""
+        return self.win_rates_by([ALLY_COLUMNS[ROLES.index(ally_role)]], champion, role)
+
+    def win_rates_by_item(self, champion, role=None):
+        """Win rate of a champion per finished item, over all item slots."""
+        return self.win_rates_by(ITEM_COLUMNS, champion, role, exclude=["0"])
+
+    def win_rates_by_patch(self, champion, role=None):
+        """Win rate of a champion per game version."""
+        return self.win_rates_by(["game_version"], champion, role)
+
+    def win_rates_by(self, columns, champion, role=None, exclude=()):
+        """Games, wins and win rate per value of the stacked columns (value, n_games, wins, win_rate).
+
+        With a column store only the champion's rows in the role are read, chunk by chunk, so the
+        aggregation does not need the match table in memory; otherwise counts cleaned_data.
+        """
+        role = None if role == "ANY" else role
+        if self.column_store is not None:
+            return self.column_store.win_rates_by(columns, exclude=exclude, **self.store_selection(champion, role))
+
+        if all(dictionary_name(column) in self.encoded for column in columns):
+            dictionary, games, wins = self.count_wins(columns, self.champion_rows(champion, role))
+            keep = games > 0
+            if exclude:
+                keep &= ~np.isin(dictionary, list(exclude))
+            return pd.DataFrame({
+                "value": dictionary[keep].astype(str),
+                "n_games": games[keep],
+                "wins": wins[keep],
+                "win_rate": wins[keep] / games[keep],
+            })
+
+        partition = self.get_partition(role)
+        filtered = partition[partition["champion"] == champion]
+        stacked = pd.concat([filtered[["win", column]].rename(columns={column: "value"}) for column in columns])
+        stacked = stacked.dropna(subset=["value"])
+        stacked["value"] = stacked["value"].astype(str)
+        stacked = stacked[~stacked["value"].isin(exclude)]
+        result = stacked.groupby("value")["win"].agg(n_games="size", wins="sum").reset_index()
+        result["wins"] = result["wins"].astype(int)
+        result["win_rate"] = result["wins"] / result["n_games"]
+        return result.sort_values("value").reset_index(drop=True)
@@ -0,0 +1,145 @@
+import functools
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from column_store import ROLES
+from data_loader import COLUMN_STORE_DIR, ROLE_DATA_DIR, DataLoader
+from hot_reload import HotReloader
+
+print("[Datasets] Dataset Registry Loaded.")
+
+DEFAULT_DATASET = "default"
+DATASETS_DIR = "datasets"
+# Memory the loaded datasets may use together before the least recently used one is dropped
+DEFAULT_BUDGET_MB = float(os.environ.get("DASHBOARD_DATASET_BUDGET_MB", 2048))
+
+
+def is_data_dir(path):
+    """A folder DataLoader can load: a column store, role files or a cleaned_data.csv."""
+    return any(os.path.exists(os.path.join(path, name)) for name in ("column_store/meta.json", "roles", "cleaned_data.csv"))
+
+
+def frame_nbytes(frame):
+    """Memory of a DataFrame, counting each distinct string once (decoded columns share them)."""
+    nbytes = int(frame.memory_usage(index=True, deep=False).sum())
+    for column in frame.columns[frame.dtypes == object]:
+        nbytes += sum(sys.getsizeof(value) for value in frame[column].dropna().unique())
+    return nbytes
+
+
+def resident_nbytes(data_loader):
+    """Memory a loaded dataset holds: items.csv and the match table with its encoded columns, or the column store.
+
+    A column store grows as queries map more of its column files (see ColumnStore.resident_nbytes).
+    """
+    nbytes = frame_nbytes(data_loader.items_data)
+    if data_loader.column_store is not None:
+        return nbytes + data_loader.column_store.resident_nbytes()
+    return nbytes + frame_nbytes(data_loader.cleaned_data) + sum(codes.nbytes for codes, _, _ in data_loader.encoded.values())
+
+
+class DatasetRegistry:
+    """Data slices (regions, rank tiers, seasons) served by one process, loaded on first use.
+
+    data/ itself is the 'default' dataset; every folder in data/datasets/ laid out like data/
+    is another one. Loaded datasets are kept until together they hold more than the memory
+    budget (see resident_nbytes); then the least recently used ones that no open session shows
+    are dropped, so a dataset in use is never loaded twice. A loaded dataset is rebuilt in the
+    background when its files change, see hot_reload.py, and the budget is checked again after.
+    """
+
+    def __init__(self, root="data", memory_budget_mb=DEFAULT_BUDGET_MB):
+        self.root = root
+        self.memory_budget = memory_budget_mb * 1024 ** 2
+        self.loaded = OrderedDict()
+        self.sizes = {}
+        self.paths = self.discover()
+        # Sessions call get/subscribe while hot-reload threads check the budget
+        self.lock = threading.RLock()
+
+    def discover(self):
+        paths = {}
+        if is_data_dir(self.root):
+            paths[DEFAULT_DATASET] = self.root
+        datasets_dir = os.path.join(self.root, DATASETS_DIR)
+        if os.path.isdir(datasets_dir):
+            for name in sorted(os.listdir(datasets_dir)):
+                path = os.path.join(datasets_dir, name)
+                if is_data_dir(path):
+                    paths[name] = path
+        # Nothing found: DataLoader reports what is missing from data/
+        return paths or {DEFAULT_DATASET: self.root}
+
+    def names(self):
+        return list(self.paths)
+
+    @property
+    def default(self):
+        return DEFAULT_DATASET if DEFAULT_DATASET in self.paths else self.names()[0]
+
+    def get(self, name):
+        """DataLoader of a dataset, loading it (and unloading others) if needed."""
+        with self.lock:
+            if name in self.loaded:
+                self.loaded.move_to_end(name)
+                return self.loaded[name].current
+            if name not in self.paths:
+                raise KeyError(f"Unknown dataset '{name}', available: {self.names()}")
+
+            data_dir = self.paths[name]
+            watched = [os.path.join(data_dir, file_name) for file_name in ("cleaned_data.csv", "items.csv")]
+            watched += [os.path.join(data_dir, ROLE_DATA_DIR, f"{role}.csv") for role in ROLES]
+            # column_store.py writes meta.json last
+            watched.append(os.path.join(data_dir, COLUMN_STORE_DIR, "meta.json"))
+            self.loaded[name] = HotReloader(watched, functools.partial(self.load, name), on_reload=lambda snapshot: self.unload_over_budget())
+            self.unload_over_budget()
+            return self.loaded[name].current
+
+    def load(self, name):
+        start = time.perf_counter()
+        data_loader = DataLoader(data_dir=self.paths[name])
+        data_loader.get_unique_champions()
+        self.sizes[name] = resident_nbytes(data_loader)
+        print(f"[Datasets] Loaded '{name}' ({self.sizes[name] / 1024 ** 2:.0f} MB) in {time.perf_counter() - start:.1f} s")
+        return data_loader
+
+    def subscribe(self, name, doc, callback):
+        """Call callback(data_loader) in doc's session when dataset `name` was reloaded.
+
+        A subscribed session keeps the dataset loaded (and most recently used) until it switches or closes.
+        """
+        with self.lock:
+            for reloader in self.loaded.values():
+                reloader.unsubscribe(doc)
+            if name in self.loaded:
+                self.loaded.move_to_end(name)
+                self.loaded[name].subscribe(doc, callback)
+
+    def unload_over_budget(self):
+        with self.lock:
+            # Least recently used first; the most recently used one and those open sessions show stay, even over budget
+            for name in list(self.loaded)[:-1]:
+                if self.memory_usage() <= self.memory_budget:
+                    break
+                if self.loaded[name].in_use():
+                    continue
+                self.loaded.pop(name).stop()
+                print(f"[Datasets] Unloaded '{name}' ({self.sizes.pop(name, 0) / 1024 ** 2:.0f} MB)")
+
+    def dataset_nbytes(self, name):
+        data_loader = self.loaded[name].current
+        if data_loader.column_store is not None:
+            # Grows as queries map more of the store's column files
+            return resident_nbytes(data_loader)
+        return self.sizes.get(name, 0)
+
+    def memory_usage(self):
+        with self.lock:
+            return sum(self.dataset_nbytes(name) for name in self.loaded)
+
+
+# One registry per server process, shared by all sessions
+registry = DatasetRegistry()
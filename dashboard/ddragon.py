@@ -0,0 +1,159 @@
+import json
+import os
+import sys
+
+import requests
+
+# Game version the dashboards were built against
+DDRAGON_VERSION = "14.20.1"
+DDRAGON_URL = "https://ddragon.leagueoflegends.com/cdn/{version}/data/en_US/{file}"
+
+# On-disk metadata store, one folder per game version. A populated version folder
+# committed to the repo doubles as the bundled snapshot for offline deployments.
+STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "ddragon")
+
+METADATA_FILES = {
+    "item": "item.json",
+    "summoner": "summoner.json",
+    "runes": "runesReforged.json",
+}
+
+# Set DDRAGON_OFFLINE=1 to never touch the network (air-gapped clusters)
+OFFLINE = os.environ.get("DDRAGON_OFFLINE", "0") == "1"
+
+
+class DataDragon:
+    def __init__(self, version=DDRAGON_VERSION, store_dir=STORE_DIR, offline=OFFLINE, timeout=5):
+        self.version = version
+        self.store_dir = store_dir
+        self.offline = offline
+        self.timeout = timeout
+        self._metadata = {}
+        self._maps = {}
+
+    def version_dir(self, version=None):
+        return os.path.join(self.store_dir, version or self.version)
+
+    def load(self, name):
+        """Return one metadata JSON, trying memory, disk, network and then the bundled snapshot."""
+        if name in self._metadata:
+            return self._metadata[name]
+
+        file_name = METADATA_FILES[name]
+        data = self._read(self.version_dir(), file_name)
+        if data is None and not self.offline:
+            data = self._fetch(file_name)
+        if data is None:
+            data = self._read_snapshot(file_name)
+        if data is None:
+            print(f"[DataDragon] No {file_name} available for {self.version}, icons will fall back to defaults.")
+            data = {"data": {}} if name != "runes" else []
+
+        self._metadata[name] = data
+        return data
+
+    def populate(self):
+        """Download every metadata file for this version into the store, replacing the stored copies.
+
+        Returns the files that could not be downloaded; their stored copies (if any) are kept.
+        """
+        failed = []
+        for name, file_name in METADATA_FILES.items():
+            data = self._fetch(file_name)
+            if data is None:
+                failed.append(file_name)
+                continue
+            self._metadata[name] = data
+        self._maps.clear()
+        return failed
+
+    def _read(self, directory, file_name):
+        path = os.path.join(directory, file_name)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _fetch(self, file_name):
+        url = DDRAGON_URL.format(version=self.version, file=file_name)
+        try:
+            response = requests.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            data = response.json()
+        except (requests.RequestException, ValueError) as e:
+            print(f"[DataDragon] Could not fetch {url}: {e}")
+            return None
+
+        # Write to a temporary file first so a crashed download never leaves a half file behind
+        os.makedirs(self.version_dir(), exist_ok=True)
+        path = os.path.join(self.version_dir(), file_name)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(path + ".tmp", path)
+        return data
+
+    def _read_snapshot(self, file_name):
+        """Fall back to the newest stored version that has the file."""
+        if not os.path.isdir(self.store_dir):
+            return None
+        versions = sorted(
+            os.listdir(self.store_dir),
+            key=lambda v: [int(part) if part.isdigit() else 0 for part in v.split(".")],
+            reverse=True,
+        )
+        for version in versions:
+            data = self._read(self.version_dir(version), file_name)
+            if data is not None:
+                print(f"[DataDragon] Using bundled {version} snapshot for {file_name}.")
+                return data
+        return None
+
+    def item_name_to_id(self):
+        """Map item names to their Data Dragon ids."""
+        if "item_name_to_id" not in self._maps:
+            self._maps["item_name_to_id"] = {
+                item["name"]: item_id for item_id, item in self.load("item")["data"].items()
+            }
+        return self._maps["item_name_to_id"]
+
+    def summoner_spell_images(self):
+        """Map summoner spell ids (e.g. SummonerFlash) to their icon file names."""
+        if "summoner_spell_images" not in self._maps:
+            self._maps["summoner_spell_images"] = {
+                spell["id"]: spell["image"]["full"] for spell in self.load("summoner")["data"].values()
+            }
+        return self._maps["summoner_spell_images"]
+
+    def rune_icons(self):
+        """Map rune and rune style names to their icon paths."""
+        if "rune_icons" not in self._maps:
+            runes_mapping = {}
+            for style in self.load("runes"):
+                runes_mapping[style["name"]] = style["icon"]
+                for slot in style["slots"]:
+                    for rune in slot["runes"]:
+                        runes_mapping[rune["name"]] = rune["icon"]
+            self._maps["rune_icons"] = runes_mapping
+        return self._maps["rune_icons"]
+
+
+# Shared store so every session in a server process reuses the same maps
+_default_store = None
+
+
+def get_store(version=DDRAGON_VERSION):
+    global _default_store
+    if _default_store is None or _default_store.version != version:
+        _default_store = DataDragon(version)
+    return _default_store
+
+
+if __name__ == "__main__":
+    # Download a version into the store, e.g. `python ddragon.py 14.20.1`, then commit data/ddragon/<version>/
+    version = sys.argv[1] if len(sys.argv) > 1 else DDRAGON_VERSION
+    store = DataDragon(version, offline=False)
+    failed = store.populate()
+    if failed:
+        print(f"[DataDragon] Could not download {', '.join(failed)} for {version}, stored copies are kept: run this again with internet access")
+        sys.exit(1)
+    print(f"[DataDragon] Metadata stored in {store.version_dir()}")
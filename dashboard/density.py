@@ -0,0 +1,76 @@
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+# Above this many (sample, point) pairs the density is evaluated on a binned grid
+EXACT_LIMIT = 250_000
+GRID_SIZE = 512
+
+
+def exact_gaussian_kde(values, bandwidth, points):
+    """Gaussian kernel density of values, evaluated at points (same result as sklearn's KernelDensity)."""
+    z = (points[:, None] - values[None, :]) / bandwidth
+    return np.exp(-0.5 * z ** 2).sum(axis=1) / (len(values) * bandwidth * np.sqrt(2 * np.pi))
+
+
+def binned_gaussian_kde(values, bandwidth, points, grid_size=GRID_SIZE):
+    """Gaussian kernel density via linear binning on a fixed grid and an FFT convolution."""
+    lo = min(values.min(), points.min()) - 4 * bandwidth
+    hi = max(values.max(), points.max()) + 4 * bandwidth
+    grid = np.linspace(lo, hi, grid_size)
+    delta = grid[1] - grid[0]
+
+    # Spread each sample over its two neighbouring grid points
+    position = (values - lo) / delta
+    left = np.clip(np.floor(position).astype(int), 0, grid_size - 2)
+    fraction = position - left
+    counts = np.bincount(left, 1 - fraction, minlength=grid_size) + np.bincount(left + 1, fraction, minlength=grid_size)
+
+    offsets = np.arange(-grid_size + 1, grid_size) * delta
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+    n_fft = 1 << int(np.ceil(np.log2(3 * grid_size - 2)))
+    smoothed = np.fft.irfft(np.fft.rfft(counts, n_fft) * np.fft.rfft(kernel, n_fft), n_fft)[grid_size - 1:2 * grid_size - 1]
+
+    density = np.maximum(smoothed, 0) / len(values)
+    return np.interp(points, grid, density)
+
+
+def gaussian_kde(values, bandwidth, points=None):
+    """Density of values at points (default: at the values themselves)."""
+    values = np.asarray(values, dtype=float)
+    points = values if points is None else np.asarray(points, dtype=float)
+    if len(values) == 0:
+        return np.zeros(len(points))
+    if len(values) * len(points) <= EXACT_LIMIT:
+        return exact_gaussian_kde(values, bandwidth, points)
+    return binned_gaussian_kde(values, bandwidth, points)
+
+
+class DensityEngine:
+    """Sina plot jitter, memoized per key (e.g. champion, role, category)."""
+
+    def __init__(self, bandwidth=3, seed=42, max_entries=4096):
+        self.bandwidth = bandwidth
+        self.seed = seed
+        self.max_entries = max_entries
+        self.cache = OrderedDict()
+
+    def rng(self, key):
+        # Seeded from the key, so a selection always gets the same jitter whatever was viewed before
+        return np.random.default_rng([self.seed, zlib.crc32(repr(key).encode())])
+
+    def sina_jitter(self, key, values, width=1.2):
+        """Horizontal offsets in [-width * density, width * density] for each value."""
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+
+        values = np.asarray(values, dtype=float)
+        density = gaussian_kde(values, self.bandwidth)
+        jitter = (self.rng(key).random(len(values)) * 2 - 1) * density * width
+
+        self.cache[key] = jitter
+        if len(self.cache) > self.max_entries:
+            self.cache.popitem(last=False)
+        return jitter
@@ -0,0 +1,56 @@
+import argparse
+import os
+
+from bokeh.document import Document
+from bokeh.embed import file_html
+from bokeh.layouts import column, row
+from bokeh.resources import CDN, INLINE
+
+from cube import COLUMNS as CUBE_COLUMNS, MatchupCube
+from data_loader import DataLoader
+from panels.ally_synergies import AllySynergiesPanel
+from panels.enemy_matchups import EnemyMatchupsPanel
+from panels.global_settings import GlobalSettings
+
+DASHBOARD_DIR = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_PATH = os.path.join(DASHBOARD_DIR, "static", "dashboard.html")
+
+
+def build_static_document(data_loader):
+    """The dashboard layout with every panel driven by the cube in the browser."""
+    global_settings = GlobalSettings(data_loader)
+    ally_synergies = AllySynergiesPanel(global_settings.global_settings, data_loader)
+    enemy_matchups = EnemyMatchupsPanel(global_settings.global_settings, data_loader)
+    cube = MatchupCube(data_loader.frame(CUBE_COLUMNS))
+
+    doc = Document(title="LoL Dashboard")
+    doc.add_root(column(
+        *global_settings.layout(),
+        row(ally_synergies.layout(), enemy_matchups.layout())
+    ))
+    doc.js_on_event("document_ready", *cube.link(global_settings.global_settings, ally_synergies, enemy_matchups))
+    return doc, cube
+
+
+def export_static(output_path=OUTPUT_PATH, resources="cdn"):
+    # DataLoader reads data/ relative to the dashboard folder
+    output_path = os.path.abspath(output_path)
+    os.chdir(DASHBOARD_DIR)
+
+    doc, cube = build_static_document(DataLoader())
+    html = file_html(doc, INLINE if resources == "inline" else CDN, title=doc.title)
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(html)
+    print(f"[Export] {len(cube.names)} champions, cube {cube.nbytes() / 1024:.0f} KB, page {len(html.encode()) / 1024:.0f} KB -> {output_path}")
+    return output_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the dashboard as a standalone HTML page for static hosting.")
+    parser.add_argument("--output", default=OUTPUT_PATH, help="HTML file to write")
+    parser.add_argument("--resources", choices=["cdn", "inline"], default="cdn", help="Load BokehJS from the CDN or embed it in the page")
+    args = parser.parse_args()
+
+    export_static(args.output, args.resources)
@@ -0,0 +1,122 @@
+import functools
+import os
+import threading
+import time
+
+print("[Hot Reload] Hot Reload Loaded.")
+
+POLL_SECONDS = 2.0
+
+
+def file_signature(paths):
+    """(mtime, size) of every path, None for missing ones: changes whenever a file is rewritten."""
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            signature.append((stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            signature.append(None)
+    return tuple(signature)
+
+
+class HotReloader:
+    """Data built from files, rebuilt in the background whenever the files change.
+
+    build() runs in a watcher thread into a second buffer (loading, indexes, warm caches) while
+    sessions keep using `current`. The new version then replaces `current` in one assignment and
+    every subscribed session is told on its own next tick, so a callback that is already running
+    finishes on the version it started with. on_reload(new_snapshot), if given, runs in the
+    watcher thread after every swap.
+    """
+
+    def __init__(self, paths, build, poll_seconds=POLL_SECONDS, on_reload=None):
+        self.paths = list(paths)
+        self.build = build
+        self.poll_seconds = poll_seconds
+        self.on_reload = on_reload
+        self.lock = threading.Lock()
+        self.subscribers = {}
+        # Documents with an on_session_destroyed handler: subscribe again after unsubscribe (a dataset switch) must not add another
+        self.watched_docs = set()
+        self.signature = file_signature(self.paths)
+        self.current = build()
+        self.version = 1
+        self.stopped = threading.Event()
+        threading.Thread(target=self.watch, name="hot-reload", daemon=True).start()
+
+    def watch(self):
+        pending = None
+        while not self.stopped.wait(self.poll_seconds):
+            signature = file_signature(self.paths)
+            if signature == self.signature:
+                pending = None
+            elif signature != pending:
+                # Still being written: wait until it stays the same for one more poll
+                pending = signature
+            else:
+                self.reload(signature)
+                pending = None
+
+    def reload(self, signature):
+        start = time.perf_counter()
+        try:
+            snapshot = self.build()
+        except Exception as e:
+            # A broken file keeps the last good version
+            print(f"[Hot Reload] Keeping version {self.version}, rebuild failed: {e}")
+            self.signature = signature
+            return
+
+        with self.lock:
+            self.current = snapshot
+            self.version += 1
+            self.signature = signature
+            subscribers = list(self.subscribers.items())
+        print(f"[Hot Reload] Version {self.version} of {', '.join(self.paths)} built in {time.perf_counter() - start:.1f} s, notifying {len(subscribers)} sessions")
+        for doc, callback in subscribers:
+            # The only thread-safe Document method; runs under the session's lock
+            doc.add_next_tick_callback(functools.partial(callback, snapshot))
+        if self.on_reload is not None:
+            self.on_reload(snapshot)
+
+    def subscribe(self, doc, callback):
+        """Call callback(new_snapshot) in doc's session after every reload, until the session ends."""
+        if doc.session_context is None:
+            return
+        with self.lock:
+            if doc not in self.watched_docs:
+                self.watched_docs.add(doc)
+                doc.on_session_destroyed(lambda session_context: self.session_destroyed(doc))
+            self.subscribers[doc] = callback
+
+    def session_destroyed(self, doc):
+        with self.lock:
+            self.subscribers.pop(doc, None)
+            self.watched_docs.discard(doc)
+
+    def in_use(self):
+        """Whether a session is subscribed, i.e. still showing this data."""
+        with self.lock:
+            return bool(self.subscribers)
+
+    def unsubscribe(self, doc):
+        with self.lock:
+            self.subscribers.pop(doc, None)
+
+    def stop(self):
+        self.stopped.set()
+
+
+_reloaders = {}
+_reloaders_lock = threading.Lock()
+
+
+def watch(paths, build, poll_seconds=POLL_SECONDS):
+    """The process-wide HotReloader of these files: built once, shared by every session."""
+    key = tuple(os.path.abspath(path) for path in paths)
+    with _reloaders_lock:
+        if key not in _reloaders:
+            _reloaders[key] = HotReloader(paths, build, poll_seconds)
+        return _reloaders[key]
+
@@ -0,0 +1,194 @@
+import functools
+import threading
+import time
+
+from bokeh.document.events import DocumentPatchedEvent
+from bokeh.protocol import Protocol
+from tornado.web import RequestHandler
+
+# Histogram bucket upper bounds
+LATENCY_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+PAYLOAD_BUCKETS = [1_000, 10_000, 50_000, 100_000, 500_000, 1_000_000, 5_000_000, 20_000_000]
+
+_protocol = Protocol()
+
+
+def callback_name(model, attr, callback):
+    """Readable label for a callback, e.g. Select(Your Champion:).value:update_heatmap."""
+    label = getattr(model, "name", None) or getattr(model, "title", None)
+    model_label = f"{type(model).__name__}({label})" if isinstance(label, str) and label else type(model).__name__
+    function = getattr(callback, "__name__", type(callback).__name__)
+    return f"{model_label}.{attr}:{function}"
+
+
+def wrap_callbacks(doc, wrapper):
+    """Replace every on_change callback registered on the document's models with wrapper(callback, name)."""
+    for model in list(doc.models):
+        for attr, callbacks in getattr(model, "_callbacks", {}).items():
+            for i, callback in enumerate(callbacks):
+                deferred = getattr(callback, "deferred_callbacks", None)
+                if deferred is not None:
+                    # Debounced/throttled handlers (widget_bindings) run their callbacks later: time those
+                    deferred[:] = [wrapper(inner, callback_name(model, attr, inner)) for inner in deferred]
+                else:
+                    callbacks[i] = wrapper(callback, callback_name(model, attr, callback))
+
+
+def payload_size(events):
+    """Bytes of the PATCH-DOC message the server sends to the browser for these events."""
+    events = [event for event in events if isinstance(event, DocumentPatchedEvent)]
+    if not events:
+        return 0
+    message = _protocol.create("PATCH-DOC", events)
+    return len(message.content_json) + sum(memoryview(buffer.data).nbytes for buffer in message.buffers)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.count += 1
+        self.total += value
+
+
+class CallbackMetrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latency = {}
+        self.payload = {}
+        self.sessions = {}
+        self.sessions_created = 0
+        self.sessions_destroyed = 0
+
+    def observe(self, name, session_id, seconds, n_bytes):
+        with self.lock:
+            self.latency.setdefault(name, Histogram(LATENCY_BUCKETS)).observe(seconds)
+            self.payload.setdefault(name, Histogram(PAYLOAD_BUCKETS)).observe(n_bytes)
+            session = self.sessions.get(session_id)
+            if session is not None:
+                session["callbacks"] += 1
+                session["seconds"] += seconds
+                session["bytes"] += n_bytes
+
+    def add_session(self, session_id, doc):
+        with self.lock:
+            if session_id not in self.sessions:
+                self.sessions_created += 1
+            self.sessions[session_id] = {"doc": doc, "callbacks": 0, "seconds": 0.0, "bytes": 0}
+
+    def remove_session(self, session_id):
+        with self.lock:
+            if self.sessions.pop(session_id, None) is not None:
+                self.sessions_destroyed += 1
+
+    def render(self):
+        """Prometheus text exposition format."""
+        lines = []
+        with self.lock:
+            self._render_histograms(lines, "bokeh_callback_duration_seconds", "Time spent in a Bokeh on_change callback.", self.latency)
+            self._render_histograms(lines, "bokeh_callback_payload_bytes", "Size of the document patch a callback sends to the browser.", self.payload)
+
+            lines.append("# HELP bokeh_sessions_active Sessions currently open.")
+            lines.append("# TYPE bokeh_sessions_active gauge")
+            lines.append(f"bokeh_sessions_active {len(self.sessions)}")
+            lines.append("# HELP bokeh_sessions_created_total Sessions opened since the server started.")
+            lines.append("# TYPE bokeh_sessions_created_total counter")
+            lines.append(f"bokeh_sessions_created_total {self.sessions_created}")
+            lines.append("# HELP bokeh_sessions_destroyed_total Sessions closed since the server started.")
+            lines.append("# TYPE bokeh_sessions_destroyed_total counter")
+            lines.append(f"bokeh_sessions_destroyed_total {self.sessions_destroyed}")
+
+            per_session = [
+                ("bokeh_session_callbacks_total", "counter", "Callbacks run in an open session.", "callbacks"),
+                ("bokeh_session_callback_seconds_total", "counter", "Callback time spent in an open session.", "seconds"),
+                ("bokeh_session_payload_bytes_total", "counter", "Patch bytes sent by callbacks of an open session.", "bytes"),
+            ]
+            for metric, kind, help_text, key in per_session:
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} {kind}")
+                for session_id, session in self.sessions.items():
+                    lines.append(f'{metric}{{session="{session_id}"}} {session[key]}')
+
+            lines.append("# HELP bokeh_document_models Models in the document of an open session.")
+            lines.append("# TYPE bokeh_document_models gauge")
+            for session_id, session in self.sessions.items():
+                lines.append(f'bokeh_document_models{{session="{session_id}"}} {len(session["doc"].models)}')
+            lines.append("# HELP bokeh_document_source_cells Values held by the ColumnDataSources of an open session.")
+            lines.append("# TYPE bokeh_document_source_cells gauge")
+            for session_id, session in self.sessions.items():
+                lines.append(f'bokeh_document_source_cells{{session="{session_id}"}} {document_source_cells(session["doc"])}')
+        return "\n".join(lines) + "\n"
+
+    def _render_histograms(self, lines, metric, help_text, histograms):
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} histogram")
+        for name, histogram in sorted(histograms.items()):
+            label = name.replace("\\", "\\\\").replace('"', '\\"')
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                lines.append(f'{metric}_bucket{{callback="{label}",le="{bound}"}} {count}')
+            lines.append(f'{metric}_bucket{{callback="{label}",le="+Inf"}} {histogram.count}')
+            lines.append(f'{metric}_sum{{callback="{label}"}} {histogram.total}')
+            lines.append(f'{metric}_count{{callback="{label}"}} {histogram.count}')
+
+
+def document_source_cells(doc):
+    """Number of values across all ColumnDataSources of a document."""
+    cells = 0
+    for model in list(doc.models):
+        data = getattr(model, "data", None)
+        if isinstance(data, dict):
+            cells += sum(len(column) for column in data.values() if hasattr(column, "__len__"))
+    return cells
+
+
+# One registry per server process, shared by every session
+METRICS = CallbackMetrics()
+
+
+def session_id_of(doc):
+    return doc.session_context.id if doc.session_context is not None else "standalone"
+
+
+def instrument_document(doc, metrics=METRICS):
+    """Time every callback of the document and record its patch size. Call after all on_change calls."""
+    session_id = session_id_of(doc)
+    metrics.add_session(session_id, doc)
+    if doc.session_context is not None:
+        doc.on_session_destroyed(lambda context: metrics.remove_session(context.id))
+
+    # Document events raised while a callback runs make up its payload; nested callbacks
+    # (e.g. a bar click setting a Select) count towards every callback on the stack
+    active = []
+    doc.on_change(lambda event: [events.append(event) for events in active])
+
+    def wrapper(callback, name):
+        @functools.wraps(callback)
+        def timed(attr, old, new):
+            events = []
+            active.append(events)
+            start = time.perf_counter()
+            try:
+                return callback(attr, old, new)
+            finally:
+                elapsed = time.perf_counter() - start
+                active.pop()
+                metrics.observe(name, session_id, elapsed, payload_size(events))
+        return timed
+
+    wrap_callbacks(doc, wrapper)
+
+
+class MetricsHandler(RequestHandler):
+    def initialize(self, metrics=METRICS):
+        self.metrics = metrics
+
+    def get(self):
+        self.set_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.write(self.metrics.render())
@@ -0,0 +1,234 @@
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import runpy
+import statistics
+import time
+
+from bokeh.document import Document
+from bokeh.document.events import ModelChangedEvent
+from bokeh.io.doc import set_curdoc
+from bokeh.model import Model
+
+from instrumentation import payload_size
+from serve import APPS
+
+print("[Interaction Trace] Interaction Trace Loaded.")
+
+# Set by 'python serve.py --record-traces <dir>'; without it nothing is recorded
+TRACE_DIR_ENV = "DASHBOARD_TRACE_DIR"
+
+# Setter of the changes a replay makes: like the browser's own changes, they are not sent back
+REPLAY = object()
+
+
+def ordered_models(doc):
+    """Every model reachable from the roots, in the same order for every session of an app.
+
+    doc.models is a set (its order changes from process to process) and model ids count up per
+    process, so a model is found again by its position in this walk instead.
+    """
+    seen, order = set(), []
+
+    def visit(value):
+        if isinstance(value, Model):
+            if value.id in seen:
+                return
+            seen.add(value.id)
+            order.append(value)
+            for name in sorted(value.properties_with_refs()):
+                visit(getattr(value, name))
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                visit(item)
+        elif isinstance(value, dict):
+            for item in value.values():
+                visit(item)
+
+    for root in doc.roots:
+        visit(root)
+    return order
+
+
+def model_label(model):
+    label = getattr(model, "name", None) or getattr(model, "title", None)
+    return label if isinstance(label, str) else None
+
+
+def locate(doc, model):
+    """(type, label, nth model with that type and label) of a model in the document."""
+    label = model_label(model)
+    same = [other for other in ordered_models(doc) if type(other).__name__ == type(model).__name__ and model_label(other) == label]
+    return type(model).__name__, label, next(i for i, other in enumerate(same) if other is model)
+
+
+def find(doc, model_type, label, nth):
+    same = [model for model in ordered_models(doc) if type(model).__name__ == model_type and model_label(model) == label]
+    return same[nth] if len(same) > nth else None
+
+
+def step_name(step):
+    label = f"({step['label']})" if step["label"] else ""
+    return f"{step['model']}{label}.{step['attr']}"
+
+
+class TraceRecorder:
+    """Appends every change the browser makes to the session's widgets and selections to a JSON lines file.
+
+    The first line describes the session (app, URL arguments, start time); every other line is one
+    change with the seconds since the session opened. Changes made by callbacks are not recorded:
+    replaying the browser's changes runs them again.
+    """
+
+    def __init__(self, doc, app, path):
+        self.doc = doc
+        self.path = path
+        self.start = time.monotonic()
+        arguments = {name: [value.decode() for value in values] for name, values in doc.session_context.request.arguments.items()}
+        self.file = open(path, "w")
+        self.write({"app": app, "session": doc.session_context.id, "arguments": arguments, "started": datetime.datetime.now().isoformat(timespec="seconds")})
+
+    def write(self, record):
+        self.file.write(json.dumps(record) + "\n")
+        # A trace is most useful right after a slow interaction, without waiting for the session to end
+        self.file.flush()
+
+    def on_change(self, event):
+        # Changes applied from the browser's PATCH-DOC carry the session as setter; server-side ones have none
+        if not isinstance(event, ModelChangedEvent) or event.setter is None or self.file.closed:
+            return
+        model_type, label, nth = locate(self.doc, event.model)
+        try:
+            value = json.loads(json.dumps(event.new))
+        except TypeError:
+            print(f"[Interaction Trace] Skipped {model_type}.{event.attr}: value is not JSON")
+            return
+        self.write({"t": round(time.monotonic() - self.start, 3), "model": model_type, "label": label, "nth": nth, "attr": event.attr, "value": value})
+
+    def close(self):
+        self.file.close()
+
+
+def record_session(doc, app, trace_dir=None):
+    """Record the session's interactions to <trace dir>/<app>-<session id>.jsonl if recording is on."""
+    trace_dir = trace_dir or os.environ.get(TRACE_DIR_ENV)
+    if not trace_dir or doc.session_context is None:
+        return None
+    os.makedirs(trace_dir, exist_ok=True)
+    recorder = TraceRecorder(doc, app, os.path.join(trace_dir, f"{app}-{doc.session_context.id}.jsonl"))
+    doc.on_change(recorder.on_change)
+    doc.on_session_destroyed(lambda session_context: recorder.close())
+    return recorder
+
+
+def read_trace(path):
+    """(header, steps) of a trace file."""
+    with open(path) as f:
+        lines = [json.loads(line) for line in f if line.strip()]
+    return lines[0], lines[1:]
+
+
+class TraceReplay:
+    """Re-runs a recorded trace headless against a data snapshot, timing every step.
+
+    load() runs the app script in a fresh document, as a new session would; run() then applies
+    the recorded changes one by one. As in a session without a server, debounced and throttled
+    callbacks run straight away.
+    """
+
+    def __init__(self, trace_path, data_dir):
+        self.header, self.steps = read_trace(trace_path)
+        self.app = self.header["app"]
+        self.app_path = os.path.abspath(APPS.get(self.app, self.app))
+        self.data_dir = os.path.abspath(data_dir)
+        self.doc = None
+
+    def load(self):
+        if self.app == "dashboard":
+            import datasets
+
+            # main.py reads its dataset from the module-level registry
+            if getattr(datasets.registry, "root", None) != self.data_dir:
+                datasets.registry = datasets.DatasetRegistry(root=self.data_dir)
+        self.doc = Document()
+        set_curdoc(self.doc)
+        previous = os.getcwd()
+        # The apps read their files relative to the working directory, like serve.py runs them
+        os.chdir(self.data_dir)
+        try:
+            runpy.run_path(self.app_path, run_name="__bokeh_replay__")
+        finally:
+            os.chdir(previous)
+
+    def run(self):
+        """Apply every step; returns one {step, t, name, ms, bytes, error} per step."""
+        events = []
+        self.doc.on_change(lambda event: events.append(event) if getattr(event, "setter", None) is not REPLAY else None)
+        results = []
+        previous = os.getcwd()
+        os.chdir(self.data_dir)
+        try:
+            for i, step in enumerate(self.steps):
+                result = {"step": i, "t": step["t"], "name": step_name(step), "ms": 0.0, "bytes": 0, "error": None}
+                model = find(self.doc, step["model"], step["label"], step["nth"])
+                if model is None:
+                    result["error"] = "model not found"
+                    results.append(result)
+                    continue
+
+                events.clear()
+                start = time.perf_counter()
+                try:
+                    # set_from_json, like a change from the browser (also sets read-only value_throttled)
+                    model.set_from_json(step["attr"], step["value"], setter=REPLAY)
+                except Exception as e:
+                    # The server logs a failing callback and carries on; so does the replay
+                    result["error"] = f"{type(e).__name__}: {e}"
+                result["ms"] = (time.perf_counter() - start) * 1000
+                result["bytes"] = payload_size(events)
+                results.append(result)
+        finally:
+            os.chdir(previous)
+        return results
+
+
+def replay(trace_path, data_dir, quiet=True):
+    """Load the app of a trace and replay it; the app's print() output is dropped when quiet."""
+    replayer = TraceReplay(trace_path, data_dir)
+    output = contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext()
+    with output:
+        replayer.load()
+        return replayer.run()
+
+
+def report(trace_path, results):
+    print(f"[Interaction Trace] {trace_path}: {len(results)} steps")
+    for result in results:
+        status = f"ERROR {result['error']}" if result["error"] else ""
+        print(f"{result['step']:>5} {result['t']:>9.1f} s  {result['name']:<48} {result['ms']:>9.1f} ms {result['bytes']:>10,} B  {status}")
+
+    timings = sorted(result["ms"] for result in results if not result["error"])
+    if timings:
+        p95 = timings[min(len(timings) - 1, int(round(0.95 * (len(timings) - 1))))]
+        print(f"[Interaction Trace] total {sum(timings):.1f} ms, p50 {statistics.median(timings):.1f} ms, p95 {p95:.1f} ms, "
+              f"max {timings[-1]:.1f} ms, {sum(result['bytes'] for result in results):,} bytes sent")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay recorded dashboard interactions headless and report per-step latency and payload sizes.")
+    parser.add_argument("traces", nargs="+", help="Trace files written by 'python serve.py --record-traces <dir>'")
+    parser.add_argument("--data", default="data", help="Data snapshot: a folder laid out like dashboard/data (dashboard) or good_stuff (3plottorulethemall)")
+    parser.add_argument("--json", help="Also write the per-step results to this file")
+    args = parser.parse_args()
+
+    all_results = {}
+    for trace_path in args.traces:
+        all_results[trace_path] = replay(trace_path, args.data)
+        report(trace_path, all_results[trace_path])
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(all_results, f, indent=2)
@@ -0,0 +1,207 @@
+import argparse
+import hashlib
+import io
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from column_store import ITEM_COLUMNS
+
+print("[Item Stats] Item Statistics Builder Loaded.")
+
+OUTPUT_COLUMNS = ["item_name", "occurrence_count", "win_count", "Category", "champion", "total_games_champion", "role"]
+MATCH_COLUMNS = ["champion", "team_position", "win"] + ITEM_COLUMNS
+# Bytes of the match file parsed at a time
+BLOCK_BYTES = 64 * 1024 * 1024
+# Bytes before the last counted line that must be unchanged for a refresh to carry on from there
+FINGERPRINT_BYTES = 4096
+
+
+def state_path(output_path):
+    """Counts kept next to the output so the next build only reads the new matches."""
+    return os.path.splitext(output_path)[0] + ".state.npz"
+
+
+def fingerprint(f, offset):
+    f.seek(max(0, offset - FINGERPRINT_BYTES))
+    return hashlib.sha1(f.read(min(offset, FINGERPRINT_BYTES))).hexdigest()
+
+
+class ItemStats:
+    """Games and wins of every (champion, role, item), kept as dense count arrays.
+
+    Every batch of matches is encoded into an integer item matrix (one row per match, one
+    column per slot) and counted with one bincount, so there is no melted copy. The file
+    position of the last counted match is kept too: refresh() only reads what was appended
+    since.
+    """
+
+    def __init__(self):
+        self.names = {"champion": [], "role": [], "item": []}
+        self.codes = {name: {} for name in self.names}
+        self.games = np.zeros((0, 0, 0), dtype=np.int64)
+        self.wins = np.zeros((0, 0, 0), dtype=np.int64)
+        self.totals = np.zeros((0, 0), dtype=np.int64)
+        self.source = {"header": None, "offset": 0, "rows": 0, "fingerprint": None}
+
+    def _encode(self, name, values):
+        names, codes = self.names[name], self.codes[name]
+        batch_codes, values = pd.factorize(values)
+        for value in values:
+            if value not in codes:
+                codes[value] = len(names)
+                names.append(value)
+        # Batch code -> kept code; missing values (batch code -1) pick the trailing -1
+        lookup = np.array([codes[value] for value in values] + [-1], dtype=np.int64)
+        return lookup[batch_codes]
+
+    def _grow(self):
+        shape = tuple(len(self.names[name]) for name in ("champion", "role", "item"))
+        if shape != self.games.shape:
+            padding = [(0, new - old) for new, old in zip(shape, self.games.shape)]
+            self.games = np.pad(self.games, padding)
+            self.wins = np.pad(self.wins, padding)
+            self.totals = np.pad(self.totals, padding[:2])
+
+    def add(self, matches):
+        """Count a batch of matches (cleaned_data.csv rows)."""
+        champion = self._encode("champion", matches["champion"].to_numpy())
+        role = self._encode("role", matches["team_position"].to_numpy())
+        items = self._encode("item", matches[ITEM_COLUMNS].to_numpy().ravel()).reshape(len(matches), len(ITEM_COLUMNS))
+        self._grow()
+        n_champions, n_roles, n_items = self.games.shape
+
+        keep = (champion >= 0) & (role >= 0)
+        group = champion[keep].astype(np.int64) * n_roles + role[keep]
+        win = matches["win"].astype(bool).to_numpy()[keep]
+
+        # An item counts once per game however many slots hold it, as in the original process_item_data script
+        items = np.sort(items[keep], axis=1)
+        counted = items >= 0
+        counted[:, 1:] &= items[:, 1:] != items[:, :-1]
+
+        keys = group[:, None] * n_items + items
+        size = n_champions * n_roles * n_items
+        self.games += np.bincount(keys[counted], minlength=size).reshape(self.games.shape)
+        self.wins += np.bincount(keys[counted & win[:, None]], minlength=size).reshape(self.wins.shape)
+        self.totals += np.bincount(group, minlength=n_champions * n_roles).reshape(self.totals.shape)
+        self.source["rows"] += len(matches)
+
+    def stale_reason(self, path):
+        """Why the counts can not be carried on from the match file (None if they can)."""
+        if not os.path.exists(path):
+            return f"{path} not found"
+        if os.path.getsize(path) < self.source["offset"]:
+            return f"{path} is shorter than when last counted"
+        with open(path, "rb") as f:
+            if f.readline().decode() != self.source["header"]:
+                return f"{path} has different columns"
+            if fingerprint(f, self.source["offset"]) != self.source["fingerprint"]:
+                return f"{path} was rewritten, not appended to"
+        return None
+
+    def refresh(self, path, block_bytes=BLOCK_BYTES):
+        """Count the complete lines appended to the match file since the last refresh; returns the number of matches."""
+        rows = self.source["rows"]
+        with open(path, "rb") as f:
+            if self.source["header"] is None:
+                header = f.readline()
+                if not header.endswith(b"\n"):
+                    return 0
+                self.source["header"], self.source["offset"] = header.decode(), len(header)
+            header = self.source["header"].encode()
+            f.seek(self.source["offset"])
+
+            pending = b""
+            while True:
+                block = f.read(block_bytes)
+                if not block:
+                    break
+                block = pending + block
+                # A half-written last line is left for the next refresh
+                end = block.rfind(b"\n") + 1
+                pending = block[end:]
+                if end == 0:
+                    continue
+                matches = pd.read_csv(io.BytesIO(header + block[:end]), usecols=MATCH_COLUMNS,
+                                      dtype={column: str for column in MATCH_COLUMNS if column != "win"})
+                self.add(matches)
+                self.source["offset"] += end
+            self.source["fingerprint"] = fingerprint(f, self.source["offset"])
+        return self.source["rows"] - rows
+
+    def frame(self, items_data):
+        """The counts as final_item_champion_stats.csv rows; Category comes from items.csv (empty for unknown items)."""
+        champion, role, item = np.nonzero(self.games)
+        names = {name: np.array(values, dtype=object) for name, values in self.names.items()}
+        categories = items_data.drop_duplicates("Item").set_index("Item")["Category"]
+        stats = pd.DataFrame({
+            "item_name": names["item"][item],
+            "occurrence_count": self.games[champion, role, item],
+            "win_count": self.wins[champion, role, item],
+            "Category": pd.Series(names["item"][item], dtype=object).map(categories).to_numpy(),
+            "champion": names["champion"][champion],
+            "total_games_champion": self.totals[champion, role],
+            "role": names["role"][role],
+        })
+        stats = stats.sort_values(["role", "champion", "occurrence_count", "item_name"], ascending=[True, True, False, True], kind="stable")
+        return stats[OUTPUT_COLUMNS].reset_index(drop=True)
+
+    def save(self, path):
+        temporary = path + ".tmp"
+        with open(temporary, "wb") as f:
+            np.savez(f, games=self.games, wins=self.wins, totals=self.totals, source=np.array(json.dumps(self.source)),
+                     **{f"names_{name}": np.array(values, dtype=str) for name, values in self.names.items()})
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path):
+        stats = cls()
+        with np.load(path) as state:
+            stats.games, stats.wins, stats.totals = state["games"], state["wins"], state["totals"]
+            stats.source = json.loads(str(state["source"]))
+            for name in stats.names:
+                stats.names[name] = state[f"names_{name}"].tolist()
+                stats.codes[name] = {value: code for code, value in enumerate(stats.names[name])}
+        return stats
+
+
+def build(matches_path, items_path, output_path, full=False, block_bytes=BLOCK_BYTES):
+    """Write final_item_champion_stats.csv, counting only the matches appended since the last build unless full."""
+    stats = None
+    if not full and os.path.exists(state_path(output_path)):
+        stats = ItemStats.load(state_path(output_path))
+        reason = stats.stale_reason(matches_path)
+        if reason:
+            print(f"[Item Stats] Full rebuild: {reason}")
+            stats = None
+    if stats is None:
+        stats = ItemStats()
+
+    new_rows = stats.refresh(matches_path, block_bytes)
+    up_to_date = os.path.exists(output_path) and os.path.getmtime(output_path) >= os.path.getmtime(items_path)
+    if new_rows == 0 and up_to_date:
+        print(f"[Item Stats] No new matches; {output_path} is up to date")
+        return stats
+
+    frame = stats.frame(pd.read_csv(items_path))
+    # Written aside and swapped in, so an app hot-reloading the file never reads half of it
+    temporary = output_path + ".tmp"
+    frame.to_csv(temporary, index=False)
+    os.replace(temporary, output_path)
+    stats.save(state_path(output_path))
+    print(f"[Item Stats] {new_rows:,} new matches ({stats.source['rows']:,} total), {len(frame):,} rows -> {output_path}")
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build final_item_champion_stats.csv (item counts per champion and role) from the matches.")
+    parser.add_argument("--matches", default="cleaned_data.csv", help="Matches in the cleaned_data.csv format")
+    parser.add_argument("--items", default="items.csv", help="Item categories (Item, Category)")
+    parser.add_argument("--out", default="final_item_champion_stats.csv")
+    parser.add_argument("--full", action="store_true", help="Recount every match instead of only the ones appended since the last build")
+    args = parser.parse_args()
+
+    build(args.matches, args.items, args.out, full=args.full)
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+from accel import count_codes
+
+print("[Kernels] Aggregation Kernels Loaded.")
+
+
+def encode(frame, columns):
+    """Integer codes of string columns that share one dictionary: (codes, dictionary).
+
+    codes has one row per column (codes[i] is a contiguous view of columns[i]) and uses the
+    smallest integer type that fits. The dictionary is sorted like groupby sorts its keys; a
+    missing value gets code len(dictionary), one past the last value, so counting needs no mask.
+    """
+    values = set()
+    for column in columns:
+        values.update(frame[column].dropna().unique())
+    dictionary = np.array(sorted(values, key=str), dtype=object)
+    index = pd.Index(dictionary)
+
+    dtype = np.int16 if len(dictionary) < np.iinfo(np.int16).max else np.int32
+    codes = np.empty((len(columns), len(frame)), dtype=dtype)
+    for i, column in enumerate(columns):
+        column_codes = index.get_indexer(frame[column])
+        column_codes[column_codes < 0] = len(dictionary)
+        codes[i] = column_codes
+    return codes, dictionary
+
+
+def count_wins(codes, win, n_values, rows=slice(None)):
+    """Games and wins per code over the stacked code columns, as two int64 arrays of length n_values.
+
+    codes is one column (1-D) or several (a 2-D array or a list of columns, e.g. enemy_1..enemy_5).
+    rows is a slice, a boolean mask or a list of them (e.g. one champion's block in every role
+    partition); slices count straight from the encoded columns. Nothing is stacked: every column
+    adds its own count.
+    """
+    if isinstance(codes, np.ndarray) and codes.ndim == 1:
+        codes = [codes]
+    games = np.zeros(n_values, dtype=np.int64)
+    wins = np.zeros(n_values, dtype=np.int64)
+    for part in rows if isinstance(rows, list) else [rows]:
+        part_win = win[part]
+        for column_codes in codes:
+            # np.bincount, or one compiled pass over the rows with Numba (see accel.py)
+            part_games, part_wins = count_codes(column_codes[part], part_win, n_values)
+            games += part_games
+            wins += part_wins
+    return games, wins
+
+
+def count_rows(win, rows=slice(None)):
+    """(games, wins) of the selected rows."""
+    games = wins = 0
+    for part in rows if isinstance(rows, list) else [rows]:
+        part_win = win[part]
+        games += len(part_win)
+        wins += int(np.count_nonzero(part_win))
+    return games, wins
+
+
+def counts_frame(dictionary, games, wins, name="value", keep=None):
+    """DataFrame (name, count, wins) of the values that were played, in dictionary order.
+
+    keep optionally limits the values (e.g. to the 'Full Item' category).
+    """
+    played = games > 0
+    if keep is not None:
+        played &= np.isin(dictionary, list(keep))
+    played = np.flatnonzero(played)
+    return pd.DataFrame({name: dictionary[played], "count": games[played], "wins": wins[played]})
@@ -0,0 +1,245 @@
+import argparse
+import os
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from bokeh.client import pull_session
+
+from serve import APPS
+
+DASHBOARD_DIR = os.path.dirname(os.path.abspath(__file__))
+
+MIN_GAMES_VALUES = ["10", "20", "30", "50", "100"]
+
+# Widgets each simulated analyst plays with: (action, widget title, nth widget with that title, weight)
+SCENARIOS = {
+    "dashboard": [
+        ("champion", "Select Champion:", 0, 0.35),
+        ("role", "Select Role:", 0, 0.15),
+        ("min_games", "Minimum Games", 0, 0.2),
+        ("enemy_role", "Select Enemy Role:", 0, 0.2),
+        ("ally_role", "Select Ally Role:", 0, 0.1),
+    ],
+    "3plottorulethemall": [
+        ("champion", "Your Champion:", 0, 0.3),
+        ("role", "Your Role:", 0, 0.1),
+        ("min_games", "Minimum Games:", 0, 0.15),
+        ("enemy_role", "Enemy Role:", 0, 0.15),
+        ("sort_metric", "Sort By:", 1, 0.1),
+        ("pyramid_sort", "Sort By:", 0, 0.05),
+        ("top_bottom", "Top/Bottom Enemies to Show", 0, 0.1),
+        ("ally_role", "Ally Role:", 0, 0.05),
+    ],
+}
+
+
+def percentile(values, q):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def server_rss_mb(pid):
+    """Resident memory of the server process (Linux)."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except FileNotFoundError:
+        pass
+    return float("nan")
+
+
+def find_widget(doc, title, nth):
+    matches = [model for model in doc.models if getattr(model, "title", None) == title]
+    return matches[nth] if len(matches) > nth else None
+
+
+def next_value(widget, action, rng):
+    """A new value for the widget, chosen like an analyst would."""
+    if action == "min_games":
+        if hasattr(widget, "start"):
+            return rng.choice([v for v in range(int(widget.start), int(widget.end) + 1, int(widget.step or 1))])
+        return rng.choice(MIN_GAMES_VALUES)
+    if hasattr(widget, "options"):
+        options = [option[0] if isinstance(option, tuple) else option for option in widget.options]
+        return rng.choice(options) if options else None
+    if hasattr(widget, "start"):
+        return rng.randint(int(widget.start), int(widget.end))
+    return None
+
+
+class SessionDriver(threading.Thread):
+    def __init__(self, url, scenario, steps, think_time, seed):
+        super().__init__(daemon=True)
+        self.url = url
+        self.scenario = scenario
+        self.steps = steps
+        self.think_time = think_time
+        self.rng = random.Random(seed)
+        self.latencies = {}
+        self.errors = 0
+        self.ready = threading.Event()
+        self.go = threading.Event()
+
+    def run(self):
+        try:
+            session = pull_session(url=self.url)
+        except Exception as e:
+            print(f"[Load Test] Could not open session: {e}")
+            self.errors += 1
+            self.ready.set()
+            return
+        self.ready.set()
+        self.go.wait()
+
+        try:
+            actions = [step for step in self.scenario if find_widget(session.document, step[1], step[2]) is not None]
+            if not actions:
+                raise RuntimeError("none of the scenario widgets are in the document (did the app fail to load? check the server log)")
+            weights = [step[3] for step in actions]
+            for _ in range(self.steps):
+                action, title, nth, _ = self.rng.choices(actions, weights)[0]
+                widget = find_widget(session.document, title, nth)
+                value = next_value(widget, action, self.rng)
+                if value is None or value == widget.value:
+                    continue
+
+                start = time.perf_counter()
+                widget.value = value
+                if "value_throttled" in widget.properties():
+                    # Read-only for Python code; the browser sets it when a drag ends
+                    widget.set_from_json("value_throttled", value)
+                # Returns once the server processed the change (and ran its callbacks)
+                session.force_roundtrip()
+                self.latencies.setdefault(action, []).append(time.perf_counter() - start)
+
+                if self.think_time:
+                    time.sleep(self.rng.expovariate(1 / self.think_time))
+        except Exception as e:
+            print(f"[Load Test] Session failed: {e}")
+            self.errors += 1
+        finally:
+            session.close()
+
+
+def server_callback_means(base_url):
+    """Mean time per callback from the server's /metrics histograms, slowest first."""
+    try:
+        text = urllib.request.urlopen(f"{base_url}/metrics", timeout=5).read().decode()
+    except (urllib.error.URLError, ConnectionError):
+        return []
+    sums, counts = {}, {}
+    for line in text.splitlines():
+        for metric, target in (("bokeh_callback_duration_seconds_sum", sums), ("bokeh_callback_duration_seconds_count", counts)):
+            if line.startswith(metric + "{"):
+                name = line[line.index('callback="') + 10:line.rindex('"}')]
+                target[name] = float(line.rsplit(" ", 1)[1])
+    means = [(sums[name] / counts[name], counts[name], name) for name in sums if counts.get(name)]
+    return sorted(means, reverse=True)
+
+
+def start_server(app, port):
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(DASHBOARD_DIR, "serve.py"), app, "--port", str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    # Wait until the server answers
+    for _ in range(600):
+        try:
+            urllib.request.urlopen(f"http://localhost:{port}/metrics", timeout=1)
+            return process
+        except (urllib.error.URLError, ConnectionError):
+            if process.poll() is not None:
+                raise RuntimeError(f"Server for {app} exited with code {process.returncode}")
+            time.sleep(0.5)
+    process.kill()
+    raise RuntimeError(f"Server for {app} did not start")
+
+
+def run_level(url, scenario, n_sessions, steps, think_time, server_pid, seed):
+    drivers = [SessionDriver(url, scenario, steps, think_time, seed + i) for i in range(n_sessions)]
+    for driver in drivers:
+        driver.start()
+    for driver in drivers:
+        driver.ready.wait()
+    rss_open = server_rss_mb(server_pid)
+
+    start = time.perf_counter()
+    for driver in drivers:
+        driver.go.set()
+    for driver in drivers:
+        driver.join()
+    elapsed = time.perf_counter() - start
+
+    by_action = {}
+    for driver in drivers:
+        for action, values in driver.latencies.items():
+            by_action.setdefault(action, []).extend(values)
+    latencies = [value for values in by_action.values() for value in values]
+    return {
+        "sessions": n_sessions,
+        "actions": len(latencies),
+        "errors": sum(driver.errors for driver in drivers),
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "rss_mb": rss_open,
+        "rss_peak_mb": max(rss_open, server_rss_mb(server_pid)),
+        "by_action": {action: statistics.median(values) * 1000 for action, values in by_action.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Open many concurrent sessions against a dashboard app and measure latency.")
+    parser.add_argument("app", nargs="?", default="dashboard", choices=sorted(APPS))
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 5, 10, 20, 40], help="Concurrent session counts to test")
+    parser.add_argument("--steps", type=int, default=20, help="Widget changes per session")
+    parser.add_argument("--think-time", type=float, default=0.5, help="Mean pause between changes in seconds (0 = none)")
+    parser.add_argument("--port", type=int, default=5106)
+    parser.add_argument("--url", help="Use an already running server instead of starting one")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        url, server_pid = args.url, None
+    else:
+        server = start_server(args.app, args.port)
+        url, server_pid = f"http://localhost:{args.port}/{os.path.splitext(os.path.basename(APPS[args.app]))[0]}", server.pid
+
+    rss_idle = server_rss_mb(server_pid) if server_pid else float("nan")
+    print(f"[Load Test] {url} - server RSS at start: {rss_idle:.0f} MB")
+    print(f"{'sessions':>8} {'actions':>8} {'errors':>6} {'actions/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'RSS MB':>8} {'MB/session':>10}")
+    try:
+        for n_sessions in args.sessions:
+            result = run_level(url, SCENARIOS[args.app], n_sessions, args.steps, args.think_time, server_pid, args.seed)
+            # Memory the open sessions add on top of the idle server
+            per_session = (result["rss_mb"] - rss_idle) / n_sessions
+            print(
+                f"{result['sessions']:>8} {result['actions']:>8} {result['errors']:>6} {result['throughput']:>10.1f} "
+                f"{result['p50_ms']:>9.1f} {result['p95_ms']:>9.1f} {result['p99_ms']:>9.1f} {result['rss_peak_mb']:>8.0f} {per_session:>10.1f}"
+            )
+            print("         median per action: " + ", ".join(f"{action} {ms:.0f} ms" for action, ms in sorted(result["by_action"].items())))
+
+        print("[Load Test] Slowest server callbacks (from /metrics):")
+        for mean, count, name in server_callback_means(url.rsplit("/", 1)[0])[:8]:
+            print(f"    {mean * 1000:>8.1f} ms  x{count:<5.0f} {name}")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
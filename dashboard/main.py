@@ -1,12 +1,25 @@
 from bokeh.layouts import column, row
 from bokeh.io import curdoc
-from data_loader import DataLoader
+from bokeh.models import CustomJS
+from datasets import registry
 from panels.global_settings import GlobalSettings
 from panels.ally_synergies import AllySynergiesPanel
 from panels.enemy_matchups import EnemyMatchupsPanel
+from cube import COLUMNS as CUBE_COLUMNS, MatchupCube
+from instrumentation import instrument_document
+from interaction_trace import record_session
+from profiling import profile_document
+from streaming import POLL_MS, LiveMatchesPanel, get_stream
 
-# Load shared data
-data_loader = DataLoader()
+# ?dataset=<name> picks the data slice, ?mode=client sends a pre-aggregated cube once and filters it in the browser
+arguments = curdoc().session_context.request.arguments if curdoc().session_context else {}
+dataset = arguments.get("dataset", [registry.default.encode()])[0].decode()
+if dataset not in registry.names():
+    dataset = registry.default
+mode = arguments.get("mode", [b"server"])[0].decode()
+
+# Load shared data (once per server process, see datasets.py)
+data_loader = registry.get(dataset)
 
 print(data_loader.cleaned_data)
 print(data_loader.items_data)
@@ -14,13 +27,13 @@ print(data_loader.get_unique_champions())
 print(data_loader.get_roles())
 
 # Initialize global settings
-global_settings = GlobalSettings(data_loader)
+global_settings = GlobalSettings(data_loader, datasets=registry.names(), dataset=dataset)
 
 print(global_settings.global_settings)
 
 # Initialize panels
-ally_synergies = AllySynergiesPanel(global_settings.global_settings, data_loader.cleaned_data)
-enemy_matchups = EnemyMatchupsPanel(global_settings.global_settings, data_loader.cleaned_data)
+ally_synergies = AllySynergiesPanel(global_settings.global_settings, data_loader)
+enemy_matchups = EnemyMatchupsPanel(global_settings.global_settings, data_loader)
 
 print(ally_synergies.local_settings)
 print(enemy_matchups.local_settings)
@@ -33,14 +46,96 @@ dashboard_layout = column(
     row(ally_synergies.layout(), enemy_matchups.layout())
 )
 
-# Add update callbacks
-def update_all(attr, old, new):
-    ally_synergies.update()
-    enemy_matchups.update()
+dataset_select = global_settings.global_settings.get("dataset")
+filter_settings = [setting for key, setting in global_settings.global_settings.items() if key != "dataset"]
+
+if mode in ("client", "stream") and dataset_select is not None:
+    # The cube and the stream belong to one dataset: reload the page with the other one
+    dataset_select.js_on_change("value", CustomJS(code="""
+        const params = new URLSearchParams(window.location.search);
+        params.set("dataset", cb_obj.value);
+        window.location.search = params.toString();
+    """))
+
+if mode == "client":
+    cube = MatchupCube(data_loader.frame(CUBE_COLUMNS))
+    print(f"[Cube] {len(cube.names)} champions, {cube.nbytes() / 1024:.0f} KB")
+    curdoc().js_on_event("document_ready", *cube.link(global_settings.global_settings, ally_synergies, enemy_matchups))
+elif mode == "stream":
+    # ?mode=stream follows data/stream.csv: panels read the rolling cube, new matches are streamed in
+    live_matches = LiveMatchesPanel(get_stream(data_loader))
+    dashboard_layout.children.insert(len(dashboard_layout.children) - 1, live_matches.layout())
+
+    def update_from_stream(attr, old, new):
+        settings = global_settings.global_settings
+        rolling_cube = live_matches.stream.cube
+        ally_synergies.source.data = rolling_cube.ally_win_rates(
+            settings["champion"].value, settings["role"].value,
+            ally_synergies.local_settings["selected_ally_role"].value, ally_synergies.local_settings["min_games"].value,
+        )
+        enemy_matchups.source.data = rolling_cube.enemy_win_rates(
+            settings["champion"].value, settings["role"].value, enemy_matchups.local_settings["selected_enemy_role"].value,
+        )
+
+    def poll_stream():
+        if live_matches.update():
+            update_from_stream(None, None, None)
+
+    for setting in filter_settings + [ally_synergies.local_settings["selected_ally_role"], enemy_matchups.local_settings["selected_enemy_role"]]:
+        setting.on_change("value", update_from_stream)
+    ally_synergies.local_settings["min_games"].on_change("value_throttled", update_from_stream)
+    update_from_stream(None, None, None)
+    curdoc().add_periodic_callback(poll_stream, POLL_MS)
+else:
+    # Add update callbacks
+    def update_all(attr, old, new):
+        ally_synergies.update()
+        enemy_matchups.update()
+
+    for setting in filter_settings:
+        setting.on_change("value", update_all)
+
+    def use_data_loader(new_loader):
+        """Point the panels at another dataset, or at a new version of this one, and redraw."""
+        for panel in (ally_synergies, enemy_matchups):
+            panel.data_loader = new_loader
+            panel.cleaned_data = new_loader.cleaned_data
+        champion = global_settings.global_settings["champion"].value
+        global_settings.set_data_loader(new_loader)
+        if global_settings.global_settings["champion"].value == champion:
+            # A new champion value already redrew the panels
+            update_all(None, None, None)
 
-for setting in global_settings.global_settings.values():
-    setting.on_change("value", update_all)
+    def change_dataset(attr, old, new):
+        use_data_loader(registry.get(new))
+        registry.subscribe(new, curdoc(), use_data_loader)
+
+    if dataset_select is not None:
+        dataset_select.on_change("value", change_dataset)
+
+    # Refreshed files are loaded in the background and swapped in on this session's next tick
+    registry.subscribe(dataset, curdoc(), use_data_loader)
+
+    # Panel settings only redraw their own panel; the slider waits until it is released
+    def update_ally_synergies(attr, old, new):
+        ally_synergies.update()
+
+    def update_enemy_matchups(attr, old, new):
+        enemy_matchups.update()
+
+    ally_synergies.local_settings["selected_ally_role"].on_change("value", update_ally_synergies)
+    ally_synergies.local_settings["min_games"].on_change("value_throttled", update_ally_synergies)
+    enemy_matchups.local_settings["selected_enemy_role"].on_change("value", update_enemy_matchups)
 
 # Attach layout to document
 curdoc().add_root(dashboard_layout)
 curdoc().title = "LoL Dashboard"
+
+# Record callback latency and payload size for the /metrics endpoint (see serve.py)
+instrument_document(curdoc())
+
+# With 'python serve.py --record-traces <dir>', log the session's widget changes for interaction_trace.py
+record_session(curdoc(), "dashboard")
+
+# With ?profile=<callbacks> (and 'serve.py --profile-dir <dir>'), cProfile a sample of the callbacks
+profile_document(curdoc(), "dashboard")
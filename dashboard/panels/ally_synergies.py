@@ -1,14 +1,15 @@
 from bokeh.models import ColumnDataSource, Select, Slider
 from bokeh.plotting import figure
 from bokeh.layouts import column
-import pandas as pd
+import numpy as np
 
 print("[Ally Synergies] Ally Synergies Panel Loaded.")
 
 class AllySynergiesPanel:
-    def __init__(self, global_settings, cleaned_data):
+    def __init__(self, global_settings, data_loader):
         self.global_settings = global_settings
-        self.cleaned_data = cleaned_data
+        self.data_loader = data_loader
+        self.cleaned_data = data_loader.cleaned_data
         self.role_column_map = {
             "TOP": ["ally_2", "ally_3", "ally_4", "ally_5"],
             "JUNGLE": ["ally_1", "ally_3", "ally_4", "ally_5"],
@@ -41,22 +42,25 @@ class AllySynergiesPanel:
         ally_role = self.local_settings["selected_ally_role"].value
         min_games = self.local_settings["min_games"].value
 
-        filtered_df = self.cleaned_data[(self.cleaned_data["champion"] == champion) & (self.cleaned_data["team_position"] == role)]
         ally_column = f"ally_{list(self.role_column_map.keys()).index(ally_role) + 1}"
-        if ally_column not in filtered_df.columns:
+        if ally_column not in self.data_loader.columns:
             self.source.data = {"ally_champion": [], "win_rate_percent": [], "n_games": [], "color": []}
             return
+        # Games and wins per ally: counted from the encoded columns in memory, or scanned from the column store
+        synergies = self.data_loader.win_rates_by_ally(champion, role, ally_role)
+        synergies = synergies[synergies["n_games"] >= min_games]
+        n_games, n_wins = self.data_loader.champion_totals(champion, role)
 
-        print(filtered_df)
-
-        ally_win_rates = filtered_df.groupby(ally_column)["win"].agg(["mean", "size"]).reset_index()
-        ally_win_rates.columns = ["ally_champion", "win_rate", "n_games"]
-        ally_win_rates["win_rate_percent"] = (ally_win_rates["win_rate"] * 100).round(2)
-        ally_win_rates = ally_win_rates[ally_win_rates["n_games"] >= min_games]
-
-        avg_win_rate = filtered_df["win"].mean() * 100
-        ally_win_rates["color"] = ally_win_rates["win_rate_percent"].apply(lambda x: "#2b93b6" if x >= avg_win_rate else "#e54635")
-        self.source.data = ally_win_rates.to_dict("list")
+        win_rate = synergies["win_rate"].to_numpy()
+        win_rate_percent = np.round(win_rate * 100, 2)
+        avg_win_rate = n_wins / n_games * 100 if n_games else np.nan
+        self.source.data = {
+            "ally_champion": synergies["value"].tolist(),
+            "win_rate": win_rate.tolist(),
+            "n_games": synergies["n_games"].tolist(),
+            "win_rate_percent": win_rate_percent.tolist(),
+            "color": ["#2b93b6" if x >= avg_win_rate else "#e54635" for x in win_rate_percent],
+        }
 
     def layout(self):
         return column([self.local_settings["selected_ally_role"], self.local_settings["min_games"], self.figure])
@@ -1,14 +1,15 @@
 from bokeh.models import ColumnDataSource, Select
 from bokeh.plotting import figure
 from bokeh.layouts import column
-import pandas as pd
+import numpy as np
 
 print("[Enemy Matchups] Enemy Matchups Panel Loaded.")
 
 class EnemyMatchupsPanel:
-    def __init__(self, global_settings, cleaned_data):
+    def __init__(self, global_settings, data_loader):
         self.global_settings = global_settings
-        self.cleaned_data = cleaned_data
+        self.data_loader = data_loader
+        self.cleaned_data = data_loader.cleaned_data
         self.enemy_role_map = {
             "TOP": "enemy_1",
             "JUNGLE": "enemy_2",
@@ -36,21 +37,23 @@ class EnemyMatchupsPanel:
 
     def update(self):
         champion = self.global_settings["champion"].value
-        role = self.local_settings["selected_enemy_role"].value
-
-        filtered_df = self.cleaned_data[self.cleaned_data["champion"] == champion]
-        if role == "ANY":
-            combined = pd.concat([filtered_df[["win", col]].rename(columns={col: "enemy_champion"}) for col in self.enemy_role_map.values() if col])
-        else:
-            combined = filtered_df[["win", self.enemy_role_map[role]]].rename(columns={self.enemy_role_map[role]: "enemy_champion"})
-
-        print(filtered_df)
-
-        win_rates = combined.groupby("enemy_champion")["win"].agg(["mean", "size"]).reset_index()
-        win_rates.columns = ["enemy_champion", "win_rate", "n_games"]
-        win_rates["win_rate_percent"] = (win_rates["win_rate"] * 100).round(2)
-        win_rates["color"] = win_rates["win_rate_percent"].apply(lambda x: "#2b93b6" if x >= filtered_df["win"].mean() * 100 else "#e54635")
-        self.source.data = win_rates.to_dict("list")
+        role = self.global_settings["role"].value
+        enemy_role = self.local_settings["selected_enemy_role"].value
+
+        # Games and wins per enemy: counted from the encoded columns in memory, or scanned from the column store
+        matchups = self.data_loader.win_rates_by_enemy(champion, role, enemy_role)
+        n_games, n_wins = self.data_loader.champion_totals(champion, role)
+
+        win_rate = matchups["win_rate"].to_numpy()
+        win_rate_percent = np.round(win_rate * 100, 2)
+        average = n_wins / n_games * 100 if n_games else np.nan
+        self.source.data = {
+            "enemy_champion": matchups["value"].tolist(),
+            "win_rate": win_rate.tolist(),
+            "n_games": matchups["n_games"].tolist(),
+            "win_rate_percent": win_rate_percent.tolist(),
+            "color": ["#2b93b6" if x >= average else "#e54635" for x in win_rate_percent],
+        }
 
     def layout(self):
         return column([self.local_settings["selected_enemy_role"], self.figure])
@@ -1,7 +1,7 @@
 from bokeh.models import Select
 
 class GlobalSettings:
-    def __init__(self, data_loader):
+    def __init__(self, data_loader, datasets=None, dataset=None):
         self.data_loader = data_loader
 
         # Dynamically populate champion options
@@ -18,5 +18,19 @@ class GlobalSettings:
             ),
         }
 
+        # Only offered when the server has more than one dataset (see datasets.py)
+        if datasets and len(datasets) > 1:
+            dataset_select = Select(title="Select Dataset:", options=list(datasets), value=dataset or datasets[0])
+            self.global_settings = {"dataset": dataset_select, **self.global_settings}
+
+    def set_data_loader(self, data_loader):
+        """Switch to another dataset's champions, keeping the selected champion if it was played there."""
+        self.data_loader = data_loader
+        champions = data_loader.get_unique_champions()
+        champion_select = self.global_settings["champion"]
+        current = champion_select.value
+        champion_select.options = champions
+        champion_select.value = current if current in champions else (champions[0] if champions else None)
+
     def layout(self):
         return [self.global_settings[key] for key in self.global_settings]
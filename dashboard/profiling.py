@@ -0,0 +1,105 @@
+import cProfile
+import functools
+import io
+import itertools
+import math
+import os
+import pstats
+import random
+import threading
+
+from instrumentation import session_id_of, wrap_callbacks
+
+print("[Profiling] Callback Profiling Loaded.")
+
+# Set by 'python serve.py --profile-dir <dir>': where profiles go; ?profile=... only works with it
+PROFILE_DIR_ENV = "DASHBOARD_PROFILE_DIR"
+# Set by 'python serve.py --profile [callbacks]': profile every session, not just ?profile=... ones
+PROFILE_ALL_ENV = "DASHBOARD_PROFILE"
+PROFILE_RATE_ENV = "DASHBOARD_PROFILE_RATE"
+
+DEFAULT_RATE = 0.1
+# Functions listed in each summary
+TOP_FUNCTIONS = 30
+
+# cProfile cannot nest: a callback triggered by a profiled one (a bar click setting a Select) is not profiled again
+_active = threading.Lock()
+_counter = itertools.count(1)
+
+
+def parse_selection(value):
+    """Callback names to profile from 'update_heatmap,update_winrate_plot_with_filters'; None for all."""
+    names = {name.strip() for name in value.split(",") if name.strip()}
+    return None if not names or names & {"1", "all", "true"} else names
+
+
+def profile_settings(doc):
+    """(callback names or None for all, sample rate) for this session, or None when it is not profiled."""
+    if not os.environ.get(PROFILE_DIR_ENV):
+        return None
+    arguments = doc.session_context.request.arguments if doc.session_context is not None else {}
+    requested = arguments.get("profile", [b""])[0].decode() or os.environ.get(PROFILE_ALL_ENV, "")
+    if not requested:
+        return None
+    rate = arguments.get("profile_rate", [os.environ.get(PROFILE_RATE_ENV, str(DEFAULT_RATE)).encode()])[0].decode()
+    try:
+        rate = float(rate)
+        if math.isnan(rate):
+            raise ValueError(rate)
+    except ValueError:
+        # A mistyped URL argument must not break the session
+        print(f"[Profiling] Invalid profile rate '{rate}', using {DEFAULT_RATE}")
+        rate = DEFAULT_RATE
+    return parse_selection(requested), min(max(rate, 0.0), 1.0)
+
+
+def write_profile(profiler, profile_dir, label):
+    """Save <label>.pstats and a <label>.txt summary of the most expensive functions."""
+    os.makedirs(profile_dir, exist_ok=True)
+    path = os.path.join(profile_dir, label)
+    profiler.dump_stats(path + ".pstats")
+    summary = io.StringIO()
+    stats = pstats.Stats(profiler, stream=summary).strip_dirs()
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(TOP_FUNCTIONS)
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(TOP_FUNCTIONS)
+    with open(path + ".txt", "w") as f:
+        f.write(summary.getvalue())
+    return path
+
+
+def profile_document(doc, app):
+    """Run cProfile around a sampled share of the selected callbacks of a profiled session.
+
+    Call after all on_change calls (and after instrument_document, so the timed callback is profiled).
+    """
+    settings = profile_settings(doc)
+    if settings is None:
+        return
+    names, rate = settings
+    profile_dir = os.environ[PROFILE_DIR_ENV]
+    session_id = session_id_of(doc)
+    print(f"[Profiling] Session {session_id}: profiling {', '.join(sorted(names)) if names else 'all callbacks'} at rate {rate}")
+
+    def wrapper(callback, name):
+        function = name.rsplit(":", 1)[-1]
+        if names is not None and function not in names:
+            return callback
+
+        @functools.wraps(callback)
+        def profiled(attr, old, new):
+            if random.random() >= rate or not _active.acquire(blocking=False):
+                return callback(attr, old, new)
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+                try:
+                    return callback(attr, old, new)
+                finally:
+                    profiler.disable()
+            finally:
+                _active.release()
+                path = write_profile(profiler, profile_dir, f"{app}-{session_id[:8]}-{function}-{next(_counter)}")
+                print(f"[Profiling] {name} -> {path}.pstats")
+        return profiled
+
+    wrap_callbacks(doc, wrapper)
@@ -0,0 +1,80 @@
+from collections import OrderedDict
+
+import numpy as np
+
+print("[Ranking] Matchup Ranking Loaded.")
+
+
+def stable_descending(values, indices):
+    """indices ordered by value (high to low), ties by index: the order of a stable descending sort."""
+    return indices[np.lexsort((indices, -values[indices]))]
+
+
+class RankedMatchups:
+    """Win rates of one selection; answers top/bottom k queries without re-sorting."""
+
+    def __init__(self, win_rates):
+        self.win_rates = win_rates.reset_index(drop=True)
+        self.values = self.win_rates["win_rate"].to_numpy(dtype=float)
+        self.order = None
+        self.queries = 0
+
+    def __len__(self):
+        return len(self.values)
+
+    def top_bottom(self, k):
+        """(top k, bottom k) rows, both high to low, as in sorted.head(k) and sorted.tail(k)."""
+        n = len(self.values)
+        k = max(0, min(k, n))
+        self.queries += 1
+        if k == 0:
+            empty = self.win_rates.iloc[[]]
+            return empty, empty
+
+        if self.order is None and self.queries > 1:
+            # Queried again (the slider is moving): sort once, every later query is a slice
+            self.order = stable_descending(self.values, np.arange(n))
+
+        if self.order is not None:
+            top, bottom = self.order[:k], self.order[n - k:]
+        else:
+            top, bottom = self._select_top(k), self._select_bottom(k)
+        return self.win_rates.iloc[top], self.win_rates.iloc[bottom]
+
+    def _select_top(self, k):
+        # Cold query: O(n) selection of the k best, ties broken like the stable sort
+        threshold = self.values[np.argpartition(-self.values, k - 1)[k - 1]]
+        above = np.flatnonzero(self.values > threshold)
+        ties = np.flatnonzero(self.values == threshold)[:k - len(above)]
+        return stable_descending(self.values, np.concatenate([above, ties]))
+
+    def _select_bottom(self, k):
+        threshold = self.values[np.argpartition(self.values, k - 1)[k - 1]]
+        below = np.flatnonzero(self.values < threshold)
+        ties = np.flatnonzero(self.values == threshold)
+        ties = ties[len(ties) - (k - len(below)):] if k > len(below) else ties[:0]
+        return stable_descending(self.values, np.concatenate([below, ties]))
+
+
+class MatchupRanking:
+    """RankedMatchups per (champion, role, enemy role, min games), least recently used dropped first."""
+
+    def __init__(self, build, max_entries=256):
+        self.build = build
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+
+    def get(self, champion, role, enemy_role, min_games):
+        key = (champion, role, enemy_role, min_games)
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+        ranked = RankedMatchups(self.build(champion, role, enemy_role, min_games))
+        self.entries[key] = ranked
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return ranked
+
+    def clear(self):
+        self.entries.clear()
@@ -0,0 +1,83 @@
+import argparse
+import os
+
+from bokeh.command.util import build_single_handler_application
+from bokeh.server.server import Server
+from tornado.web import StaticFileHandler
+
+from build_assets import OUTPUT_DIR as ICONS_DIR, URL_PREFIX as ICONS_URL
+from instrumentation import MetricsHandler
+
+DASHBOARD_DIR = os.path.dirname(os.path.abspath(__file__))
+APPS = {
+    "dashboard": os.path.join(DASHBOARD_DIR, "main.py"),
+    "3plottorulethemall": os.path.join(DASHBOARD_DIR, "..", "good_stuff", "3plottorulethemall.py"),
+}
+
+
+class IconHandler(StaticFileHandler):
+    """Serves the thumbnails of build_assets.py; file names are content hashes, so browsers may keep them."""
+
+    def set_extra_headers(self, path):
+        self.set_header("Cache-Control", "public, max-age=31536000, immutable")
+
+
+def build_server(app_path, port=5006, address="localhost", allow_websocket_origin=None, extra_patterns=(), **server_kwargs):
+    """Bokeh server for one app script, with /metrics and the icon thumbnails mounted next to it."""
+    app_path = os.path.abspath(app_path)
+    # The apps load their CSVs relative to their own folder
+    os.chdir(os.path.dirname(app_path))
+
+    application = build_single_handler_application(app_path)
+    app_name = "/" + os.path.splitext(os.path.basename(app_path))[0]
+    patterns = [("/metrics", MetricsHandler), (ICONS_URL + "/(.*)", IconHandler, {"path": ICONS_DIR})] + list(extra_patterns)
+    return Server(
+        {app_name: application},
+        port=port,
+        address=address,
+        allow_websocket_origin=allow_websocket_origin or [f"localhost:{port}", f"127.0.0.1:{port}"],
+        extra_patterns=patterns,
+        **server_kwargs,
+    ), app_name
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a dashboard app with a Prometheus /metrics endpoint.")
+    parser.add_argument("app", nargs="?", default="dashboard", help=f"One of {sorted(APPS)} or a path to an app script")
+    parser.add_argument("--port", type=int, default=5006)
+    parser.add_argument("--address", default="localhost")
+    parser.add_argument("--allow-websocket-origin", action="append", help="Extra host:port allowed to connect")
+    parser.add_argument("--record-traces", metavar="DIR", help="Record every session's widget changes to a trace file in DIR (see interaction_trace.py)")
+    parser.add_argument("--profile-dir", metavar="DIR", help="Write cProfile .pstats files and summaries of profiled callbacks to DIR; sessions opt in with ?profile=<callbacks>")
+    parser.add_argument("--profile", nargs="?", const="all", metavar="CALLBACKS", help="Profile every session: 'all' or comma separated callback names (needs --profile-dir)")
+    parser.add_argument("--profile-rate", type=float, help="Share of the selected callback calls to profile (default 0.1, ?profile_rate= per session)")
+    parser.add_argument("--dataset-budget-mb", type=float, help="Memory the loaded datasets may use before the least recently used is unloaded")
+    args = parser.parse_args()
+
+    if args.dataset_budget_mb is not None:
+        # Read by datasets.py when the app first imports it
+        os.environ["DASHBOARD_DATASET_BUDGET_MB"] = str(args.dataset_budget_mb)
+
+    if args.record_traces:
+        # Read by interaction_trace.record_session; absolute because build_server changes directory
+        os.environ["DASHBOARD_TRACE_DIR"] = os.path.abspath(args.record_traces)
+
+    if args.profile and not args.profile_dir:
+        parser.error("--profile needs --profile-dir")
+    # Read by profiling.profile_document
+    if args.profile_dir:
+        os.environ["DASHBOARD_PROFILE_DIR"] = os.path.abspath(args.profile_dir)
+    if args.profile:
+        os.environ["DASHBOARD_PROFILE"] = args.profile
+    if args.profile_rate is not None:
+        os.environ["DASHBOARD_PROFILE_RATE"] = str(args.profile_rate)
+
+    server, app_name = build_server(
+        APPS.get(args.app, args.app),
+        port=args.port,
+        address=args.address,
+        allow_websocket_origin=args.allow_websocket_origin,
+    )
+    server.start()
+    print(f"[Server] App at http://{args.address}:{args.port}{app_name}, metrics at http://{args.address}:{args.port}/metrics")
+    server.io_loop.start()
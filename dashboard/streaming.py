@@ -0,0 +1,295 @@
+import argparse
+import io
+import itertools
+import os
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+from bokeh.layouts import column
+from bokeh.models import BooleanFormatter, ColumnDataSource, DataTable, Div, TableColumn
+
+from column_store import ALLY_COLUMNS, ENEMY_COLUMNS, TEXT_COLUMNS
+from cube import ABOVE_AVERAGE_COLOR, BELOW_AVERAGE_COLOR, ROLES
+
+print("[Streaming] Match Stream Loaded.")
+
+STREAM_FILE = "stream.csv"
+# Matches the rolling aggregates cover, and rows kept in the live table
+WINDOW = 100_000
+ROLLOVER = 200
+POLL_MS = 1000
+# The match columns the rolling cube is seeded from
+SEED_COLUMNS = ["champion", "team_position", "win", "game_version"] + ALLY_COLUMNS + ENEMY_COLUMNS
+
+
+class MatchTail:
+    """Reads the complete lines appended to a CSV file since the last call (like tail -f)."""
+
+    def __init__(self, path):
+        self.path = path
+        self.header = None
+        self.offset = 0
+
+    def read_new(self):
+        if not os.path.exists(self.path):
+            return None
+        if os.path.getsize(self.path) < self.offset:
+            # Truncated or replaced: start over
+            self.header, self.offset = None, 0
+
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read()
+        # A half-written last line is picked up on the next call
+        end = data.rfind(b"\n") + 1
+        if end == 0:
+            return None
+        self.offset += end
+        text = data[:end].decode()
+
+        if self.header is None:
+            self.header, _, text = text.partition("\n")
+            self.header += "\n"
+        if not text:
+            return None
+        return pd.read_csv(io.StringIO(self.header + text), dtype={column: str for column in TEXT_COLUMNS})
+
+
+class RollingCube:
+    """Ally/enemy games and wins per (champion, role, slot, other champion) over the last `window` matches.
+
+    Matches are added and, once they fall out of the window, subtracted again, so the panels
+    never re-aggregate the whole table.
+    """
+
+    def __init__(self, window=WINDOW, capacity=256):
+        self.window = window
+        self.names = []
+        self.codes = {}
+        self.capacity = 0
+        self.batches = deque()
+        self.n_matches = 0
+        self._resize(capacity)
+
+    def _resize(self, capacity):
+        def grow(array, shape):
+            bigger = np.zeros(shape, dtype=np.int32)
+            if array is not None:
+                bigger[tuple(slice(0, n) for n in array.shape)] = array
+            return bigger
+
+        self.ally_games = grow(getattr(self, "ally_games", None), (capacity, len(ROLES), len(ROLES), capacity))
+        self.ally_wins = grow(getattr(self, "ally_wins", None), (capacity, len(ROLES), len(ROLES), capacity))
+        self.enemy_games = grow(getattr(self, "enemy_games", None), (capacity, len(ROLES), len(ROLES), capacity))
+        self.enemy_wins = grow(getattr(self, "enemy_wins", None), (capacity, len(ROLES), len(ROLES), capacity))
+        self.games = grow(getattr(self, "games", None), (capacity, len(ROLES)))
+        self.wins = grow(getattr(self, "wins", None), (capacity, len(ROLES)))
+        self.capacity = capacity
+
+    def _encode(self, values):
+        for value in pd.unique(values.dropna()):
+            if value not in self.codes:
+                self.codes[value] = len(self.names)
+                self.names.append(value)
+        if len(self.names) > self.capacity:
+            self._resize(max(len(self.names), 2 * self.capacity))
+        return values.map(self.codes).fillna(-1).to_numpy(dtype=np.int64)
+
+    def add(self, matches):
+        """Count new matches, then drop the oldest ones beyond the window."""
+        matches = matches[matches["team_position"].isin(ROLES) & matches["champion"].notna()]
+        if len(matches) == 0:
+            return
+        batch = {
+            "champion": self._encode(matches["champion"]),
+            "role": pd.Categorical(matches["team_position"], categories=ROLES).codes.astype(np.int64),
+            "win": matches["win"].astype(bool).to_numpy().astype(np.int32),
+            "ally": np.stack([self._encode(matches[column]) for column in ALLY_COLUMNS]),
+            "enemy": np.stack([self._encode(matches[column]) for column in ENEMY_COLUMNS]),
+        }
+        self._apply(batch, 1)
+        self.batches.append(batch)
+        self.n_matches += len(batch["champion"])
+
+        while self.n_matches > self.window:
+            oldest = self.batches[0]
+            drop = min(len(oldest["champion"]), self.n_matches - self.window)
+            head = {key: values[..., :drop] for key, values in oldest.items()}
+            self._apply(head, -1)
+            if drop == len(oldest["champion"]):
+                self.batches.popleft()
+            else:
+                self.batches[0] = {key: values[..., drop:] for key, values in oldest.items()}
+            self.n_matches -= drop
+
+    def _apply(self, batch, sign):
+        champion, role, win = batch["champion"], batch["role"], batch["win"]
+        np.add.at(self.games, (champion, role), sign)
+        np.add.at(self.wins, (champion, role), sign * win)
+        for games, wins, others in ((self.ally_games, self.ally_wins, batch["ally"]), (self.enemy_games, self.enemy_wins, batch["enemy"])):
+            for slot, other in enumerate(others):
+                present = other >= 0
+                index = (champion[present], role[present], slot, other[present])
+                np.add.at(games, index, sign)
+                np.add.at(wins, index, sign * win[present])
+
+    def _win_rates(self, games, wins, champion, role, slot, min_games, name_column):
+        """Panel rows (same columns and colours as the panel's update) from the counts of one champion."""
+        empty = {name_column: [], "win_rate": [], "n_games": [], "win_rate_percent": [], "color": []}
+        code = self.codes.get(champion)
+        if code is None:
+            return empty
+        roles = slice(None) if role not in ROLES else ROLES.index(role)
+        slots = slice(None) if slot not in ROLES else ROLES.index(slot)
+        # Sum over ANY role/slot, leaving the other champion axis
+        other_games = games[code][roles][..., slots, :].reshape(-1, self.capacity).sum(axis=0)[:len(self.names)]
+        other_wins = wins[code][roles][..., slots, :].reshape(-1, self.capacity).sum(axis=0)[:len(self.names)]
+        total_games = self.games[code][roles].sum()
+        if total_games == 0:
+            return empty
+
+        average = self.wins[code][roles].sum() / total_games * 100
+        others = [i for i in np.argsort(self.names[:len(other_games)]) if other_games[i] > 0 and other_games[i] >= min_games]
+        win_rate = other_wins[others] / other_games[others]
+        percent = np.round(win_rate * 100, 2)
+        return {
+            name_column: [self.names[i] for i in others],
+            "win_rate": win_rate.tolist(),
+            "n_games": other_games[others].tolist(),
+            "win_rate_percent": percent.tolist(),
+            "color": [ABOVE_AVERAGE_COLOR if value >= average else BELOW_AVERAGE_COLOR for value in percent],
+        }
+
+    def ally_win_rates(self, champion, role, ally_role, min_games):
+        return self._win_rates(self.ally_games, self.ally_wins, champion, role, ally_role, min_games, "ally_champion")
+
+    def enemy_win_rates(self, champion, role, enemy_role):
+        return self._win_rates(self.enemy_games, self.enemy_wins, champion, role, enemy_role, 0, "enemy_champion")
+
+
+def oldest_patch_first(matches):
+    """Matches ordered by game version, the only notion of time in the snapshot ("14.10" after "14.9")."""
+    version = matches["game_version"].astype(str).str.split(".", expand=True)
+    major = pd.to_numeric(version[0], errors="coerce").fillna(0).to_numpy()
+    minor = pd.to_numeric(version[1], errors="coerce").fillna(0).to_numpy() if version.shape[1] > 1 else np.zeros(len(matches))
+    return matches.iloc[np.lexsort((minor, major))]
+
+
+class MatchStream:
+    """New matches from a tailed file, shared by every session of the server process.
+
+    The file is read at most once per poll interval however many sessions ask; each session
+    then gets the matches it has not seen yet.
+    """
+
+    def __init__(self, path, seed_matches=None, window=WINDOW, rollover=ROLLOVER, poll_ms=POLL_MS):
+        self.tail = MatchTail(path)
+        self.cube = RollingCube(window)
+        self.poll_ms = poll_ms
+        self.last_poll = 0.0
+        self.sequence = 0
+        self.recent = deque(maxlen=rollover)
+        if seed_matches is not None:
+            self.cube.add(oldest_patch_first(seed_matches).tail(window))
+        # Matches already in the file when the server starts are part of the snapshot, not the stream
+        self.tail.read_new()
+
+    def poll(self):
+        now = time.monotonic()
+        if (now - self.last_poll) * 1000 < self.poll_ms / 2:
+            return
+        self.last_poll = now
+        matches = self.tail.read_new()
+        if matches is None or len(matches) == 0:
+            return
+        self.cube.add(matches)
+        for record in matches.to_dict("records"):
+            self.sequence += 1
+            self.recent.append((self.sequence, record))
+
+    def matches_since(self, sequence):
+        """(matches after `sequence` still in the recent buffer, latest sequence)."""
+        self.poll()
+        new = [record for seen, record in self.recent if seen > sequence]
+        return pd.DataFrame(new), self.sequence
+
+
+class LiveMatchesPanel:
+    """The latest streamed matches; its source keeps only the last ROLLOVER rows."""
+
+    columns = ["champion", "team_position", "lane_opponent", "win", "game_version"]
+
+    def __init__(self, stream, rollover=ROLLOVER):
+        self.stream = stream
+        self.rollover = rollover
+        self.sequence = stream.sequence
+        self.source = ColumnDataSource(data={name: [] for name in self.columns})
+        self.status = Div(text=self.status_text())
+        self.table = DataTable(
+            source=self.source,
+            columns=[
+                TableColumn(field="champion", title="Champion"),
+                TableColumn(field="team_position", title="Role"),
+                TableColumn(field="lane_opponent", title="Lane Opponent"),
+                TableColumn(field="win", title="Win", formatter=BooleanFormatter()),
+                TableColumn(field="game_version", title="Patch"),
+            ],
+            width=600,
+            height=200,
+        )
+
+    def status_text(self):
+        return f"Live: {self.stream.sequence:,} new matches, aggregates over the last {self.stream.cube.n_matches:,}"
+
+    def update(self):
+        """Stream the matches that arrived since the last call; True if there were any."""
+        matches, self.sequence = self.stream.matches_since(self.sequence)
+        if len(matches) == 0:
+            return False
+        # Only the new rows are sent; the browser drops the oldest beyond rollover
+        self.source.stream({name: matches[name].tolist() for name in self.columns}, rollover=self.rollover)
+        self.status.text = self.status_text()
+        return True
+
+    def layout(self):
+        return column([self.status, self.table])
+
+
+_streams = {}
+
+
+def get_stream(data_loader, window=WINDOW):
+    """The process-wide stream of a dataset, tailing <data dir>/stream.csv."""
+    path = os.path.join(data_loader.data_dir, STREAM_FILE)
+    if path not in _streams:
+        _streams[path] = MatchStream(path, seed_matches=data_loader.frame(SEED_COLUMNS), window=window)
+    return _streams[path]
+
+
+def produce(path, rate, seed=0, batch_size=10):
+    """Append synthetic matches to path, `rate` per second, standing in for the match collector."""
+    from synthetic_data import MatchGenerator
+
+    generator = MatchGenerator(seed=seed)
+    written = 0
+    header = not os.path.exists(path) or os.path.getsize(path) == 0
+    for batch in itertools.count():
+        for chunk in generator.generate(batch_size, batch_size, start_chunk=batch):
+            with open(path, "a", newline="") as f:
+                chunk.to_csv(f, header=header, index=False)
+            header = False
+            written += len(chunk)
+        print(f"[Streaming] {written:,} matches appended to {path}")
+        time.sleep(batch_size / rate)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Append synthetic matches to a stream file, like the match collector would.")
+    parser.add_argument("--out", default=os.path.join("data", STREAM_FILE), help="Stream file the dashboard tails")
+    parser.add_argument("--rate", type=float, default=20, help="Matches per second")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    produce(args.out, args.rate, seed=args.seed)
@@ -0,0 +1,298 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+ITEMS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "items.csv")
+
+CHAMPIONS = [
+    'Aatrox', 'Ahri', 'Akali', 'Akshan', 'Alistar', 'Amumu', 'Anivia', 'Annie', 'Aphelios',
+    'Ashe', 'AurelionSol', 'Aurora', 'Azir', 'Bard', 'Belveth', 'Blitzcrank', 'Brand', 'Braum',
+    'Briar', 'Caitlyn', 'Camille', 'Cassiopeia', 'Chogath', 'Corki', 'Darius', 'Diana',
+    'DrMundo', 'Draven', 'Ekko', 'Elise', 'Evelynn', 'Ezreal', 'FiddleSticks', 'Fiora', 'Fizz',
+    'Galio', 'Gangplank', 'Garen', 'Gnar', 'Gragas', 'Graves', 'Gwen', 'Hecarim',
+    'Heimerdinger', 'Hwei', 'Illaoi', 'Irelia', 'Ivern', 'Janna', 'JarvanIV', 'Jax', 'Jayce',
+    'Jhin', 'Jinx', 'KSante', 'Kaisa', 'Kalista', 'Karma', 'Karthus', 'Kassadin', 'Katarina',
+    'Kayle', 'Kayn', 'Kennen', 'Khazix', 'Kindred', 'Kled', 'KogMaw', 'Leblanc', 'LeeSin',
+    'Leona', 'Lillia', 'Lissandra', 'Lucian', 'Lulu', 'Lux', 'Malphite', 'Malzahar', 'Maokai',
+    'MasterYi', 'Milio', 'MissFortune', 'MonkeyKing', 'Mordekaiser', 'Morgana', 'Naafiri',
+    'Nami', 'Nasus', 'Nautilus', 'Neeko', 'Nidalee', 'Nilah', 'Nocturne', 'Nunu', 'Olaf',
+    'Orianna', 'Ornn', 'Pantheon', 'Poppy', 'Pyke', 'Qiyana', 'Quinn', 'Rakan', 'Rammus',
+    'RekSai', 'Rell', 'Renata', 'Renekton', 'Rengar', 'Riven', 'Rumble', 'Ryze', 'Samira',
+    'Sejuani', 'Senna', 'Seraphine', 'Sett', 'Shaco', 'Shen', 'Shyvana', 'Singed', 'Sion',
+    'Sivir', 'Skarner', 'Smolder', 'Sona', 'Soraka', 'Swain', 'Sylas', 'Syndra', 'TahmKench',
+    'Taliyah', 'Talon', 'Taric', 'Teemo', 'Thresh', 'Tristana', 'Trundle', 'Tryndamere',
+    'TwistedFate', 'Twitch', 'Udyr', 'Urgot', 'Varus', 'Vayne', 'Veigar', 'Velkoz', 'Vex', 'Vi',
+    'Viego', 'Viktor', 'Vladimir', 'Volibear', 'Warwick', 'Xerath', 'XinZhao', 'Yasuo', 'Yone',
+    'Yorick', 'Yuumi', 'Zac', 'Zed', 'Zeri', 'Ziggs', 'Zilean', 'Zoe', 'Zyra'
+]
+
+# Same order as ally_1..5 / enemy_1..5
+ROLES = ["TOP", "JUNGLE", "MID", "ADC", "SUP"]
+
+PATCHES = [f"14.{minor}" for minor in range(1, 21)]
+
+SUMMONER_SPELLS = ["Flash", "Teleport", "Ignite", "Ghost", "Smite", "Exhaust", "Heal", "Barrier", "Cleanse"]
+# Spell weights per role for the spell that goes next to Flash
+ROLE_SPELL_WEIGHTS = {
+    "TOP": [0, 0.6, 0.2, 0.15, 0, 0.02, 0, 0.02, 0.01],
+    "JUNGLE": [0, 0, 0, 0, 1.0, 0, 0, 0, 0],
+    "MID": [0, 0.35, 0.4, 0.05, 0, 0.05, 0, 0.15, 0],
+    "ADC": [0, 0, 0, 0.05, 0, 0.05, 0.8, 0.05, 0.05],
+    "SUP": [0, 0, 0.45, 0, 0, 0.45, 0.05, 0, 0.05],
+}
+
+# Rune trees: (style, keystones, rows 1-3)
+RUNE_STYLES = {
+    "Precision": (["Conqueror", "Press the Attack", "Lethal Tempo", "Fleet Footwork"],
+                  [["Triumph", "Overheal", "Presence of Mind"],
+                   ["Legend: Alacrity", "Legend: Haste", "Legend: Bloodline"],
+                   ["Last Stand", "Coup de Grace", "Cut Down"]]),
+    "Domination": (["Electrocute", "Dark Harvest", "Hail of Blades"],
+                   [["Cheap Shot", "Taste of Blood", "Sudden Impact"],
+                    ["Eyeball Collection", "Zombie Ward", "Ghost Poro"],
+                    ["Treasure Hunter", "Relentless Hunter", "Ultimate Hunter"]]),
+    "Sorcery": (["Summon Aery", "Arcane Comet", "Phase Rush"],
+                [["Nullifying Orb", "Manaflow Band", "Nimbus Cloak"],
+                 ["Transcendence", "Celerity", "Absolute Focus"],
+                 ["Scorch", "Waterwalking", "Gathering Storm"]]),
+    "Resolve": (["Grasp of the Undying", "Aftershock", "Guardian"],
+                [["Demolish", "Font of Life", "Shield Bash"],
+                 ["Conditioning", "Second Wind", "Bone Plating"],
+                 ["Overgrowth", "Revitalize", "Unflinching"]]),
+    "Inspiration": (["Glacial Augment", "Unsealed Spellbook", "First Strike"],
+                    [["Hextech Flashtraption", "Magical Footwear", "Cash Back"],
+                     ["Triple Tonic", "Time Warp Tonic", "Biscuit Delivery"],
+                     ["Cosmic Insight", "Approach Velocity", "Jack Of All Trades"]]),
+}
+SHARDS = {
+    "perk_shard_offense": ["Adaptive Force", "Attack Speed", "Ability Haste"],
+    "perk_shard_flex": ["Adaptive Force", "Move Speed", "Health Scaling"],
+    "perk_shard_defense": ["Health", "Tenacity and Slow Resist", "Health Scaling"],
+}
+
+COLUMNS = [
+    "champion", "team_position", "lane_opponent", "win", "side", "game_version", "game_duration",
+    "kills", "deaths", "assists", "gold_earned", "total_minions_killed",
+    "lane_minions_first_10_minutes", "max_cs_advantage_on_lane_opponent", "max_level_lead_lane_opponent",
+    "turret_plates_taken", "solo_kills", "turret_kills", "first_blood", "first_tower",
+    "damage_dealt_to_buildings", "total_damage_dealt_champions", "team_damage_percentage",
+    "ally_1", "ally_2", "ally_3", "ally_4", "ally_5",
+    "enemy_1", "enemy_2", "enemy_3", "enemy_4", "enemy_5",
+    "item0", "item1", "item2", "item3", "item4", "item5", "item6",
+    "perk_keystone", "perk_primary_row_1", "perk_primary_row_2", "perk_primary_row_3",
+    "perk_secondary_row_1", "perk_secondary_row_2", "perk_primary_style", "perk_secondary_style",
+    "perk_shard_defense", "perk_shard_flex", "perk_shard_offense",
+    "summoner1_id", "summoner2_id",
+]
+
+
+class MatchGenerator:
+    def __init__(self, seed=0, roles=ROLES, items_path=ITEMS_PATH):
+        # The "world" (popularity, champion strength, builds) depends only on the seed,
+        # so chunks generated separately come from the same distribution
+        self.seed = seed
+        self.roles = list(roles)
+        world = np.random.default_rng(seed)
+        n_champions = len(CHAMPIONS)
+        self.champions = np.array(CHAMPIONS, dtype=object)
+
+        # Zipf-like pick rates per role, each role has its own popular champions
+        ranks = np.arange(1, n_champions + 1)
+        self.role_weights = np.empty((len(ROLES), n_champions))
+        for i in range(len(ROLES)):
+            weights = np.zeros(n_champions)
+            weights[world.permutation(n_champions)] = 1.0 / ranks ** 1.1
+            self.role_weights[i] = weights / weights.sum()
+
+        # Win probability model: champion strength plus a matchup term
+        self.strength = world.normal(0, 0.03, n_champions)
+        self.matchup = world.normal(0, 0.04, (n_champions, n_champions))
+
+        items = pd.read_csv(items_path)
+        self.full_items = items.loc[items["Category"] == "Full Item", "Item"].to_numpy(dtype=object)
+        self.boots = items.loc[items["Category"] == "Boots", "Item"].to_numpy(dtype=object)
+        self.starters = items.loc[items["Category"] == "Starter Item", "Item"].to_numpy(dtype=object)
+        self.trinkets = items.loc[items["Category"] == "Trinket", "Item"].to_numpy(dtype=object)
+
+        # Each champion has a few core items it builds most of the time
+        self.item_log_weights = np.log(world.dirichlet(np.full(len(self.full_items), 0.15), n_champions) + 1e-9).astype(np.float32)
+        self.boot_choice = world.integers(0, len(self.boots), n_champions)
+        self.style_choice = world.integers(0, len(RUNE_STYLES), n_champions)
+
+    def generate(self, n_rows, chunk_size=250_000, start_chunk=0):
+        """Yield DataFrames of at most chunk_size matches until n_rows were produced."""
+        produced = 0
+        chunk_index = start_chunk
+        while produced < n_rows:
+            size = min(chunk_size, n_rows - produced)
+            yield self._chunk(size, np.random.default_rng([self.seed, chunk_index]))
+            produced += size
+            chunk_index += 1
+
+    def _draft(self, rng, size):
+        """Pick ten distinct champions per match, one per role and team."""
+        picks = np.empty((size, 2 * len(ROLES)), dtype=np.int64)
+        n_champions = len(CHAMPIONS)
+        for slot in range(2 * len(ROLES)):
+            picks[:, slot] = rng.choice(n_champions, size=size, p=self.role_weights[slot % len(ROLES)])
+
+        # Redraw the whole lobby for the few matches with a duplicate champion
+        while True:
+            ordered = np.sort(picks, axis=1)
+            duplicates = np.flatnonzero((ordered[:, 1:] == ordered[:, :-1]).any(axis=1))
+            if len(duplicates) == 0:
+                return picks
+            for slot in range(2 * len(ROLES)):
+                picks[duplicates, slot] = rng.choice(n_champions, size=len(duplicates), p=self.role_weights[slot % len(ROLES)])
+
+    def _chunk(self, size, rng):
+        role_index = rng.choice([ROLES.index(role) for role in self.roles], size=size)
+        draft = self._draft(rng, size)
+        rows = np.arange(size)
+        allies = draft[:, :len(ROLES)]
+        enemies = draft[:, len(ROLES):]
+        champion = allies[rows, role_index]
+        opponent = enemies[rows, role_index]
+
+        side = np.where(rng.random(size) < 0.5, "blue", "red")
+        p_win = 0.5 + self.strength[champion] - self.strength[opponent] + self.matchup[champion, opponent] + np.where(side == "blue", 0.01, -0.01)
+        win = rng.random(size) < np.clip(p_win, 0.05, 0.95)
+        sign = np.where(win, 1.0, -1.0)
+
+        game_duration = np.clip(rng.normal(1750, 330, size) - 120 * sign, 900, 3600).astype(np.int64)
+        minutes = game_duration / 60
+        kills = rng.poisson(np.where(win, 7.0, 4.5))
+        deaths = rng.poisson(np.where(win, 3.5, 6.5))
+        assists = rng.poisson(np.where(win, 8.0, 5.0))
+        is_support = role_index == ROLES.index("SUP")
+        is_jungle = role_index == ROLES.index("JUNGLE")
+        lane_minions = np.where(is_support | is_jungle, rng.normal(8, 4, size), rng.normal(68 + 4 * sign, 9, size)).clip(0).round().astype(np.int64)
+        total_minions = (np.where(is_support, 1.2, 6.8) * minutes + rng.normal(0, 15, size)).clip(0).round().astype(np.int64)
+
+        df = pd.DataFrame({
+            "champion": self.champions[champion],
+            "team_position": np.array(ROLES, dtype=object)[role_index],
+            "lane_opponent": self.champions[opponent],
+            "win": win,
+            "side": side,
+            "game_version": np.array(PATCHES, dtype=object)[rng.choice(len(PATCHES), size=size, p=np.linspace(0.5, 1.5, len(PATCHES)) / np.linspace(0.5, 1.5, len(PATCHES)).sum())],
+            "game_duration": game_duration,
+            "kills": kills,
+            "deaths": deaths,
+            "assists": assists,
+            "gold_earned": (380 * minutes + 300 * kills + 100 * assists + rng.normal(0, 800, size)).clip(2000).round().astype(np.int64),
+            "total_minions_killed": total_minions,
+            "lane_minions_first_10_minutes": lane_minions,
+            "max_cs_advantage_on_lane_opponent": rng.normal(10 + 14 * sign, 18, size).round(1),
+            "max_level_lead_lane_opponent": rng.normal(1.2 + 0.8 * sign, 1.0, size).clip(0).round().astype(np.int64),
+            "turret_plates_taken": rng.poisson(np.where(win, 2.6, 1.5)),
+            "solo_kills": rng.poisson(np.where(win, 2.4, 1.4)),
+            "turret_kills": rng.poisson(np.where(win, 1.6, 0.6)),
+            "first_blood": rng.random(size) < 0.18 + 0.06 * sign,
+            "first_tower": rng.random(size) < 0.25 + 0.1 * sign,
+            "damage_dealt_to_buildings": rng.gamma(2.0, np.where(win, 3200, 1700)).round().astype(np.int64),
+            "total_damage_dealt_champions": (rng.gamma(6.0, 3200, size) * minutes / 29).round().astype(np.int64),
+            "team_damage_percentage": rng.beta(8, 30, size).round(4),
+        })
+        for slot in range(len(ROLES)):
+            df[f"ally_{slot + 1}"] = self.champions[allies[:, slot]]
+        for slot in range(len(ROLES)):
+            df[f"enemy_{slot + 1}"] = self.champions[enemies[:, slot]]
+
+        self._add_items(df, rng, champion, minutes)
+        self._add_runes(df, rng, champion)
+        self._add_summoners(df, rng, role_index)
+        return df[COLUMNS]
+
+    def _add_items(self, df, rng, champion, minutes):
+        size = len(df)
+        # Number of finished items grows with game length (1 to 5)
+        n_full = np.clip((minutes / 7).astype(np.int64) + rng.integers(-1, 2, size), 1, 5)
+        # Gumbel top-k: sample full items without replacement, weighted per champion
+        keys = self.item_log_weights[champion] + rng.gumbel(size=(size, len(self.full_items))).astype(np.float32)
+        order = np.argsort(-keys, axis=1)[:, :5]
+        slots = np.full((size, 6), "0", dtype=object)
+        for k in range(5):
+            slots[:, k] = np.where(k < n_full, self.full_items[order[:, k]], "0")
+
+        has_boots = rng.random(size) < 0.9
+        boots = np.where(rng.random(size) < 0.7, self.boots[self.boot_choice[champion]], self.boots[rng.integers(0, len(self.boots), size)])
+        slots[:, 5] = np.where(has_boots, boots, np.where(rng.random(size) < 0.2, self.starters[rng.integers(0, len(self.starters), size)], "0"))
+
+        # Shuffle the inventory so items are not always in the same slot
+        slots = slots[np.arange(size)[:, None], rng.permuted(np.tile(np.arange(6), (size, 1)), axis=1)]
+        for k in range(6):
+            df[f"item{k}"] = slots[:, k]
+        df["item6"] = self.trinkets[rng.choice(len(self.trinkets), size=size, p=[0.75, 0.2, 0.05][:len(self.trinkets)])]
+
+    def _add_runes(self, df, rng, champion):
+        size = len(df)
+        style_names = list(RUNE_STYLES)
+        primary = np.where(rng.random(size) < 0.85, self.style_choice[champion], rng.integers(0, len(style_names), size))
+        secondary = (primary + rng.integers(1, len(style_names), size)) % len(style_names)
+
+        columns = {name: np.empty(size, dtype=object) for name in [
+            "perk_keystone", "perk_primary_row_1", "perk_primary_row_2", "perk_primary_row_3",
+            "perk_secondary_row_1", "perk_secondary_row_2"]}
+        for i, style in enumerate(style_names):
+            keystones, rows = RUNE_STYLES[style]
+            is_primary = primary == i
+            n = int(is_primary.sum())
+            columns["perk_keystone"][is_primary] = np.array(keystones, dtype=object)[rng.integers(0, len(keystones), n)]
+            for r in range(3):
+                columns[f"perk_primary_row_{r + 1}"][is_primary] = np.array(rows[r], dtype=object)[rng.integers(0, 3, n)]
+
+            # Secondary tree: two runes from two different rows
+            is_secondary = secondary == i
+            n = int(is_secondary.sum())
+            first_row = rng.integers(0, 2, n)
+            second_row = first_row + 1 + rng.integers(0, 2 - first_row, n)
+            row_runes = np.array(rows, dtype=object)
+            columns["perk_secondary_row_1"][is_secondary] = row_runes[first_row, rng.integers(0, 3, n)]
+            columns["perk_secondary_row_2"][is_secondary] = row_runes[second_row, rng.integers(0, 3, n)]
+
+        for name, values in columns.items():
+            df[name] = values
+        df["perk_primary_style"] = np.array(style_names, dtype=object)[primary]
+        df["perk_secondary_style"] = np.array(style_names, dtype=object)[secondary]
+        for name, options in SHARDS.items():
+            df[name] = np.array(options, dtype=object)[rng.choice(len(options), size=size, p=[0.6, 0.3, 0.1])]
+
+    def _add_summoners(self, df, rng, role_index):
+        size = len(df)
+        spells = np.array(SUMMONER_SPELLS, dtype=object)
+        other = np.empty(size, dtype=object)
+        for i, role in enumerate(ROLES):
+            in_role = role_index == i
+            other[in_role] = spells[rng.choice(len(spells), size=int(in_role.sum()), p=ROLE_SPELL_WEIGHTS[role])]
+        # Players keep Flash on either key
+        flash_first = rng.random(size) < 0.5
+        df["summoner1_id"] = np.where(flash_first, "Flash", other)
+        df["summoner2_id"] = np.where(flash_first, other, "Flash")
+
+
+def write_csv(path, n_rows, seed=0, chunk_size=250_000, roles=ROLES):
+    """Stream n_rows synthetic matches into a cleaned_data.csv compatible file."""
+    generator = MatchGenerator(seed=seed, roles=roles)
+    start = time.perf_counter()
+    written = 0
+    for i, chunk in enumerate(generator.generate(n_rows, chunk_size)):
+        chunk.to_csv(path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+        written += len(chunk)
+        print(f"[Synthetic] {written:,}/{n_rows:,} rows ({time.perf_counter() - start:.1f}s)")
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic matches in the cleaned_data.csv schema.")
+    parser.add_argument("rows", type=int, help="Number of matches to generate")
+    parser.add_argument("--out", default="data/synthetic_cleaned_data.csv", help="Output CSV path")
+    parser.add_argument("--seed", type=int, default=0, help="Seed, the same seed always gives the same file")
+    parser.add_argument("--chunk-size", type=int, default=250_000, help="Rows generated and written per chunk")
+    parser.add_argument("--roles", nargs="+", default=ROLES, choices=ROLES, help="Player roles to generate")
+    args = parser.parse_args()
+
+    write_csv(args.out, args.rows, seed=args.seed, chunk_size=args.chunk_size, roles=args.roles)
@@ -0,0 +1,59 @@
+print("[Widget Bindings] Widget Bindings Loaded.")
+
+
+class DeferredCallback:
+    """on_change handler that collapses a burst of changes into one call of its callbacks with the latest value.
+
+    Debounced handlers wait until the widget has been quiet for delay_ms; throttled handlers run at
+    most once every delay_ms while changes keep coming. Without a server session (scripts, benchmarks)
+    the callbacks run immediately.
+    """
+
+    def __init__(self, widget, callbacks, delay_ms, restart):
+        self.widget = widget
+        self.deferred_callbacks = list(callbacks)
+        self.delay_ms = delay_ms
+        self.restart = restart
+        self.pending = None
+        self.first_old = None
+        self.latest = None
+
+    def __call__(self, attr, old, new):
+        doc = self.widget.document
+        if doc is None or doc.session_context is None:
+            self.run(attr, old, new)
+            return
+
+        if self.pending is None:
+            self.first_old = old
+        elif self.restart:
+            doc.remove_timeout_callback(self.pending)
+            self.pending = None
+        self.latest = (attr, new)
+        if self.pending is None:
+            self.pending = doc.add_timeout_callback(self.flush, self.delay_ms)
+
+    def flush(self):
+        self.pending = None
+        attr, new = self.latest
+        # A burst that ends where it started changes nothing
+        if new != self.first_old:
+            self.run(attr, self.first_old, new)
+
+    def run(self, attr, old, new):
+        for callback in self.deferred_callbacks:
+            callback(attr, old, new)
+
+
+def debounce(widget, *callbacks, delay_ms=400, attr="value"):
+    """Run callbacks once the widget stopped changing for delay_ms (text inputs)."""
+    handler = DeferredCallback(widget, callbacks, delay_ms, restart=True)
+    widget.on_change(attr, handler)
+    return handler
+
+
+def throttle(widget, *callbacks, delay_ms=150, attr="value"):
+    """Run callbacks at most every delay_ms with the latest value (sliders that update while dragged)."""
+    handler = DeferredCallback(widget, callbacks, delay_ms, restart=False)
+    widget.on_change(attr, handler)
+    return handler
@@ -6,189 +6,230 @@ from bokeh.models import CustomJSTickFormatter, Label
 from bokeh.palettes import linear_palette
 from bokeh.palettes import Blues256
 import numpy as np
-from sklearn.neighbors import KernelDensity
 from bokeh.palettes import RdYlGn11, Viridis256, RdYlBu11, RdYlBu
 from bokeh.models.dom import HTML
 from bokeh.models.glyphs import Rect, Line
-import requests
+import os
+import sys
 import plotly.express as px
 from bokeh.models import TapTool
 from bokeh.models import Slider
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dashboard'))
+from build_assets import IconManifest
+from ddragon import get_store
+from ranking import MatchupRanking
+from widget_bindings import debounce, throttle
+from instrumentation import instrument_document
+from interaction_trace import record_session
+from profiling import profile_document
+from hot_reload import watch
+
 # -------------------------------------------------------------------------------- #
 # Data Loading and Initialization                                                  #
 # -------------------------------------------------------------------------------- #
 
-# Load the item JSON from the URL
-item_json_url = "https://ddragon.leagueoflegends.com/cdn/14.20.1/data/en_US/item.json"
-item_response = requests.get(item_json_url)
-item_data = item_response.json()
-
-# Create a mapping of item names to their IDs
-item_name_to_id = {item['name']: item_id for item_id, item in item_data['data'].items()}
-
-# Load the item JSON from the URL
-item_json_url = "https://ddragon.leagueoflegends.com/cdn/14.20.1/data/en_US/item.json"
-item_response = requests.get(item_json_url)
-item_data = item_response.json()
-
-# Create a mapping of item names to their IDs
-item_name_to_id = {item['name']: item_id for item_id, item in item_data['data'].items()}
-
-# Load data with error handling
-try:
-    file_path = 'cleaned_data.csv'
-    df = pd.read_csv(file_path)
-    df['win'] = df['win'].astype(bool)
-except FileNotFoundError:
-    raise RuntimeError(f"File not found: {file_path}. Ensure the file exists.")
-except pd.errors.ParserError as e:
-    raise RuntimeError(f"Error parsing CSV file {file_path}: {e}")
-
-# Validate required columns exist in the DataFrame
-required_columns = {'champion', 'win', 'enemy_1', 'enemy_2', 'enemy_3', 'enemy_4', 'enemy_5'}
-if not required_columns.issubset(df.columns):
-    raise RuntimeError(f"Missing required columns in the dataset. Expected: {required_columns}")
-
-# Extract unique champions and roles
-champions = sorted(df['champion'].unique().tolist())
-roles = ['TOP', 'JUNGLE', 'MID', 'ADC', 'SUP']
-
-# Load additional item data with error handling
-try:
-    item_data = pd.read_csv('final_item_champion_stats.csv')
-    item_data_filtered = item_data[item_data['Category'].isin(['Full Item'])].copy()
-
-    # Add frequency percentage column
-    item_data_filtered['frequency_percentage'] = (
-        item_data_filtered['occurrence_count'] / item_data_filtered['total_games_champion'] * 100
-    )
+# Item metadata comes from the local Data Dragon store (no network round-trip per session)
+item_name_to_id = get_store().item_name_to_id()
 
-    # Calculate win rate as a percentage
-    item_data_filtered['win_rate'] = (
-        item_data_filtered['win_count'] / item_data_filtered['occurrence_count'] * 100
-    )
-    # Filter items with a frequency percentage of 3 or higher
-    item_data_filtered = item_data_filtered[item_data_filtered['frequency_percentage'] >= 3]
+# Tooltip icons are the thumbnails of dashboard/build_assets.py (served by serve.py), or the full size Data Dragon PNG when none was built
+icons = IconManifest()
 
+def champion_image_url(champion):
+    return icons.url("champion", champion, f"http://ddragon.leagueoflegends.com/cdn/14.20.1/img/champion/{champion}.png")
 
-except FileNotFoundError:
-    raise RuntimeError("File not found: final_item_champion_stats.csv. Ensure the file exists.")
-except pd.errors.ParserError as e:
-    raise RuntimeError(f"Error parsing CSV file: {e}")
+def item_image_url(item_name):
+    return icons.url("item", item_name, f"https://ddragon.leagueoflegends.com/cdn/14.20.1/img/item/{item_name_to_id.get(item_name, 'default')}.png")
 
+roles = ['TOP', 'JUNGLE', 'MID', 'ADC', 'SUP']
 
 color_palette = ["#0d4254", "#10485c", "#134f64", "#16566d", "#195c74", "#1b627c", "#1d6983", "#1f6f8b", "#217593", "#227b9a", "#2481a2", "#2687a8", "#288caf", "#2d92b4", "#4097b3", "#509bb2", "#5b9fb1", "#68a3b1", "#71a8b1", "#7bacb1", "#83b0b2", "#8bb4b3", "#92b8b4", "#98bdb5", "#9fc1b6", "#a5c5b7", "#aac9b8", "#b0cdb8", "#b6d1b8", "#bad5b8", "#c0d8b8", "#c4dcb7", "#cadfb6", "#cfe3b6", "#d4e6b4", "#d8e9b3", "#ddebb2", "#e2eeb0", "#e5f1af", "#eaf3ae", "#edf5ad", "#f0f7ac", "#f3f8ab", "#f6faaa", "#f8fba9", "#f9fca9", "#fbfca9", "#fcfda8", "#fdfea8", "#ffffa8", "#fefda7", "#fefca6", "#fefba5", "#fefaa5", "#fef9a4", "#fef7a3", "#fef5a1", "#fef29f", "#fef09e", "#fdec9b", "#fde999", "#fde696", "#fde294", "#fcdd90", "#fcd98e", "#fcd58a", "#fbd087", "#fbcb83", "#fac680", "#f9c07c", "#f9bb78", "#f8b575", "#f7af71", "#f7a86c", "#f6a269", "#f49b64", "#f39460", "#f28d5b", "#f18657", "#ef7e52", "#ee764d", "#ec6d48", "#ea6543", "#e85b3e", "#e65139", "#e44634", "#dc4231", "#d53e2f", "#cc3c2d", "#c3392a", "#ba3729", "#b23426", "#a93125", "#a02e22", "#972b1f", "#8e271d", "#84241a", "#7b2017", "#721d14"]
 
-# Load heatmap data with error handling
-try:
-    heatmap_file_path = 'heatmap_data.csv'
-    heatmap_data = pd.read_csv(heatmap_file_path)
+# Additional metrics columns (ensure normalization-ready data)
+metrics = [
+    "normalized_winrate",  # Add winrate as the first metric
+    "normalized_lane_minions_first_10_minutes",
+    "normalized_max_cs_advantage_on_lane_opponent",
+    "normalized_max_level_lead_lane_opponent",
+    "normalized_turret_plates_taken",
+    "normalized_solo_kills",
+    "normalized_deaths",
+]
 
-    # Validate necessary columns
-    required_columns = {'champion', 'lane_opponent', 'n_games'}
-    if not required_columns.issubset(heatmap_data.columns):
-        raise ValueError(f"Missing required columns in heatmap data. Expected: {required_columns}")
+# Define color mappers for each metric
+color_mappers = {
+    "normalized_winrate": LinearColorMapper(palette=color_palette[::-1], low=0, high=1),
+    "normalized_lane_minions_first_10_minutes": LinearColorMapper(palette=color_palette[::-1], low=0, high=1),
+    "normalized_max_cs_advantage_on_lane_opponent": LinearColorMapper(palette=color_palette[::-1], low=0, high=1),
+    "normalized_max_level_lead_lane_opponent": LinearColorMapper(palette=color_palette[::-1], low=0, high=1),
+    "normalized_turret_plates_taken": LinearColorMapper(palette=color_palette[::-1], low=0, high=1),
+    "normalized_solo_kills": LinearColorMapper(palette=color_palette[::-1], low=0, high=1),
+    "normalized_deaths": LinearColorMapper(palette=color_palette[::-1], low=0, high=1),  # Non-reversed colormap for Deaths
+}
+
+
+raw_metrics = [
+    "winrate",
+    "lane_minions_first_10_minutes",
+    "max_cs_advantage_on_lane_opponent",
+    "max_level_lead_lane_opponent",
+    "turret_plates_taken",
+    "solo_kills",
+    "deaths",
+]
 
-    # Additional metrics columns (ensure normalization-ready data)
-    metrics = [
-        "normalized_winrate",  # Add winrate as the first metric
-        "normalized_lane_minions_first_10_minutes",
-        "normalized_max_cs_advantage_on_lane_opponent",
-        "normalized_max_level_lead_lane_opponent",
-        "normalized_turret_plates_taken",
-        "normalized_solo_kills",
-        "normalized_deaths",
-    ]
+metric_labels = [
+    "Win Rate",  # Label for winrate
+    "CS First 10min",
+    "Max. \nCS Advantage",
+    "Max. \nLevel Lead",
+    "Turret Plates",
+    "Solo Kills",
+    "Deaths",
+]
 
-    # Define color mappers for each metric
-    color_mappers = {
-        "normalized_winrate": LinearColorMapper(palette=color_palette[::-1], low=0, high=1),
-        "normalized_lane_minions_first_10_minutes": LinearColorMapper(palette=color_palette[::-1], low=0, high=1),
-        "normalized_max_cs_advantage_on_lane_opponent": LinearColorMapper(palette=color_palette[::-1], low=0, high=1),
-        "normalized_max_level_lead_lane_opponent": LinearColorMapper(palette=color_palette[::-1], low=0, high=1),
-        "normalized_turret_plates_taken": LinearColorMapper(palette=color_palette[::-1], low=0, high=1),
-        "normalized_solo_kills": LinearColorMapper(palette=color_palette[::-1], low=0, high=1),
-        "normalized_deaths": LinearColorMapper(palette=color_palette[::-1], low=0, high=1),  # Non-reversed colormap for Deaths
-    }
+# Map metric labels to metrics
+metric_map = dict(zip(metric_labels, metrics))
+raw_metric_map = dict(zip(metric_labels, raw_metrics))
 
 
-    raw_metrics = [
-        "winrate",
-        "lane_minions_first_10_minutes",
-        "max_cs_advantage_on_lane_opponent",
-        "max_level_lead_lane_opponent",
-        "turret_plates_taken",
-        "solo_kills",
-        "deaths",
-    ]
+def load_artifacts():
+    """
+    Load cleaned_data.csv, final_item_champion_stats.csv and heatmap_data.csv and derive the lookups built from them.
+    Runs once per server process, and again in the background whenever one of the files changes.
+    """
+    # Load data with error handling
+    try:
+        file_path = 'cleaned_data.csv'
+        df = pd.read_csv(file_path)
+        df['win'] = df['win'].astype(bool)
+    except FileNotFoundError:
+        raise RuntimeError(f"File not found: {file_path}. Ensure the file exists.")
+    except pd.errors.ParserError as e:
+        raise RuntimeError(f"Error parsing CSV file {file_path}: {e}")
+
+    # Validate required columns exist in the DataFrame
+    required_columns = {'champion', 'win', 'enemy_1', 'enemy_2', 'enemy_3', 'enemy_4', 'enemy_5'}
+    if not required_columns.issubset(df.columns):
+        raise RuntimeError(f"Missing required columns in the dataset. Expected: {required_columns}")
+
+    # Extract unique champions
+    champions = sorted(df['champion'].unique().tolist())
+
+    # Load additional item data with error handling
+    try:
+        item_data = pd.read_csv('final_item_champion_stats.csv')
+        item_data_filtered = item_data[item_data['Category'].isin(['Full Item'])].copy()
+
+        # Add frequency percentage column
+        item_data_filtered['frequency_percentage'] = (
+            item_data_filtered['occurrence_count'] / item_data_filtered['total_games_champion'] * 100
+        )
 
-    metric_labels = [
-        "Win Rate",  # Label for winrate
-        "CS First 10min",
-        "Max. \nCS Advantage",
-        "Max. \nLevel Lead",
-        "Turret Plates",
-        "Solo Kills",
-        "Deaths",
+        # Calculate win rate as a percentage
+        item_data_filtered['win_rate'] = (
+            item_data_filtered['win_count'] / item_data_filtered['occurrence_count'] * 100
+        )
+        # Filter items with a frequency percentage of 3 or higher
+        item_data_filtered = item_data_filtered[item_data_filtered['frequency_percentage'] >= 3]
+
+
+    except FileNotFoundError:
+        raise RuntimeError("File not found: final_item_champion_stats.csv. Ensure the file exists.")
+    except pd.errors.ParserError as e:
+        raise RuntimeError(f"Error parsing CSV file: {e}")
+
+    # Load heatmap data with error handling
+    try:
+        heatmap_file_path = 'heatmap_data.csv'
+        heatmap_data = pd.read_csv(heatmap_file_path)
+
+        # Validate necessary columns
+        required_columns = {'champion', 'lane_opponent', 'n_games'}
+        if not required_columns.issubset(heatmap_data.columns):
+            raise ValueError(f"Missing required columns in heatmap data. Expected: {required_columns}")
+    except FileNotFoundError:
+        raise RuntimeError(f"File not found: {heatmap_file_path}. Ensure the file exists.")
+    except pd.errors.ParserError as e:
+        raise RuntimeError(f"Error parsing CSV file {heatmap_file_path}: {e}")
+
+
+    # Validate that the required new columns are present in the DataFrame
+    required_columns = [
+        'overall_winrate',
+        'overall_avg_lane_minions_first_10_minutes',
+        'overall_avg_max_cs_advantage_on_lane_opponent',
+        'overall_avg_max_level_lead_lane_opponent',
+        'overall_avg_turret_plates_taken',
+        'overall_avg_solo_kills',
+        'overall_avg_deaths'
     ]
 
-    # Map metric labels to metrics
-    metric_map = dict(zip(metric_labels, metrics))
-    raw_metric_map = dict(zip(metric_labels, raw_metrics))
-except FileNotFoundError:
-    raise RuntimeError(f"File not found: {heatmap_file_path}. Ensure the file exists.")
-except pd.errors.ParserError as e:
-    raise RuntimeError(f"Error parsing CSV file {heatmap_file_path}: {e}")
-
-
-# Validate that the required new columns are present in the DataFrame
-required_columns = [
-    'overall_winrate',
-    'overall_avg_lane_minions_first_10_minutes',
-    'overall_avg_max_cs_advantage_on_lane_opponent',
-    'overall_avg_max_level_lead_lane_opponent',
-    'overall_avg_turret_plates_taken',
-    'overall_avg_solo_kills',
-    'overall_avg_deaths'
-]
+    if not set(required_columns).issubset(heatmap_data.columns):
+        raise ValueError(f"Missing required columns in the dataset. Expected: {required_columns}")
+
+    # Extract unique champions
+    unique_champions = heatmap_data['champion'].unique()
+
+    # Dictionary to store the overall averages for each champion
+    overall_metrics_per_champion = {}
+
+    # Calculate and print overall averages per champion
+    for champion in unique_champions:
+        # Filter the data for the current champion
+        champion_data = heatmap_data[heatmap_data['champion'] == champion]
+
+        # Extract the overall metrics (constant per champion)
+        if not champion_data.empty:
+            overall_metrics_per_champion[champion] = {
+                "overall_winrate": champion_data['overall_winrate'].iloc[0],
+                "avg_lane_minions_first_10_minutes": champion_data['overall_avg_lane_minions_first_10_minutes'].iloc[0],
+                "avg_max_cs_advantage_on_lane_opponent": champion_data['overall_avg_max_cs_advantage_on_lane_opponent'].iloc[0],
+                "avg_max_level_lead_lane_opponent": champion_data['overall_avg_max_level_lead_lane_opponent'].iloc[0],
+                "avg_turret_plates_taken": champion_data['overall_avg_turret_plates_taken'].iloc[0],
+                "avg_solo_kills": champion_data['overall_avg_solo_kills'].iloc[0],
+                "avg_deaths": champion_data['overall_avg_deaths'].iloc[0],
+            }
+
+            # Print the results for verification
+            print(f"Overall averages for {champion}:")
+            print(f"  - Winrate: {overall_metrics_per_champion[champion]['overall_winrate']}%")
+            print(f"  - Avg CS First 10 min: {overall_metrics_per_champion[champion]['avg_lane_minions_first_10_minutes']}")
+            print(f"  - Avg Max CS Advantage: {overall_metrics_per_champion[champion]['avg_max_cs_advantage_on_lane_opponent']}")
+            print(f"  - Avg Max Level Lead: {overall_metrics_per_champion[champion]['avg_max_level_lead_lane_opponent']}")
+            print(f"  - Avg Turret Plates Taken: {overall_metrics_per_champion[champion]['avg_turret_plates_taken']}")
+            print(f"  - Avg Solo Kills: {overall_metrics_per_champion[champion]['avg_solo_kills']}")
+            print(f"  - Avg Deaths: {overall_metrics_per_champion[champion]['avg_deaths']}")
+            print("-" * 40)
+
+    return dict(
+        df=df,
+        champions=champions,
+        item_data=item_data,
+        item_data_filtered=item_data_filtered,
+        heatmap_data=heatmap_data,
+        unique_champions=unique_champions,
+        overall_metrics_per_champion=overall_metrics_per_champion,
+    )
 
-if not set(required_columns).issubset(heatmap_data.columns):
-    raise ValueError(f"Missing required columns in the dataset. Expected: {required_columns}")
 
-# Extract unique champions
-unique_champions = heatmap_data['champion'].unique()
+def use_artifacts(snapshot):
+    """
+    Make one version of the loaded data the module globals every callback reads.
+    """
+    global df, champions, item_data, item_data_filtered, heatmap_data, unique_champions, overall_metrics_per_champion
+    df = snapshot["df"]
+    champions = snapshot["champions"]
+    item_data = snapshot["item_data"]
+    item_data_filtered = snapshot["item_data_filtered"]
+    heatmap_data = snapshot["heatmap_data"]
+    unique_champions = snapshot["unique_champions"]
+    overall_metrics_per_champion = snapshot["overall_metrics_per_champion"]
 
-# Dictionary to store the overall averages for each champion
-overall_metrics_per_champion = {}
 
-# Calculate and print overall averages per champion
-for champion in unique_champions:
-    # Filter the data for the current champion
-    champion_data = heatmap_data[heatmap_data['champion'] == champion]
-    
-    # Extract the overall metrics (constant per champion)
-    if not champion_data.empty:
-        overall_metrics_per_champion[champion] = {
-            "overall_winrate": champion_data['overall_winrate'].iloc[0],
-            "avg_lane_minions_first_10_minutes": champion_data['overall_avg_lane_minions_first_10_minutes'].iloc[0],
-            "avg_max_cs_advantage_on_lane_opponent": champion_data['overall_avg_max_cs_advantage_on_lane_opponent'].iloc[0],
-            "avg_max_level_lead_lane_opponent": champion_data['overall_avg_max_level_lead_lane_opponent'].iloc[0],
-            "avg_turret_plates_taken": champion_data['overall_avg_turret_plates_taken'].iloc[0],
-            "avg_solo_kills": champion_data['overall_avg_solo_kills'].iloc[0],
-            "avg_deaths": champion_data['overall_avg_deaths'].iloc[0],
-        }
-
-        # Print the results for verification
-        print(f"Overall averages for {champion}:")
-        print(f"  - Winrate: {overall_metrics_per_champion[champion]['overall_winrate']}%")
-        print(f"  - Avg CS First 10 min: {overall_metrics_per_champion[champion]['avg_lane_minions_first_10_minutes']}")
-        print(f"  - Avg Max CS Advantage: {overall_metrics_per_champion[champion]['avg_max_cs_advantage_on_lane_opponent']}")
-        print(f"  - Avg Max Level Lead: {overall_metrics_per_champion[champion]['avg_max_level_lead_lane_opponent']}")
-        print(f"  - Avg Turret Plates Taken: {overall_metrics_per_champion[champion]['avg_turret_plates_taken']}")
-        print(f"  - Avg Solo Kills: {overall_metrics_per_champion[champion]['avg_solo_kills']}")
-        print(f"  - Avg Deaths: {overall_metrics_per_champion[champion]['avg_deaths']}")
-        print("-" * 40)
+# Loaded once per server process and shared by all sessions; rebuilt in the background when a file changes
+artifacts = watch(['cleaned_data.csv', 'final_item_champion_stats.csv', 'heatmap_data.csv'], load_artifacts)
+use_artifacts(artifacts.current)
 
 # Save the overall metrics dictionary for later use
 # This dictionary can be accessed for heatmap updates or any other purpose.
@@ -201,18 +242,14 @@ def add_item_image_urls(pyramid_data):
     """
     Add item image URLs to the population pyramid data based on item names.
     """
-    pyramid_data['image_url'] = pyramid_data['item_name'].apply(
-        lambda name: f"https://ddragon.leagueoflegends.com/cdn/14.20.1/img/item/{item_name_to_id.get(name, 'default')}.png"
-    )
+    pyramid_data['image_url'] = pyramid_data['item_name'].apply(item_image_url)
     return pyramid_data
 
 def add_item_image_urls(pyramid_data):
     """
     Add item image URLs to the population pyramid data based on item names.
     """
-    pyramid_data['image_url'] = pyramid_data['item_name'].apply(
-        lambda name: f"https://ddragon.leagueoflegends.com/cdn/14.20.1/img/item/{item_name_to_id.get(name, 'default')}.png"
-    )
+    pyramid_data['image_url'] = pyramid_data['item_name'].apply(item_image_url)
     return pyramid_data
 
 def calculate_overall_win_rate(champion: str) -> float:
@@ -309,7 +346,7 @@ champion_stats = Div(
         border-radius: 5px; 
         padding: 10px;
     ">
-        <img src='http://ddragon.leagueoflegends.com/cdn/14.20.1/img/champion/{champions[0]}.png' 
+        <img src='{champion_image_url(champions[0])}' 
              style="width:50px; height:50px; margin-right:10px; border-radius:5px;">
         <div>
             <span style="font-size:20px; font-weight:bold;">{overall_avg_win_rate:.1f}%</span> 
@@ -346,7 +383,7 @@ def update_champion_image_and_stats(attr, old, new):
             border-radius: 5px; 
             padding: 5px;
         ">
-            <img src='http://ddragon.leagueoflegends.com/cdn/14.20.1/img/champion/{selected_champion}.png' 
+            <img src='{champion_image_url(selected_champion)}' 
                  style="width:50px; height:50px; margin-right:10px; border-radius:5px;">
             <div>
                 <span style="font-size:15px; font-weight:bold;">{overall_winrate:.1f}%</span> 
@@ -449,28 +486,32 @@ def create_winrate_plot():
     legend.border_line_alpha = 0  # Remove the legend border
     p.add_layout(legend)
 
-    return p, avg_win_rate_line
-
-def update_winrate_plot_with_filters(attr, old, new):
-    global overall_avg_win_rate
-
-    # Calculate overall win rate for the selected champion
-    overall_avg_win_rate = calculate_overall_win_rate(champion_select.value)
-
-    # Update the overall win rate display
-    overall_winrate_div.text = f"Overall Win Rate: {overall_avg_win_rate:.2f}%"
-
-    # Validate the minimum games input
-    min_games = validate_numeric_input(min_games_input.value, default=10)
+    p.add_tools(TapTool())
+    p.add_tools(HoverTool(
+        renderers=[bars],
+        tooltips="""
+        <div style="display: flex; align-items: center;">
+            <div>
+                <img src="@image_url" style="width: 50px; height: 50px; margin-right: 10px; border-radius: 5px;">
+            </div>
+            <div>
+                <span style="font-size: 14px; font-weight: bold;">@enemy_champion</span><br>
+                Win Rate: <span style="font-size: 12px;">@win_rate_percent%</span><br>
+                Games Played: <span style="font-size: 12px;">@n_games</span>
+            </div>
+        </div>
+        """
+    ))
 
-    selected_role = enemy_role_select.value
-    selected_enemy = enemy_champion_select.value if enemy_champion_select.value else None
+    return p, avg_win_rate_line
 
+def calculate_enemy_win_rates(champion, role, enemy_role, min_games):
+    """Win rate and games against every enemy for one selection (unsorted)."""
     # Filter data for the selected champion and role
-    filtered_df = df[(df['champion'] == champion_select.value) & (df['team_position'] == role_select.value)]
+    filtered_df = df[(df['champion'] == champion) & (df['team_position'] == role)]
 
     # Handle filtering by enemy role
-    if selected_role == "ANY":
+    if enemy_role == "ANY":
         filtered_df = pd.concat([
             filtered_df[['win', 'enemy_1']].rename(columns={'enemy_1': 'enemy_champion'}),
             filtered_df[['win', 'enemy_2']].rename(columns={'enemy_2': 'enemy_champion'}),
@@ -486,7 +527,7 @@ def update_winrate_plot_with_filters(attr, old, new):
             "ADC": "enemy_4",
             "SUPPORT": "enemy_5"
         }
-        column = role_column_map.get(selected_role)
+        column = role_column_map.get(enemy_role)
         if column:
             filtered_df = filtered_df.rename(columns={column: "enemy_champion"})
 
@@ -500,23 +541,53 @@ def update_winrate_plot_with_filters(attr, old, new):
     win_rates['win_rate_percent'] = (win_rates['win_rate'] * 100).round(2)
     win_rates = win_rates[win_rates['n_games'] >= min_games]
 
+    # Add image URLs
+    win_rates['image_url'] = win_rates['enemy_champion'].apply(champion_image_url)
+    return win_rates
+
+# Win-rate orders per (champion, role, enemy role, min games): moving the slider only slices them
+matchup_rankings = MatchupRanking(calculate_enemy_win_rates)
+
+def current_ranking():
+    min_games = validate_numeric_input(min_games_input.value, default=10)
+    return matchup_rankings.get(champion_select.value, role_select.value, enemy_role_select.value, min_games)
+
+def update_winrate_plot_with_filters(attr, old, new):
+    global overall_avg_win_rate
+
+    # Calculate overall win rate for the selected champion
+    overall_avg_win_rate = calculate_overall_win_rate(champion_select.value)
+
+    # Update the overall win rate display
+    overall_winrate_div.text = f"Overall Win Rate: {overall_avg_win_rate:.2f}%"
+
+    ranking = current_ranking()
+
     # Dynamically adjust the slider's range based on unique enemy champions
-    num_unique_enemies = len(win_rates['enemy_champion'].unique())
-    max_top_bottom = max(1, num_unique_enemies // 2)  # Ensure at least 1 is allowed
+    max_top_bottom = max(1, len(ranking) // 2)  # Ensure at least 1 is allowed
     top_bottom_slider.end = max_top_bottom  # Update the slider's maximum value
 
+    show_top_bottom_matchups(ranking)
+    winrate_plot.title.text = f"Win Rate Against Enemies as {champion_select.value} ({role_select.value}) - Showing Best and Worst Matchups"
+    avg_win_rate_line.location = overall_avg_win_rate
+
+
+def update_winrate_top_bottom(attr, old, new):
+    """Slider callback: the selection is unchanged, so only the shown slice changes."""
+    show_top_bottom_matchups(current_ranking())
+
+
+def show_top_bottom_matchups(ranking):
+    selected_enemy = enemy_champion_select.value if enemy_champion_select.value else None
+
     # Get the slider's value for top/bottom enemies to show
+    max_top_bottom = max(1, len(ranking) // 2)
     num_top_bottom = min(top_bottom_slider.value, max_top_bottom)  # Constrain slider value within range
 
-    # Add image URLs
-    win_rates['image_url'] = win_rates['enemy_champion'].apply(
-        lambda x: f"http://ddragon.leagueoflegends.com/cdn/14.20.1/img/champion/{x}.png"
-    )
-
-    # Sort and assign colors/hatches
-    win_rates_sorted = win_rates.sort_values(by="win_rate", ascending=False)
-    top_n = win_rates_sorted.head(num_top_bottom).copy()  # Use slider value
-    bottom_n = win_rates_sorted.tail(num_top_bottom).copy()  # Use slider value
+    # Top and bottom matchups and assign colors/hatches
+    top_n, bottom_n = ranking.top_bottom(num_top_bottom)
+    top_n = top_n.copy()
+    bottom_n = bottom_n.copy()
 
     top_n['color'] = '#2b93b6'  # Blue for top matchups
     bottom_n['color'] = '#e54635'  # Red for bottom matchups
@@ -528,6 +599,7 @@ def update_winrate_plot_with_filters(attr, old, new):
 
     # Handle specific enemy selection
     if selected_enemy:
+        win_rates = ranking.win_rates
         selected_enemy_row = win_rates[win_rates['enemy_champion'] == selected_enemy].copy()
         if not selected_enemy_row.empty:
             # Assign special color and hatch to the selected enemy
@@ -544,31 +616,9 @@ def update_winrate_plot_with_filters(attr, old, new):
                 combined = pd.concat([combined, selected_enemy_row])
 
     # Update plot data
-    combined = combined.sort_values(by="win_rate", ascending=False)
+    combined = combined.sort_values(by="win_rate", ascending=False, kind="stable")
     winrate_source.data = combined.to_dict(orient='list')
     winrate_plot.x_range.factors = list(combined['enemy_champion'])
-    winrate_plot.title.text = f"Win Rate Against Enemies as {champion_select.value} ({role_select.value}) - Showing Best and Worst Matchups"
-
-    tap_tool = TapTool()
-    winrate_plot.add_tools(tap_tool)
-
-    hover = HoverTool(
-        tooltips="""
-        <div style="display: flex; align-items: center;">
-            <div>
-                <img src="@image_url" style="width: 50px; height: 50px; margin-right: 10px; border-radius: 5px;">
-            </div>
-            <div>
-                <span style="font-size: 14px; font-weight: bold;">@enemy_champion</span><br>
-                Win Rate: <span style="font-size: 12px;">@win_rate_percent%</span><br>
-                Games Played: <span style="font-size: 12px;">@n_games</span>
-            </div>
-        </div>
-        """
-    )
-    winrate_plot.add_tools(hover)
-
-    avg_win_rate_line.location = overall_avg_win_rate
 
 
 def on_bar_click(attr, old, new):
@@ -681,9 +731,7 @@ def update_ally_synergy_plot(attr, old, new):
     )
 
     # Add image URLs dynamically
-    ally_data['image_url'] = ally_data['ally_champion'].apply(
-        lambda x: f"http://ddragon.leagueoflegends.com/cdn/14.20.1/img/champion/{x}.png"
-    )
+    ally_data['image_url'] = ally_data['ally_champion'].apply(champion_image_url)
 
     # Update the plot with sorted data
     ally_synergy_source.data = ally_data.to_dict(orient='list')
@@ -722,9 +770,7 @@ def update_ally_synergy_plot_on_role(attr, old, new):
     )
 
     # Add image URLs
-    ally_data['image_url'] = ally_data['ally_champion'].apply(
-        lambda x: f"http://ddragon.leagueoflegends.com/cdn/14.20.1/img/champion/{x}.png"
-    )
+    ally_data['image_url'] = ally_data['ally_champion'].apply(champion_image_url)
 
     # Update the plot
     ally_synergy_source.data = ally_data.to_dict(orient='list')
@@ -982,9 +1028,7 @@ def update_heatmap(attr, old, new):
     updated_data = updated_data.sort_values(by=selected_sort_metric, ascending=False)
 
     # Add image URLs
-    updated_data['image_url'] = updated_data['lane_opponent'].apply(
-        lambda x: f"http://ddragon.leagueoflegends.com/cdn/14.20.1/img/champion/{x}.png"
-    )
+    updated_data['image_url'] = updated_data['lane_opponent'].apply(champion_image_url)
 
     # Prepare new source data
     new_source_data = {
@@ -1008,24 +1052,19 @@ def update_heatmap(attr, old, new):
         "normalized_deaths": "avg_deaths",
     }
 
-    # Adjust the data preparation to use the mapping
-    for metric, label in zip(metrics, metric_labels):
+    # One cell per (metric, opponent), metric by metric: whole columns are repeated instead of looping over the rows
+    cell_metrics = [(metric, label) for metric, label in zip(metrics, metric_labels) if metric_to_overall_key.get(metric) is not None]
+    champion_names = updated_data["champion"].tolist()
+    for metric, label in cell_metrics:
         raw_metric = raw_metric_map[label]
-        for _, row in updated_data.iterrows():
-            champion_name = row["champion"]
-            # Use the mapping to get the correct overall key
-            overall_key = metric_to_overall_key.get(metric, None)
-            if overall_key is None:
-                continue  # Skip if no matching key is found
-            average_metric = overall_metrics_per_champion[champion_name][overall_key]
-
-            new_source_data["lane_opponent"].append(row["lane_opponent"])
-            new_source_data["metric"].append(label)
-            new_source_data["value"].append(row[metric])  # Normalized value
-            new_source_data["raw_value"].append(row[raw_metric])  # Raw value for tooltip
-            new_source_data["average_value"].append(average_metric)  # Overall average value
-            new_source_data["n_games"].append(row["n_games"])
-            new_source_data["image_url"].append(row["image_url"])  # Image URL
+        overall_key = metric_to_overall_key[metric]
+        new_source_data["lane_opponent"].extend(updated_data["lane_opponent"].tolist())
+        new_source_data["metric"].extend([label] * len(updated_data))
+        new_source_data["value"].extend(updated_data[metric].tolist())  # Normalized value
+        new_source_data["raw_value"].extend(updated_data[raw_metric].tolist())  # Raw value for tooltip
+        new_source_data["average_value"].extend(overall_metrics_per_champion[name][overall_key] for name in champion_names)  # Overall average value
+        new_source_data["n_games"].extend(updated_data["n_games"].tolist())
+        new_source_data["image_url"].extend(updated_data["image_url"].tolist())  # Image URL
 
     # Update the source data for the heatmap
     source.data = new_source_data
@@ -1277,11 +1316,9 @@ role_select.on_change("value", update_population_pyramid)
 role_select.on_change("value", update_heatmap)
 
 # Enemy-specific callbacks
-min_games_input.on_change("value", update_winrate_plot_with_filters)
 enemy_role_select.on_change("value", update_enemy_champion_options)
 enemy_champion_select.on_change("value", update_winrate_plot_with_filters)
 
-min_games_input.on_change("value", update_enemy_champion_options)
 enemy_role_select.on_change("value", update_enemy_champion_options)
 champion_select.on_change("value", update_enemy_champion_options)
 role_select.on_change("value", update_enemy_champion_options)
@@ -1290,10 +1327,12 @@ enemy_role_select.on_change("value", update_winrate_plot_with_filters)
 
 winrate_source.selected.on_change('indices', on_bar_click)
 
-top_bottom_slider.on_change("value", update_winrate_plot_with_filters)
+# Typing a number or dragging the slider fires a burst of changes: only the latest one is computed
+debounce(min_games_input, update_winrate_plot_with_filters, update_enemy_champion_options, update_heatmap)
+throttle(top_bottom_slider, update_winrate_top_bottom)
 
 # Ally-specific callbacks
-ally_min_games_input.on_change("value", update_ally_synergy_plot)
+debounce(ally_min_games_input, update_ally_synergy_plot)
 ally_role_select.on_change("value", update_ally_synergy_plot_on_role)
 
 
@@ -1305,7 +1344,6 @@ sort_criterion_select.on_change("value", update_population_pyramid)
 sort_select.on_change("value", update_heatmap)  # Update heatmap data
 sort_select.on_change("value", update_row_highlight)  # Ensure highlight box follows
 enemy_champion_select.on_change("value", update_row_highlight)  # Update highlight on enemy selection
-min_games_input.on_change("value", update_heatmap)
 
 source.selected.on_change('indices', on_heatmap_row_click)
 
@@ -1325,6 +1363,36 @@ update_heatmap(None, None, None)
 update_champion_image_and_stats(None, None, None)  # Add this to update image and stats on startup
 update_row_highlight(None, None, enemy_champion_select.value)
 
+
+def refresh_after_reload(snapshot):
+    """
+    Switch this session to reloaded data files and redraw every plot once.
+    Runs on the session's next tick, so no callback sees a mix of old and new data.
+    """
+    use_artifacts(snapshot)
+    matchup_rankings.clear()
+    champion_select.options = champions
+    if champion_select.value not in champions:
+        champion_select.value = champions[0]
+    update_enemy_champion_options(None, None, None)
+    update_winrate_plot_with_filters(None, None, None)
+    update_ally_synergy_plot_on_role(None, None, None)
+    update_population_pyramid(None, None, None)
+    update_heatmap(None, None, None)
+    update_champion_image_and_stats(None, None, None)
+
+
+artifacts.subscribe(curdoc(), refresh_after_reload)
+
 # Add the layout to the document
 curdoc().clear()  # Clear any existing layout
 curdoc().add_root(padded_layout)
+
+# Record callback latency and payload size for the /metrics endpoint (see dashboard/serve.py)
+instrument_document(curdoc())
+
+# With 'python dashboard/serve.py --record-traces <dir>', log the session's widget changes for interaction_trace.py
+record_session(curdoc(), "3plottorulethemall")
+
+# With ?profile=<callbacks> (and 'serve.py --profile-dir <dir>'), cProfile a sample of the callbacks
+profile_document(curdoc(), "3plottorulethemall")
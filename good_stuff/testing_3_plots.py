@@ -3,9 +3,13 @@ from bokeh.layouts import column, row
 from bokeh.models import Select, TextInput, MultiSelect, ColumnDataSource, HoverTool, Span, Spacer
 from bokeh.plotting import figure, curdoc
 import numpy as np
-from sklearn.neighbors import KernelDensity
+import os
+import sys
 
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dashboard'))
+from density import DensityEngine
+
 # Load the data
 file_path = 'cleaned_data.csv'
 df = pd.read_csv(file_path)
@@ -397,6 +401,9 @@ def create_sina_plot():
         title="Item Frequency Distribution by Category",
     )
 
+    # Kernel density jitter per (champion, role, category), computed once
+    sina_density = DensityEngine(bandwidth=3, seed=42)
+
     def offset(category, data, scale=1):
         return list(zip([category] * len(data), scale * data))
 
@@ -422,16 +429,14 @@ def create_sina_plot():
 
             if len(freq) > 0:
                 normalized_win = (win - np.min(win)) / (np.max(win) - np.min(win)) if len(win) > 1 else np.zeros_like(win)
-                size = np.where(np.isnan(normalized_win), 5, (normalized_win / normalized_win) * 10)
-                freq_density = np.exp(KernelDensity(kernel="gaussian", bandwidth=3).fit(freq[:, np.newaxis])
-                                    .score_samples(freq[:, np.newaxis]))
-                jitter = (np.random.random(len(freq)) * 2 - 1) * freq_density * 1.2
+                category_size = np.where(np.isnan(normalized_win), 5, (normalized_win / normalized_win) * 10)
+                jitter = sina_density.sina_jitter((selected_champion, selected_role, category), freq)
                 x.extend(offset(category, jitter))
                 y.extend(freq)
                 item_name.extend(items)
                 frequency_percentage.extend(freq)
                 win_rate.extend(win)
-                size = list(size)
+                size.extend(category_size)
 
 
         source.data = dict(
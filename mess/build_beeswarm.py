@@ -2,6 +2,12 @@ import pandas as pd
 from bokeh.plotting import figure, curdoc
 from bokeh.models import ColumnDataSource, HoverTool, Select
 from bokeh.layouts import column
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dashboard'))
+from accel import swarm_x
+from kernels import count_wins, counts_frame, encode
 
 # Corrected file paths
 cleaned_data_path = 'cleaned_data.csv'
@@ -13,55 +19,54 @@ items_data = pd.read_csv(items_data_path)
 # Filter for full items from the items dataset
 full_items = items_data[items_data['Category'] == 'Full Item']['Item'].tolist()
 
-# Melt the item columns in cleaned data for analysis
+# Item columns in cleaned data
 item_columns = ['item0', 'item1', 'item2', 'item3', 'item4', 'item5', 'item6']
 cleaned_data[item_columns] = cleaned_data[item_columns].astype(str)  # Ensure consistent string type
 
-# Helper function to filter data by champion and role
-def filter_data_by_champion_and_role(df, champion, role):
-    filtered_df = df[(df['champion'] == champion) & (df['team_position'] == role)]
-    melted_items = filtered_df.melt(
-        id_vars=['win'], 
-        value_vars=item_columns, 
-        value_name='item'
-    )
-    filtered_full_items = melted_items[melted_items['item'].isin(full_items)]
-    return filtered_full_items
+# Item columns as integer codes (dashboard/kernels.py): counting items is a bincount per slot, no melted copy
+item_codes, item_names = encode(cleaned_data, item_columns)
+wins = cleaned_data['win'].to_numpy(dtype=bool)
+champions = cleaned_data['champion'].to_numpy()
+roles = cleaned_data['team_position'].to_numpy()
+
+# Helper function to count the full items of a champion in a role: (item, count, win_rate) and the total count
+def item_stats_by_champion_and_role(champion, role):
+    rows = (champions == champion) & (roles == role)
+    games, won = count_wins(item_codes, wins, len(item_names), rows)
+    item_stats = counts_frame(item_names, games, won, 'item', keep=full_items)
+    item_stats['win_rate'] = item_stats['wins'] / item_stats['count']
+    return item_stats.drop(columns='wins'), int(item_stats['count'].sum())
 
 # Swarm layout calculation function
+SWARM_STEP = 0.2
+
 def calculate_swarm_layout(data, y_column, size_column):
     """
     Calculate x positions for a swarm plot, spreading out points to avoid overlap.
+    Each point moves right in SWARM_STEP increments until no earlier point lies within
+    its size on both axes (accel.swarm_x: numpy, or a compiled loop with Numba).
     """
-    positions = []
-    for _, row in data.iterrows():
-        y = row[y_column]
-        size = row[size_column] / 100  # Scale size for collision detection
-        x = 0
-        # Avoid overlaps by checking existing points
-        while any(
-            abs(existing_y - y) < size and abs(existing_x - x) < size
-            for existing_x, existing_y in positions
-        ):
-            x += 0.2  # Increment x to avoid overlap
-        positions.append((x, y))
-    return pd.DataFrame({'x': [x for x, _ in positions], 'y': [y for _, y in positions]})
+    ys = data[y_column].to_numpy(dtype=float)
+    sizes = data[size_column].to_numpy(dtype=float) / 100  # Scale size for collision detection
+    xs = swarm_x(ys, sizes, SWARM_STEP)
+    return pd.DataFrame({'x': xs, 'y': ys})
+
+# Swarm data per (champion, role); the layout only depends on the selection
+swarm_cache = {}
 
 # Function to update the plot based on dropdown selections
 def update_plot(attr, old, new):
     selected_champion = champion_select.value
     selected_role = role_select.value
     print(f"Selected Champion: {selected_champion}, Role: {selected_role}")
+
+    key = (selected_champion, selected_role)
+    if key in swarm_cache:
+        source.data = swarm_cache[key]
+        return
     
-    filtered_data = filter_data_by_champion_and_role(cleaned_data, selected_champion, selected_role)
-    print(f"Filtered Data Size: {filtered_data.shape}")
-    
-    # Recalculate frequencies and win rate for the filtered data
-    total_count = len(filtered_data)
-    item_stats = filtered_data.groupby('item').agg(
-        count=('win', 'size'),
-        win_rate=('win', 'mean')
-    ).reset_index()
+    item_stats, total_count = item_stats_by_champion_and_role(selected_champion, selected_role)
+    print(f"Filtered Item Count: {total_count}")
 
     if total_count > 0:
         item_stats['frequency'] = (item_stats['count'] / total_count) * 100  # Convert to percentage
@@ -75,13 +80,14 @@ def update_plot(attr, old, new):
     item_stats['x'] = swarm_positions['x']
 
     # Update the data source
-    source.data = {
-        'item': item_stats['item'],
-        'frequency': item_stats['frequency'],
-        'win_rate': item_stats['win_rate'],
-        'size': item_stats['size'],
-        'x': item_stats['x']
+    swarm_cache[key] = {
+        'item': item_stats['item'].tolist(),
+        'frequency': item_stats['frequency'].tolist(),
+        'win_rate': item_stats['win_rate'].tolist(),
+        'size': item_stats['size'].tolist(),
+        'x': item_stats['x'].tolist()
     }
+    source.data = swarm_cache[key]
 
 # Get unique champions and roles
 unique_champions = cleaned_data['champion'].unique().tolist()
@@ -98,14 +104,7 @@ role_select.on_change("value", update_plot)
 # Initial data for the first champion and role
 initial_champion = champion_select.value
 initial_role = role_select.value
-initial_data = filter_data_by_champion_and_role(cleaned_data, initial_champion, initial_role)
-
-# Recalculate frequencies and win rate for the initial data
-total_count = len(initial_data)
-initial_item_stats = initial_data.groupby('item').agg(
-    count=('win', 'size'),
-    win_rate=('win', 'mean')
-).reset_index()
+initial_item_stats, total_count = item_stats_by_champion_and_role(initial_champion, initial_role)
 
 if total_count > 0:
     initial_item_stats['frequency'] = (initial_item_stats['count'] / total_count) * 100  # Convert to percentage
@@ -1,8 +1,15 @@
 from bokeh.plotting import curdoc
 from bokeh.models import Select, Div
 from bokeh.layouts import column
+import os
+import sys
+import numpy as np
 import pandas as pd
-import requests
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dashboard'))
+from build_assets import IconManifest
+from ddragon import get_store
+from kernels import count_wins, counts_frame, encode
 
 # Load the data
 file_path = 'cleaned_data.csv'  # Replace with your actual file path
@@ -14,59 +21,51 @@ items_data = pd.read_csv(items_file)
 for col in ['item0', 'item1', 'item2', 'item3', 'item4', 'item5', 'item6']:
     data[col] = data[col].astype(str)
 
-for col in [
+rune_columns = [
     'perk_keystone', 'perk_primary_row_1', 'perk_primary_row_2', 'perk_primary_row_3',
     'perk_secondary_row_1', 'perk_secondary_row_2', 'perk_primary_style',
-    'perk_secondary_style', 'perk_shard_defense', 'perk_shard_flex', 'perk_shard_offense',
-    'summoner1_id', 'summoner2_id'
-]:
+    'perk_secondary_style', 'perk_shard_defense', 'perk_shard_flex', 'perk_shard_offense'
+]
+for col in rune_columns + ['summoner1_id', 'summoner2_id']:
     data[col] = data[col].astype(str)
 
 # Ensure 'win' column is boolean
 data['win'] = data['win'].astype(bool)
 
+# Item, rune and spell columns as integer codes (dashboard/kernels.py): counting is a bincount per column, no melt or groupby
+item_codes, item_names = encode(data, ['item0', 'item1', 'item2', 'item3', 'item4', 'item5', 'item6'])
+rune_codes, rune_names = encode(data, rune_columns)
+# A spell combination is one code: first spell * (spells + 1) + second spell
+spell_codes, spell_names = encode(data, ['summoner1_id', 'summoner2_id'])
+spell_base = len(spell_names) + 1
+spell_pairs = spell_codes[0].astype(np.int64) * spell_base + spell_codes[1]
+wins = data['win'].to_numpy()
+champions = data['champion'].to_numpy()
+
 # Prepare the initial champion
 initial_champion = data['champion'].unique()[0]
 
-# Load Summoner Spell Data from Data Dragon
-summoner_spells_data = requests.get(
-    "https://ddragon.leagueoflegends.com/cdn/14.20.1/data/en_US/summoner.json"
-).json()
-summoner_spells_mapping = {
-    spell_data['id']: spell_data['image']['full'] for spell_data in summoner_spells_data['data'].values()
-}
+# Data Dragon metadata (summoner spells, items, runes) from the local versioned store
+ddragon = get_store()
+summoner_spells_mapping = ddragon.summoner_spell_images()
 # Special cases for summoner spell icons
 summoner_spell_exceptions = {
     "SummonerIgnite": "SummonerDot.png"
 }
-
-# Load Item Data from Data Dragon
-item_data = requests.get(
-    "https://ddragon.leagueoflegends.com/cdn/14.20.1/data/en_US/item.json"
-).json()
-item_mapping = {item_name: item_id for item_id, item_data in item_data['data'].items() for item_name in [item_data['name']]}
-
-# Load Runes Data from Data Dragon
-runes_data = requests.get(
-    "https://ddragon.leagueoflegends.com/cdn/14.20.1/data/en_US/runesReforged.json"
-).json()
-
-# Build rune mappings
-runes_mapping = {}
-
-for style in runes_data:
-    # Map primary style icons
-    runes_mapping[style['name']] = style['icon']
-    # Map keystone and minor runes within each style
-    for slot in style['slots']:
-        for rune in slot['runes']:
-            runes_mapping[rune['name']] = rune['icon']
+item_mapping = ddragon.item_name_to_id()
+runes_mapping = ddragon.rune_icons()
 
 # Base URLs for icons
 summoner_spell_icon_base_url = "https://ddragon.leagueoflegends.com/cdn/14.20.1/img/spell/"
 item_icon_base_url = "https://ddragon.leagueoflegends.com/cdn/14.20.1/img/item/"
 rune_icon_base_url = "https://ddragon.leagueoflegends.com/cdn/img/"
 
+# Thumbnails of dashboard/build_assets.py (served by dashboard/serve.py), the Data Dragon icon when none was built
+icons = IconManifest()
+
+def item_icon_url(item_name):
+    return icons.url("item", item_name, f"{item_icon_base_url}{item_mapping.get(item_name, '')}.png")
+
 # Filter item categories
 full_items = set(items_data[items_data['Category'] == 'Full Item']['Item'])
 starter_items = set(items_data[items_data['Category'] == 'Starter Item']['Item'])
@@ -75,36 +74,21 @@ trinket_items = set(items_data[items_data['Category'] == 'Trinket']['Item'])
 
 # Helper function to get the most common items with win rates
 def get_most_common_items(champion, item_set, count=5):
-    filtered_data = data[data['champion'] == champion]
-    melted_items = filtered_data.melt(
-        id_vars=['win'],
-        value_vars=['item0', 'item1', 'item2', 'item3', 'item4', 'item5', 'item6'],
-        value_name='item'
-    )
-    
+    games, won = count_wins(item_codes, wins, len(item_names), champions == champion)
+
     # Filter items by category
-    filtered_items = melted_items[melted_items['item'].isin(item_set)]
-    item_stats = filtered_items.groupby('item').agg(
-        count=('win', 'size'),
-        wins=('win', 'sum')
-    ).reset_index()
+    item_stats = counts_frame(item_names, games, won, 'item', keep=item_set)
     item_stats['win_rate'] = (item_stats['wins'] / item_stats['count'] * 100).round(2)
     item_stats = item_stats.sort_values('count', ascending=False).head(count)
     return item_stats
 
 # Helper function to get the most common runes with win rates
 def get_most_common_runes(champion):
-    filtered_data = data[data['champion'] == champion]
+    rows = champions == champion
     runes = {}
-    for col in [
-        'perk_keystone', 'perk_primary_row_1', 'perk_primary_row_2', 'perk_primary_row_3',
-        'perk_secondary_row_1', 'perk_secondary_row_2', 'perk_primary_style',
-        'perk_secondary_style', 'perk_shard_defense', 'perk_shard_flex', 'perk_shard_offense'
-    ]:
-        stats = filtered_data.groupby(col).agg(
-            count=('win', 'size'),
-            wins=('win', 'sum')
-        ).reset_index()
+    for i, col in enumerate(rune_columns):
+        games, won = count_wins(rune_codes[i], wins, len(rune_names), rows)
+        stats = counts_frame(rune_names, games, won, col)
         stats['win_rate'] = (stats['wins'] / stats['count'] * 100).round(2)
         stats = stats.sort_values('count', ascending=False).head(1)
         runes[col] = stats.iloc[0] if not stats.empty else None
@@ -112,12 +96,18 @@ def get_most_common_runes(champion):
 
 # Helper function to get the most common summoner spell combination with win rates
 def get_most_common_summoner_spells(champion):
-    filtered_data = data[data['champion'] == champion]
-    spells = (
-        filtered_data.groupby(['summoner1_id', 'summoner2_id'])
-        .agg(count=('win', 'size'), wins=('win', 'sum'))
-        .reset_index()
-    )
+    games, won = count_wins(spell_pairs, wins, spell_base ** 2, champions == champion)
+    played = np.flatnonzero(games)
+    first, second = np.divmod(played, spell_base)
+    # Combinations with a missing spell (code len(spell_names)) are skipped
+    known = (first < len(spell_names)) & (second < len(spell_names))
+    played, first, second = played[known], first[known], second[known]
+    spells = pd.DataFrame({
+        'summoner1_id': spell_names[first],
+        'summoner2_id': spell_names[second],
+        'count': games[played],
+        'wins': won[played],
+    })
     spells['win_rate'] = (spells['wins'] / spells['count'] * 100).round(2)
     spells = spells.sort_values('count', ascending=False).head(1)
     return spells.iloc[0] if not spells.empty else None
@@ -140,26 +130,25 @@ def update_results(champion):
     if not starter_items_stats.empty:
         starter_icon = item_mapping.get(starter_items_stats['item'].values[0], "")
         text += (
-            f'<p><b>Starter:</b> <img src="{item_icon_base_url}{starter_icon}.png" alt="{starter_icon}" width="32" height="32">'
+            f'<p><b>Starter:</b> <img src="{item_icon_url(starter_items_stats["item"].values[0])}" alt="{starter_icon}" width="32" height="32">'
             f' - {starter_items_stats["count"].values[0]} games, {starter_items_stats["win_rate"].values[0]}% win rate</p>'
         )
     if not boots_stats.empty:
         boots_icon = item_mapping.get(boots_stats['item'].values[0], "")
         text += (
-            f'<p><b>Boots:</b> <img src="{item_icon_base_url}{boots_icon}.png" alt="{boots_icon}" width="32" height="32">'
+            f'<p><b>Boots:</b> <img src="{item_icon_url(boots_stats["item"].values[0])}" alt="{boots_icon}" width="32" height="32">'
             f' - {boots_stats["count"].values[0]} games, {boots_stats["win_rate"].values[0]}% win rate</p>'
         )
     text += "<p><b>Full Items:</b><br>"
     for _, row in full_items_stats.iterrows():
-        item_icon = item_mapping.get(row['item'], "")
         text += (
-            f'- <img src="{item_icon_base_url}{item_icon}.png" alt="{row["item"]}" width="32" height="32">'
+            f'- <img src="{item_icon_url(row["item"])}" alt="{row["item"]}" width="32" height="32">'
             f' {row["item"]} - {row["count"]} games, {row["win_rate"]}% win rate<br>'
         )
     if not trinket_stats.empty:
         trinket_icon = item_mapping.get(trinket_stats['item'].values[0], "")
         text += (
-            f'<b>Trinket:</b> <img src="{item_icon_base_url}{trinket_icon}.png" alt="{trinket_icon}" width="32" height="32">'
+            f'<b>Trinket:</b> <img src="{item_icon_url(trinket_stats["item"].values[0])}" alt="{trinket_icon}" width="32" height="32">'
             f' - {trinket_stats["count"].values[0]} games, {trinket_stats["win_rate"].values[0]}% win rate</p>'
         )
 
@@ -167,10 +156,10 @@ def update_results(champion):
     text += "<h4>Runes</h4><p>"
     for col, stats in runes.items():
         if stats is not None:
-            rune_icon = runes_mapping.get(stats[col], "")  # Fetch icon using rune name
+            rune_icon = icons.url("rune", stats[col], rune_icon_base_url + runes_mapping.get(stats[col], ""))  # Fetch icon using rune name
             text += (
                 f'<b>{col.replace("_", " ").title()}:</b> '
-                f'<img src="{rune_icon_base_url}{rune_icon}" alt="{stats[col]}" width="32" height="32"> '
+                f'<img src="{rune_icon}" alt="{stats[col]}" width="32" height="32"> '
                 f'{stats[col]} - {stats["count"]} games, {stats["win_rate"]}% win rate<br>'
             )
     text += "</p>"
@@ -182,9 +171,11 @@ def update_results(champion):
         spell2_name = f"Summoner{spells['summoner2_id']}"
         spell1_icon = summoner_spell_exceptions.get(spell1_name, summoner_spells_mapping.get(spell1_name, ""))
         spell2_icon = summoner_spell_exceptions.get(spell2_name, summoner_spells_mapping.get(spell2_name, ""))
+        spell1_url = icons.url("summoner", spells['summoner1_id'], summoner_spell_icon_base_url + spell1_icon)
+        spell2_url = icons.url("summoner", spells['summoner2_id'], summoner_spell_icon_base_url + spell2_icon)
         text += (
-            f'<p><img src="{summoner_spell_icon_base_url}{spell1_icon}" alt="{spell1_name}" width="32" height="32">'
-            f' + <img src="{summoner_spell_icon_base_url}{spell2_icon}" alt="{spell2_name}" width="32" height="32">'
+            f'<p><img src="{spell1_url}" alt="{spell1_name}" width="32" height="32">'
+            f' + <img src="{spell2_url}" alt="{spell2_name}" width="32" height="32">'
             f' - {spells["count"]} games, {spells["win_rate"]}% win rate</p>'
         )
     else:
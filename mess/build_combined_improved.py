@@ -1,8 +1,13 @@
 from bokeh.plotting import curdoc, figure
 from bokeh.models import ColumnDataSource, HoverTool
 from bokeh.layouts import column
+import os
+import sys
 import pandas as pd
-import requests
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dashboard'))
+from build_assets import IconManifest
+from ddragon import get_store
 
 # Data Loading
 file_path = 'cleaned_data.csv'  # Replace with your actual file path
@@ -15,12 +20,11 @@ for col in ['item0', 'item1', 'item2', 'item3', 'item4', 'item5', 'item6']:
     data[col] = data[col].astype(str)
 data['win'] = data['win'].astype(bool)
 
-# Data Dragon URLs
-item_data = requests.get(
-    "https://ddragon.leagueoflegends.com/cdn/14.20.1/data/en_US/item.json"
-).json()
-item_mapping = {item_name: item_id for item_id, item_data in item_data['data'].items() for item_name in [item_data['name']]}
+# Item metadata from the local Data Dragon store
+item_mapping = get_store().item_name_to_id()
 item_icon_base_url = "https://ddragon.leagueoflegends.com/cdn/14.20.1/img/item/"
+# Thumbnails of dashboard/build_assets.py (served by dashboard/serve.py), the Data Dragon icon when none was built
+icon_manifest = IconManifest()
 
 # Item Categories
 starter_items = set(items_data[items_data['Category'] == 'Starter Item']['Item'])
@@ -48,7 +52,7 @@ def get_most_common_items(champion, item_set, count=5):
 # Create Icon Figures with Tooltips
 def create_item_figure(item_stats, title):
     icons = [
-        item_icon_base_url + item_mapping.get(row['item'], "") + ".png"
+        icon_manifest.url("item", row['item'], item_icon_base_url + item_mapping.get(row['item'], "") + ".png")
         for _, row in item_stats.iterrows()
     ]
     tooltips = [
@@ -1,8 +1,13 @@
 from bokeh.plotting import curdoc
 from bokeh.models import Select, Div
 from bokeh.layouts import column
+import os
+import sys
 import pandas as pd
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dashboard'))
+from kernels import count_wins, counts_frame, encode
+
 # Load the game data and items data
 game_data_path = 'cleaned_data.csv'  # Replace with your actual file path
 items_data_path = 'items.csv'  # Replace with your actual file path
@@ -22,95 +27,55 @@ for col in item_columns:
 # Ensure the 'win' column is boolean
 game_data['win'] = game_data['win'].astype(bool)
 
+# Item columns as integer codes (dashboard/kernels.py): counting items is a bincount per slot, no melted copy
+item_codes, item_names = encode(game_data, item_columns)
+wins = game_data['win'].to_numpy()
+champions = game_data['champion'].to_numpy()
+
+# Games and wins of a champion's items in the given slots, limited to item_set (all items if None)
+def count_items(champion, slots, item_set=None, name='item'):
+    games, won = count_wins(item_codes[slots], wins, len(item_names), champions == champion)
+    item_stats = counts_frame(item_names, games, won, name, keep=item_set)
+    # Exclude empty slots ('0')
+    item_stats = item_stats[item_stats[name] != '0'].reset_index(drop=True)
+    item_stats['win_rate'] = (item_stats['wins'] / item_stats['count'] * 100).round(2)
+    return item_stats
+
 # Prepare the initial champion
 initial_champion = game_data['champion'].unique()[0]
 
 # Function to get the top 20 most common full items with win rates
 def get_top_items(champion):
-    filtered_data = game_data[game_data['champion'] == champion]
-    
-    # Melt the non-trinket item columns into a single column
-    melted_items = filtered_data.melt(
-        id_vars=['win'], 
-        value_vars=['item0', 'item1', 'item2', 'item3', 'item4', 'item5'],
-        value_name='item'
-    )
-    
-    # Exclude empty slots ('0') and filter only "Full Item" items
-    filtered_items = melted_items[(melted_items['item'] != '0') & (melted_items['item'].isin(full_items))]
-    
-    # Group by item and calculate stats
-    item_stats = filtered_items.groupby('item').agg(
-        count=('win', 'size'),
-        wins=('win', 'sum')
-    ).reset_index()
-    item_stats['win_rate'] = (item_stats['wins'] / item_stats['count'] * 100).round(2)
-    
+    # Only "Full Item" items in the non-trinket slots
+    item_stats = count_items(champion, slice(0, 6), full_items)
+
     # Sort by count and get the top 20
     top_items = item_stats.sort_values('count', ascending=False).head(20)
     return top_items
 
 # Function to get the top 3 most common trinkets with win rates
 def get_top_trinkets(champion):
-    filtered_data = game_data[game_data['champion'] == champion]
-    
     # Use the trinket slot (item6) only
-    trinket_stats = filtered_data[filtered_data['item6'] != '0'].groupby('item6').agg(
-        count=('win', 'size'),
-        wins=('win', 'sum')
-    ).reset_index()
-    trinket_stats['win_rate'] = (trinket_stats['wins'] / trinket_stats['count'] * 100).round(2)
-    
+    trinket_stats = count_items(champion, slice(6, 7), name='item6')
+
     # Sort by count and get the top 3
     top_trinkets = trinket_stats.sort_values('count', ascending=False).head(3)
     return top_trinkets
 
 # Function to get the top 3 most common boots with win rates
 def get_top_boots(champion):
-    filtered_data = game_data[game_data['champion'] == champion]
-    
-    # Melt the non-trinket item columns into a single column
-    melted_items = filtered_data.melt(
-        id_vars=['win'], 
-        value_vars=['item0', 'item1', 'item2', 'item3', 'item4', 'item5'],
-        value_name='item'
-    )
-    
-    # Exclude empty slots ('0') and filter only "Boots" items
-    filtered_boots = melted_items[(melted_items['item'] != '0') & (melted_items['item'].isin(boots_items))]
-    
-    # Group by item and calculate stats
-    boots_stats = filtered_boots.groupby('item').agg(
-        count=('win', 'size'),
-        wins=('win', 'sum')
-    ).reset_index()
-    boots_stats['win_rate'] = (boots_stats['wins'] / boots_stats['count'] * 100).round(2)
-    
+    # Only "Boots" items in the non-trinket slots
+    boots_stats = count_items(champion, slice(0, 6), boots_items)
+
     # Sort by count and get the top 3
     top_boots = boots_stats.sort_values('count', ascending=False).head(3)
     return top_boots
 
 # Function to get the top 3 most common starter items with win rates
 def get_top_starter_items(champion):
-    filtered_data = game_data[game_data['champion'] == champion]
-    
-    # Melt the non-trinket item columns into a single column
-    melted_items = filtered_data.melt(
-        id_vars=['win'], 
-        value_vars=['item0', 'item1', 'item2', 'item3', 'item4', 'item5'],
-        value_name='item'
-    )
-    
-    # Exclude empty slots ('0') and filter only "Starter Item" items
-    filtered_starters = melted_items[(melted_items['item'] != '0') & (melted_items['item'].isin(starter_items))]
-    
-    # Group by item and calculate stats
-    starter_stats = filtered_starters.groupby('item').agg(
-        count=('win', 'size'),
-        wins=('win', 'sum')
-    ).reset_index()
-    starter_stats['win_rate'] = (starter_stats['wins'] / starter_stats['count'] * 100).round(2)
-    
+    # Only "Starter Item" items in the non-trinket slots
+    starter_stats = count_items(champion, slice(0, 6), starter_items)
+
     # Sort by count and get the top 3
     top_starters = starter_stats.sort_values('count', ascending=False).head(3)
     return top_starters
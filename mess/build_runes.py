@@ -1,8 +1,13 @@
 from bokeh.plotting import curdoc
 from bokeh.models import Select, Div
 from bokeh.layouts import column
+import os
+import sys
 import pandas as pd
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dashboard'))
+from kernels import count_wins, counts_frame, encode
+
 # Load the data
 file_path = 'cleaned_data.csv'  # Replace with your actual file path
 data = pd.read_csv(file_path)
@@ -19,21 +24,21 @@ for col in rune_columns:
 # Ensure 'win' column is boolean
 data['win'] = data['win'].astype(bool)
 
+# Rune columns as integer codes sharing one dictionary (dashboard/kernels.py): counting a column is a bincount, no groupby
+rune_codes, rune_names = encode(data, rune_columns)
+wins = data['win'].to_numpy()
+champions = data['champion'].to_numpy()
+
 # Prepare the initial champion
 initial_champion = data['champion'].unique()[0]
 
 # Function to get the top 3 runes with win rates for a specific column
 def get_top_runes(champion, column):
-    filtered_data = data[data['champion'] == champion]
-    
-    # Group by rune, calculate count and win rate
-    rune_stats = filtered_data.groupby(column).agg(
-        count=('win', 'size'),
-        wins=('win', 'sum')
-    ).reset_index()
+    # Count and win rate per rune in this column, for the champion's games
+    games, won = count_wins(rune_codes[rune_columns.index(column)], wins, len(rune_names), champions == champion)
+    rune_stats = counts_frame(rune_names, games, won, 'rune')
     rune_stats['win_rate'] = (rune_stats['wins'] / rune_stats['count'] * 100).round(2)
-    rune_stats = rune_stats.rename(columns={column: 'rune'})
-    
+
     # Sort by count and get the top 3
     top_runes = rune_stats.sort_values('count', ascending=False).head(3)
     return top_runes
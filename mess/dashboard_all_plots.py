@@ -1,9 +1,14 @@
+import os
+import sys
 import pandas as pd
 from tqdm import tqdm
 from bokeh.plotting import figure, curdoc
 from bokeh.layouts import column, row
 from bokeh.models import HoverTool, Select, ColumnDataSource, FactorRange
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dashboard'))
+from binning import BinnedScatter
+
 # Load only necessary columns
 columns_to_load = ["win", "team_position", "champion", "lane_opponent", "kills", "deaths", "assists", "gold_earned", "total_minions_killed", "max_cs_advantage_on_lane_opponent", "ally_1", "ally_2", "ally_3", "ally_4", "enemy_1", "enemy_2", "enemy_3", "enemy_4", "enemy_5"]
 df = pd.read_csv("combined_matches.csv", usecols=columns_to_load)
@@ -35,16 +40,12 @@ def update_plots(attr, old, new):
     selected_data = df[df["champion"] == selected_champion]
 
     if not selected_data.empty:
-        # Prepare data for ColumnDataSource (Ensure values are lists)
-        source_data = {
-            'deaths': selected_data['deaths'].tolist(),   # Ensure values are lists
-            'kills': selected_data['kills'].tolist(),     # Ensure values are lists
-            'champion': selected_data['champion'].tolist() # Ensure values are lists
-        }
-        source.data = source_data  # Update the source with filtered data
+        # Kills vs. deaths: binned on the server, raw points only when zoomed in far enough
+        scatter_data = selected_data[['deaths', 'kills', 'champion', 'win']]
+        binned.set_data(scatter_data)
         
         # Print limited data for debugging
-        print("Updated source data (sample):", {k: v[:5] for k, v in source_data.items()})  # Limiting the print output for readability
+        print("Updated scatter data (sample):", scatter_data.head())  # Limiting the print output for readability
         
         # Update the bar chart for win rates
         champion_win_rates = selected_data.groupby('champion')['win'].mean() * 100
@@ -58,10 +59,12 @@ def update_plots(attr, old, new):
 
 # Create the scatter plot for kills vs. deaths
 p1 = figure(title="Kills vs. Deaths", x_axis_label="Deaths", y_axis_label="Kills", width=600, height=400)
-p1.scatter(x='deaths', y='kills', source=source, size=8, color="blue", alpha=0.6)
+scatter_source = ColumnDataSource(data=dict(deaths=[], kills=[], champion=[], win=[]))
+scatter = p1.scatter(x='deaths', y='kills', source=scatter_source, size=8, color="blue", alpha=0.6)
+binned = BinnedScatter(p1, scatter, x='deaths', y='kills', win='win')
 
 # Add hover tool for the scatter plot
-hover1 = HoverTool(tooltips=[("Champion", "@champion"), ("Kills", "@kills"), ("Deaths", "@deaths")])
+hover1 = HoverTool(renderers=[scatter], tooltips=[("Champion", "@champion"), ("Kills", "@kills"), ("Deaths", "@deaths")])
 p1.add_tools(hover1)
 
 # Create another empty figure for future data plots, e.g., Gold Distribution
@@ -1,9 +1,15 @@
+import os
+import sys
+import numpy as np
 import pandas as pd
 from bokeh.plotting import figure, curdoc
 from bokeh.models import ColumnDataSource, HoverTool, Select, MultiChoice, Div
 from bokeh.layouts import column
 from itertools import cycle
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dashboard'))
+from binning import BinnedScatter
+
 # Load necessary columns including the "win" column (which contains TRUE/FALSE)
 columns_to_load = ["champion", "max_cs_advantage_on_lane_opponent", "max_level_lead_lane_opponent", "lane_opponent", "win"]
 df = pd.read_csv("scatterplot_filtered_data.csv", usecols=columns_to_load)
@@ -34,21 +40,22 @@ p1 = figure(title="Max CS Advantage vs. Max Level Lead",
             y_axis_label="Max CS Advantage on Lane Opponent", 
             width=900, height=600)
 
+# Define a color palette for up to 3 selected opponents
+colors = cycle(["blue", "green", "orange"])
+
+# Raw points, only sent when few enough are in view; otherwise the plot shows win-rate bins
+scatter = p1.scatter(x='max_level_lead_lane_opponent', y='max_cs_advantage_on_lane_opponent', 
+                     source=source, size=8, color='color', marker='shape', fill_alpha=0.6)
+binned = BinnedScatter(p1, scatter, x='max_level_lead_lane_opponent', y='max_cs_advantage_on_lane_opponent', win='won')
+
 # Add hover tool for the scatter plot
-hover1 = HoverTool(tooltips=[("Champion", "@champion"), 
+hover1 = HoverTool(renderers=[scatter], tooltips=[("Champion", "@champion"), 
                              ("Opponent", "@lane_opponent"),
                              ("Max CS Advantage", "@max_cs_advantage_on_lane_opponent"), 
                              ("Max Level Lead", "@max_level_lead_lane_opponent"),
                              ("Game Outcome", "@win")])
 p1.add_tools(hover1)
 
-# Define a color palette for up to 3 selected opponents
-colors = cycle(["blue", "green", "orange"])
-
-# Initial scatter plot
-scatter = p1.scatter(x='max_level_lead_lane_opponent', y='max_cs_advantage_on_lane_opponent', 
-                     source=source, size=8, color='color', marker='shape', fill_alpha=0.6)
-
 # Function to update the plot colors and shapes based on selected champion, opponent champions, and win/loss
 def update_plots(attr, old, new):
     selected_champion = champion_select.value  # Get selected champion
@@ -65,27 +72,17 @@ def update_plots(attr, old, new):
     selected_data = df_filtered[df_filtered["champion"] == selected_champion]
     
     if not selected_data.empty:
-        color_column = []
-        shape_column = []
-
         # Assign unique colors to each selected opponent
         opponent_color_map = {opponent: next(colors) for opponent in selected_opponents}
+        highlighted = selected_data['lane_opponent'].isin(selected_opponents)
+
+        # Highlighted matches: color by opponent, triangles for wins and squares for losses;
+        # non-highlighted matches remain gray circles
+        color_column = selected_data['lane_opponent'].map(opponent_color_map).where(highlighted, 'gray')
+        shape_column = np.where(highlighted, np.where(selected_data['win'] == 'Win', 'triangle', 'square'), 'circle')
 
-        # Loop through the selected champion's data to set the colors and shapes
-        for index, row in selected_data.iterrows():
-            if row['lane_opponent'] in selected_opponents:
-                # Assign color based on opponent and shape based on win/loss
-                color_column.append(opponent_color_map[row['lane_opponent']])
-                if row['win'] == 'Win':
-                    shape_column.append('triangle')  # Wins as triangles
-                else:
-                    shape_column.append('square')  # Losses as squares
-            else:
-                color_column.append('gray')  # Non-highlighted matches remain gray
-                shape_column.append('circle')  # Non-highlighted matches are circles
-        
-        # Update the data source with filtered data for the selected champion
-        source.data = {
+        # Update the plot with filtered data for the selected champion
+        binned.set_data(pd.DataFrame({
             'max_cs_advantage_on_lane_opponent': selected_data['max_cs_advantage_on_lane_opponent'],
             'max_level_lead_lane_opponent': selected_data['max_level_lead_lane_opponent'],
             'champion': selected_data['champion'],
@@ -93,7 +90,8 @@ def update_plots(attr, old, new):
             'color': color_column,  # Add color column to the source
             'shape': shape_column,  # Add shape column for wins/losses
             'win': selected_data['win'],  # Add win column for tooltip
-        }
+            'won': selected_data['win'] == 'Win',  # Numeric outcome for the bin colors
+        }))
 
 # Set initial data for the plots before displaying them
 update_plots(None, None, "Aatrox")
@@ -1,4 +1,6 @@
 
+import os
+
 import pandas as pd
 
 # Load your dataset (replace 'your_data.csv' with your actual file path)
@@ -8,10 +10,17 @@ df = pd.read_csv(r'C:\Users\esthe\Documents\programming\uni_semester_1\davi\boke
 # 1. Remove rows where 'game_duration' is less than 900
 df_filtered = df[df['game_duration'] >= 900]
 
-# 2. Keep only rows where 'team_position' is 'TOP'
-df_filtered = df_filtered[df_filtered['team_position'] == 'TOP']
+# 2. Keep every role, renamed to the roles the dashboard uses (Riot reports MIDDLE/BOTTOM/UTILITY)
+role_names = {'TOP': 'TOP', 'JUNGLE': 'JUNGLE', 'MIDDLE': 'MID', 'MID': 'MID', 'BOTTOM': 'ADC', 'ADC': 'ADC', 'UTILITY': 'SUP', 'SUP': 'SUP'}
+df_filtered = df_filtered.assign(team_position=df_filtered['team_position'].map(role_names))
+df_filtered = df_filtered[df_filtered['team_position'].notna()]  # Remakes have no position
 
 # Save the cleaned dataset to a new CSV file
 df_filtered.to_csv('cleaned_data.csv', index=False)
 
-print("Cleaned dataset saved as 'cleaned_data.csv'")
+# 3. Save one file per role as well; the dashboard loads these so a role query only touches its own matches
+os.makedirs('roles', exist_ok=True)
+for role in ['TOP', 'JUNGLE', 'MID', 'ADC', 'SUP']:
+    df_filtered[df_filtered['team_position'] == role].to_csv(os.path.join('roles', f'{role}.csv'), index=False)
+
+print("Cleaned dataset saved as 'cleaned_data.csv' and 'roles/<ROLE>.csv'")
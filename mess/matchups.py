@@ -1,6 +1,6 @@
 import pandas as pd
 from bokeh.plotting import curdoc
-from bokeh.models import ColumnDataSource, Select, DataTable, TableColumn, NumberFormatter, TextInput, CheckboxGroup, Div
+from bokeh.models import ColumnDataSource, Select, DataTable, TableColumn, NumberFormatter, TextInput, CheckboxGroup, Div, Button
 from bokeh.layouts import column, row
 
 # Load data (with the correct column names for the new metrics)
@@ -14,14 +14,12 @@ columns_to_load = [
 ]
 df = pd.read_csv("cleaned_data.csv", usecols=columns_to_load)
 
-# Filter for OTP champions
-df = df[df["champion"].isin(["Aatrox", "Camille", "Gnar"])]
-
 # Calculate average win rate for each champion
 champion_winrates = df.groupby("champion")["win"].mean()
 
 # Champion selection widget
-champion_select = Select(title="Select Your Champion:", value="Aatrox", options=sorted(df["champion"].unique()))
+champion_options = sorted(df["champion"].unique())
+champion_select = Select(title="Select Your Champion:", value="Aatrox" if "Aatrox" in champion_options else champion_options[0], options=champion_options)
 
 # Display selected champion's average winrate
 champion_winrate_display = Div(text=f"Average Winrate: {champion_winrates[champion_select.value]:.2%}", width=200)
@@ -32,20 +30,20 @@ cutoff_input = TextInput(title="Minimum Games Cutoff", value="5")
 # Checkbox to enable/disable cutoff
 cutoff_checkbox = CheckboxGroup(labels=["Apply Minimum Games Cutoff"], active=[])
 
-# Calculate matchup statistics, now including the new columns
-def calculate_matchup_stats(df_filtered):
+# Calculate matchup statistics for every (champion, opponent) pair at once, using only built-in aggregations
+def calculate_matchup_stats(df):
     # Calculate average win rate per side (using 'side' column)
-    side_win_rates = df_filtered.groupby(['side', 'lane_opponent']).win.mean().unstack().fillna(0)
+    side_win_rates = df.groupby(['champion', 'lane_opponent', 'side']).win.mean().unstack('side')
+    side_win_rates = side_win_rates.reindex(columns=['red', 'blue']).fillna(0)
 
     # Aggregating other stats for each matchup
-    matchups = df_filtered.groupby('lane_opponent').agg(
+    matchups = df.groupby(['champion', 'lane_opponent']).agg(
         total_games=('win', 'size'),
-        wins=('win', lambda x: x.sum()),
-        losses=('win', lambda x: (~x).sum()),  # Count losses
+        wins=('win', 'sum'),
         avg_kills=('kills', 'mean'),
         avg_deaths=('deaths', 'mean'),
         avg_assists=('assists', 'mean'),
-        avg_game_duration=('game_duration', lambda x: x.mean() / 60),  # Convert seconds to minutes
+        avg_game_duration=('game_duration', 'mean'),
         avg_team_damage_percentage=('team_damage_percentage', 'mean'),
         avg_lane_minions_10=('lane_minions_first_10_minutes', 'mean'),
         avg_max_cs_advantage=('max_cs_advantage_on_lane_opponent', 'mean'),
@@ -57,14 +55,20 @@ def calculate_matchup_stats(df_filtered):
         first_tower_percentage=('first_tower', 'mean'),  # Percentage of games with first tower
         avg_damage_to_buildings=('damage_dealt_to_buildings', 'mean'),
         avg_total_damage_to_champions=('total_damage_dealt_champions', 'mean')
-    ).reset_index()
+    )
+    matchups.insert(2, 'losses', matchups['total_games'] - matchups['wins'])  # Count losses
+    matchups['avg_game_duration'] = matchups['avg_game_duration'] / 60  # Convert seconds to minutes
     matchups['winrate'] = (matchups['wins'] / matchups['total_games']).round(4)  # Keep as a decimal for Bokeh
-    
+
     # Adding the side-specific win rates
-    matchups['avg_red_side_win_rate'] = matchups['lane_opponent'].map(side_win_rates.loc['red'])
-    matchups['avg_blue_side_win_rate'] = matchups['lane_opponent'].map(side_win_rates.loc['blue'])
+    matchups['avg_red_side_win_rate'] = side_win_rates['red'].reindex(matchups.index).fillna(0)
+    matchups['avg_blue_side_win_rate'] = side_win_rates['blue'].reindex(matchups.index).fillna(0)
+
+    return matchups.reset_index()
 
-    return matchups
+# Precompute the table of every champion once; callbacks only filter, sort and page it
+matchup_stats = {champion: stats.drop(columns='champion').reset_index(drop=True)
+                 for champion, stats in calculate_matchup_stats(df).groupby('champion')}
 
 # Create ColumnDataSource (initially empty, updated by callback)
 source = ColumnDataSource(data=dict())
@@ -94,7 +98,17 @@ columns = [
     TableColumn(field="avg_damage_to_buildings", title="Dmg to Buildings", width=150, formatter=NumberFormatter(format="0.0")),
     TableColumn(field="avg_total_damage_to_champions", title="Dmg to Champs", width=150, formatter=NumberFormatter(format="0.0"))
 ]
-data_table = DataTable(source=source, columns=columns, width=2000, height=400, sortable=True)
+# Sorting happens on the server over all rows; the browser only ever holds the visible page
+data_table = DataTable(source=source, columns=columns, width=2000, height=400, sortable=False)
+
+# Sorting and paging widgets
+sort_column_select = Select(title="Sort By:", value="total_games", options=[(column.field, column.title) for column in columns])
+sort_order_select = Select(title="Order:", value="Descending", options=["Descending", "Ascending"])
+page_size_select = Select(title="Rows per Page:", value="25", options=["25", "50", "100"])
+previous_button = Button(label="Previous", width=100)
+next_button = Button(label="Next", width=100)
+page_display = Div(text="", width=200)
+current_page = {"page": 0, "rows": None}
 
 # Update function for main table
 def update_table(attr, old, new):
@@ -113,16 +127,36 @@ def update_table(attr, old, new):
     avg_winrate = champion_winrates.get(selected_champion, 0)
     champion_winrate_display.text = f"Average Winrate: {avg_winrate:.2%}"
 
-    # Filter data for the selected champion
-    df_filtered = df[df["champion"] == selected_champion]
-    matchups = calculate_matchup_stats(df_filtered)
+    # Look up the precomputed stats for the selected champion
+    matchups = matchup_stats.get(selected_champion, pd.DataFrame(columns=[column.field for column in columns]))
 
     # Apply the cutoff if the checkbox is active
     if apply_cutoff:
         matchups = matchups[matchups['total_games'] >= min_games]
 
-    # Update the data source with the filtered data
-    source.data = {col: matchups[col].values for col in matchups.columns}
+    # Sort on the server, stable so ties keep the opponent order
+    current_page["rows"] = matchups.sort_values(sort_column_select.value, ascending=sort_order_select.value == "Ascending", kind='stable')
+    current_page["page"] = 0
+    show_page()
+
+def show_page():
+    """Send only the rows of the current page to the browser."""
+    rows = current_page["rows"]
+    page_size = int(page_size_select.value)
+    n_pages = max(1, -(-len(rows) // page_size))
+    current_page["page"] = min(max(current_page["page"], 0), n_pages - 1)
+    start = current_page["page"] * page_size
+    page = rows.iloc[start:start + page_size]
+
+    # Update the data source with the visible page
+    source.data = {col: page[col].values for col in page.columns}
+    page_display.text = f"Page {current_page['page'] + 1} of {n_pages} ({len(rows)} opponents)"
+    previous_button.disabled = current_page["page"] == 0
+    next_button.disabled = current_page["page"] >= n_pages - 1
+
+def change_page(step):
+    current_page["page"] += step
+    show_page()
 
 # Initial update
 update_table(None, None, None)
@@ -131,7 +165,18 @@ update_table(None, None, None)
 champion_select.on_change('value', update_table)
 cutoff_input.on_change('value', update_table)
 cutoff_checkbox.on_change('active', update_table)
+sort_column_select.on_change('value', update_table)
+sort_order_select.on_change('value', update_table)
+page_size_select.on_change('value', lambda attr, old, new: change_page(0))
+previous_button.on_click(lambda: change_page(-1))
+next_button.on_click(lambda: change_page(1))
 
 # Layout
-layout = column(row(champion_select, champion_winrate_display), row(cutoff_input, cutoff_checkbox), data_table)
+layout = column(
+    row(champion_select, champion_winrate_display),
+    row(cutoff_input, cutoff_checkbox),
+    row(sort_column_select, sort_order_select, page_size_select),
+    data_table,
+    row(previous_button, page_display, next_button),
+)
 curdoc().add_root(layout)
@@ -1,9 +1,9 @@
+import numpy as np
 import pandas as pd
 from bokeh.plotting import figure, curdoc
-from bokeh.models import ColumnDataSource, HoverTool, Select, MultiChoice, Div, CDSView, GroupFilter, BooleanFilter
+from bokeh.models import ColumnDataSource, HoverTool, Select, MultiChoice, Div, CDSView, IndexFilter, CategoricalColorMapper
 from bokeh.layouts import column, row
 from bokeh.palettes import Category10
-from bokeh.transform import factor_cmap
 
 
 # Load all necessary columns (add more if needed)
@@ -23,11 +23,22 @@ df['kda'] = (df['kills'] + df['assists']) / df['deaths'].replace(0, 1)
 # Convert win to boolean
 df['win'] = df['win'].astype(bool)
 
-# Create ColumnDataSource
-source = ColumnDataSource(df)
+# Row numbers per champion and per opponent, so a selection is a lookup instead of a scan
+champion_rows = {champion: np.asarray(rows) for champion, rows in df.groupby('champion').indices.items()}
+opponent_rows = {opponent: np.asarray(rows) for opponent, rows in df.groupby('lane_opponent').indices.items()}
+
+# Create ColumnDataSource (only the columns the plots and tooltips use are sent to the browser)
+plot_columns = ["champion", "lane_opponent", "game_duration", "kda", "max_cs_advantage_on_lane_opponent", "win"]
+source = ColumnDataSource(df[plot_columns])
+
+# One view shared by the three plots; callbacks only swap its indices
+index_filter = IndexFilter(indices=[])
+# Opponents are coloured by their factor, every other point falls back to navy
+color_mapper = CategoricalColorMapper(factors=[], palette=Category10[3], nan_color="navy")
 
 # Champion selection widget (unchanged)
-champion_select = Select(title="Select Your Champion:", value="Aatrox", options=sorted(df['champion'].unique()))
+champions = sorted(df['champion'].unique())
+champion_select = Select(title="Select Your Champion:", value="Aatrox" if "Aatrox" in champions else champions[0], options=champions)
 
 #Opponent selection widget
 opponent_options = sorted(list(df['lane_opponent'].unique()))  # Sort opponents alphabetically
@@ -65,29 +76,25 @@ def update_plots(attr, old, new):
     else:
         warning_div.text = ""
 
-    # Champion filter
-    champion_view = CDSView(source=source, filters=[GroupFilter(column_name='champion', group=selected_champion)])
-
-    if selected_opponents:
-        opponent_filter = BooleanFilter([x in selected_opponents for x in source.data["lane_opponent"]])
-        champion_view.filters.append(opponent_filter)
-
-
-    # Color mapping for opponents (up to 10 distinct colors)
+    # Champion filter, narrowed to the selected opponents
+    indices = champion_rows.get(selected_champion, np.array([], dtype=int))
     if selected_opponents:
-      color_mapper = factor_cmap('lane_opponent', palette=Category10[len(selected_opponents)], factors=selected_opponents)
+        opponent_indices = np.concatenate([opponent_rows.get(opponent, np.array([], dtype=int)) for opponent in selected_opponents])
+        indices = np.intersect1d(indices, opponent_indices)
+    index_filter.indices = indices.tolist()
 
+    # Color mapping for opponents (up to 3 distinct colors)
+    color_mapper.factors = list(selected_opponents)
 
-    # Plot 1: Win Rate vs. Game Duration (using view for filtering)
-    p1.circle(x='game_duration', y='win', source=source, view=champion_view, size=8, color=color_mapper if selected_opponents else "navy", alpha=0.6)
 
-    #Plot 2: Win rate vs KDA
-    p2.circle(x='kda', y='win', source=source, view=champion_view, size=8, color=color_mapper if selected_opponents else "navy", alpha=0.6)
-    
-    #Plot 3: Win rate vs. Creep Score Advantage at 10
-    p3.circle(x="max_cs_advantage_on_lane_opponent", y = 'win', source=source, view=champion_view, size=8, color=color_mapper if selected_opponents else "navy", alpha=0.6)
+# Plot 1: Win Rate vs. Game Duration (using view for filtering)
+p1.scatter(x='game_duration', y='win', source=source, view=CDSView(filter=index_filter), size=8, color={'field': 'lane_opponent', 'transform': color_mapper}, alpha=0.6)
 
+#Plot 2: Win rate vs KDA
+p2.scatter(x='kda', y='win', source=source, view=CDSView(filter=index_filter), size=8, color={'field': 'lane_opponent', 'transform': color_mapper}, alpha=0.6)
 
+#Plot 3: Win rate vs. Creep Score Advantage at 10
+p3.scatter(x="max_cs_advantage_on_lane_opponent", y='win', source=source, view=CDSView(filter=index_filter), size=8, color={'field': 'lane_opponent', 'transform': color_mapper}, alpha=0.6)
 
 
 # Initial update
@@ -0,0 +1,69 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dashboard'))
+import accel
+
+BACKENDS = ["loop", "numba"]
+KERNELS = ["count_codes", "swarm_x"]
+
+# Inputs the random cases only hit by chance
+EDGE_CASES = {
+    "count_codes": [
+        (np.array([], dtype=np.int16), np.array([], dtype=bool), 5),
+        # Only missing values
+        (np.full(10, 3, dtype=np.int16), np.ones(10, dtype=bool), 3),
+        # The largest dictionary that still gets int16 codes
+        (np.array([0, 32766, 32766, 100, 32766], dtype=np.int16), np.array([True, False, True, True, False]), 32766),
+    ],
+    "swarm_x": [
+        (np.array([]), np.array([]), 0.2),
+        (np.full(6, np.nan), np.full(6, 0.1), 0.2),
+        (np.full(6, 4.0), np.zeros(6), 0.2),
+        # Ties, NaN and zero sizes mixed
+        (np.array([1.0, 1.0, np.nan, 1.0, 1.05, 2.0]), np.array([0.3, 0.3, 0.3, 0.0, 0.3, 0.3]), 0.2),
+    ],
+}
+
+
+def kernels_of(backend):
+    if backend == "numba":
+        pytest.importorskip("numba")
+    return accel.KERNELS[backend]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("kernel", KERNELS)
+def test_random_cases_match_numpy(backend, kernel):
+    kernels = kernels_of(backend)
+    for case, arguments in enumerate(accel.random_cases(kernel, cases=100, seed=1)):
+        expected = accel.KERNELS["numpy"][kernel](*arguments)
+        assert accel.same_result(expected, kernels[kernel](*arguments)), f"{kernel} case {case}"
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("kernel", KERNELS)
+def test_edge_cases_match_numpy(backend, kernel):
+    kernels = kernels_of(backend)
+    for case, arguments in enumerate(EDGE_CASES[kernel]):
+        expected = accel.KERNELS["numpy"][kernel](*arguments)
+        assert accel.same_result(expected, kernels[kernel](*arguments)), f"{kernel} edge case {case}"
+
+
+def test_count_codes_skips_missing_code():
+    games, wins = accel.KERNELS["numpy"]["count_codes"](np.array([0, 1, 2, 1], dtype=np.int16), np.array([True, True, True, False]), 2)
+    assert games.tolist() == [1, 2]
+    assert wins.tolist() == [1, 1]
+
+
+def test_swarm_x_leaves_nan_and_zero_size_points_at_zero():
+    xs = accel.KERNELS["numpy"]["swarm_x"](np.array([1.0, 1.0, np.nan, 1.0]), np.array([0.3, 0.3, 0.3, 0.0]), 0.2)
+    assert xs.tolist()[2:] == [0.0, 0.0]
+    assert xs[1] > 0
+
+
+def test_check_backends():
+    assert accel.check_backends(cases=20) == []